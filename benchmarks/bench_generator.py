@@ -0,0 +1,67 @@
+"""
+    Compares the matrix generator engine with the legacy day-by-day loop.
+
+    Usage:
+        python -m benchmarks.bench_generator --employees 500 --years 3
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.legacy_generator import legacy_build_month_schedule
+from scheduler.api.utils.holidays import get_holidays_for_month
+from scheduler.logic.generator.generator import build_month_schedule
+
+
+
+def run_range(build, workers, admin_id, start_year, years):
+    """
+        Generates consecutive months, chaining the final cycle state.
+        Returns the elapsed seconds and the serialized output.
+    """
+
+    state = {}
+    dumps = []
+    started = time.perf_counter()
+
+    for year in range(start_year, start_year + years):
+        for month in range(1, 13):
+            holidays = set(get_holidays_for_month(year, month))
+            built = build(year, month, workers, admin_id, state, holidays)
+            state = built["final_cycle_state"]
+            dumps.append(built)
+
+    elapsed = time.perf_counter() - started
+    return elapsed, json.dumps(dumps, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--start-year", type=int, default=2026)
+    args = parser.parse_args()
+
+    workers = [str(i) for i in range(2, args.employees + 2)]
+    admin_id = "1"
+
+    legacy_time, legacy_out = run_range(
+        legacy_build_month_schedule, workers, admin_id, args.start_year, args.years
+    )
+    matrix_time, matrix_out = run_range(
+        build_month_schedule, workers, admin_id, args.start_year, args.years
+    )
+
+    print(json.dumps({
+        "employees": args.employees,
+        "months": args.years * 12,
+        "legacy_s": round(legacy_time, 4),
+        "matrix_s": round(matrix_time, 4),
+        "speedup": round(legacy_time / matrix_time, 2),
+        "identical": legacy_out == matrix_out,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+    Day-by-day rotation loop used by the generator before the matrix engine.
+    Kept only as a reference for equivalence tests and speed comparisons.
+"""
+
+import calendar
+from typing import Dict, List
+
+from scheduler.logic.generator.matrix import CYCLE, CYCLE_LEN, REQUIRED_SHIFTS
+
+
+
+def legacy_build_month_schedule(
+    year: int,
+    month: int,
+    workers: List[str],
+    admin_id: str,
+    last_state: Dict[str, dict],
+    holidays: set,
+) -> dict:
+    _, days_in_month = calendar.monthrange(year, month)
+
+    cycle_pos: Dict[str, int] = {}
+    for i, emp_id in enumerate(workers):
+        start = last_state.get(str(emp_id), {}).get("cycle_index")
+        if start is None:
+            start = i * 4
+        cycle_pos[str(emp_id)] = int(start) % CYCLE_LEN
+
+    schedule = {
+        emp_id: {str(day): "" for day in range(1, days_in_month + 1)}
+        for emp_id in workers + [admin_id]
+    }
+
+    warnings = []
+
+    for day in range(1, days_in_month + 1):
+        weekday = calendar.weekday(year, month, day)
+
+        if weekday < 5 and day not in holidays:
+            schedule[admin_id][str(day)] = "А"
+
+        candidates = {s: [] for s in REQUIRED_SHIFTS}
+
+        for emp_id in workers:
+            shift = CYCLE[cycle_pos[str(emp_id)]]
+            if shift in candidates:
+                candidates[shift].append(emp_id)
+
+        missing = [s for s in REQUIRED_SHIFTS if not candidates[s]]
+
+        if missing:
+            warnings.append({
+                "day": day,
+                "missing": missing,
+            })
+
+            for emp_id in workers:
+                cycle_pos[str(emp_id)] = (cycle_pos[str(emp_id)] + 1) % CYCLE_LEN
+            continue
+
+        for s in REQUIRED_SHIFTS:
+            allowed = 2 if s == "Д" else 1
+            for emp_id in candidates[s][:allowed]:
+                schedule[emp_id][str(day)] = s
+
+        for emp_id in workers:
+            cycle_pos[str(emp_id)] = (cycle_pos[str(emp_id)] + 1) % CYCLE_LEN
+
+    final_cycle_state = {
+        str(emp_id): {"cycle_index": cycle_pos[str(emp_id)]}
+        for emp_id in workers
+    }
+
+    return {
+        "schedule": schedule,
+        "warnings": warnings,
+        "final_cycle_state": final_cycle_state,
+    }
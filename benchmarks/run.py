@@ -0,0 +1,223 @@
+"""
+    Benchmark suite for the generator, validator, repair, override,
+    storage and export hot paths.
+
+    Usage:
+        python -m benchmarks.run                       # quick profile
+        python -m benchmarks.run --profile full        # 10..5,000 employees, 1..36 months
+        python -m benchmarks.run --save-baseline       # store results as the baseline
+        python -m benchmarks.run --fail-on-regression  # exit 1 on regressions
+
+    Results are written as JSON (--output) and compared with the stored
+    baseline (--baseline) when it exists.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks import synthetic
+from desktop_app.export.excel_export import export_schedule_to_excel
+from scheduler.logic import months_logic
+from scheduler.logic.generator.apply_overrides import apply_overrides
+from scheduler.logic.repair.repair_engine import apply_repair
+from scheduler.logic.validators.validators import validate_month
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+PROFILES = {
+    "quick": {"sizes": [10, 100, 1000], "months": [1, 12], "repeat": 3},
+    "full": {"sizes": [10, 100, 1000, 5000], "months": [1, 12, 36], "repeat": 3},
+}
+
+
+def measure(fn, repeat: int) -> float:
+    """
+        Best wall time of repeat runs (seconds).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_generate(size, months, repeat):
+    return measure(lambda: synthetic.generate_range(size, months), repeat)
+
+
+def bench_validate(size, repeat):
+    data = synthetic.make_month(size)
+    weekdays = synthetic.weekdays_for(data["year"], data["month"])
+    return measure(
+        lambda: validate_month(data["schedule"], False, weekdays, data["month_admin_id"]),
+        repeat,
+    )
+
+
+def bench_repair(size, repeat, mode="greedy"):
+    data = synthetic.make_month(size)
+    holed = synthetic.punch_holes(data["schedule"], 0.1)
+    admins = {data["month_admin_id"]}
+    return measure(
+        lambda: apply_repair(holed, data["year"], data["month"], set(), admins, mode=mode),
+        repeat,
+    )
+
+
+def bench_overrides(size, repeat):
+    data = synthetic.make_month(size)
+    overrides = synthetic.make_overrides(data["schedule"], 0.05)
+
+    def run():
+        schedule = {emp_id: dict(days) for emp_id, days in data["schedule"].items()}
+        apply_overrides(schedule, overrides)
+
+    return measure(run, repeat)
+
+
+def bench_storage(size, repeat):
+    data = synthetic.make_month(size)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(months_logic, "DATA_DIR", Path(tmp)):
+        save = measure(lambda: months_logic.save_month(2026, 1, data), repeat)
+        load = measure(lambda: months_logic.load_month(2026, 1), repeat)
+
+    return save, load
+
+
+def bench_export(size, repeat):
+    data = synthetic.make_month(size)
+    schedule = {
+        emp_id: {int(d): s for d, s in days.items()}
+        for emp_id, days in data["schedule"].items()
+    }
+    employees = synthetic.make_employees(size)
+    days = sorted(next(iter(schedule.values())).keys())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        return measure(
+            lambda: export_schedule_to_excel(
+                filename=str(Path(tmp) / "bench.xlsx"),
+                company="КАНТАР",
+                department="БЕНЧМАРК",
+                city="ГРАД",
+                month_name="Януари",
+                month=data["month"],
+                year=data["year"],
+                employees=employees,
+                days=days,
+                schedule=schedule,
+            ),
+            repeat,
+        )
+
+
+def run_suite(profile: dict) -> dict:
+    results = {}
+    repeat = profile["repeat"]
+
+    for size in profile["sizes"]:
+        for months in profile["months"]:
+            results[f"generate_new_month/{size}emp/{months}m"] = bench_generate(size, months, repeat)
+
+        results[f"validate_month/{size}emp"] = bench_validate(size, repeat)
+        results[f"apply_repair/{size}emp"] = bench_repair(size, repeat)
+        results[f"apply_repair/{size}emp/optimal"] = bench_repair(size, repeat, mode="optimal")
+        results[f"apply_overrides/{size}emp"] = bench_overrides(size, repeat)
+
+        save, load = bench_storage(size, repeat)
+        results[f"save_month/{size}emp"] = save
+        results[f"load_month/{size}emp"] = load
+
+        results[f"export_schedule_to_excel/{size}emp"] = bench_export(size, 1)
+
+        print(f"  {size} employees done", file=sys.stderr)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+        Returns (case, baseline_s, current_s, ratio, status) rows.
+        status is "regression" above 1 + threshold, "faster" below
+        1 - threshold, otherwise "ok"; cases without a baseline are "new".
+    """
+    rows = []
+
+    for case, current in results.items():
+        before = baseline.get(case)
+        if before is None:
+            rows.append((case, None, current, None, "new"))
+            continue
+
+        ratio = current / before if before else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((case, before, current, ratio, status))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(PROFILES[args.profile])
+
+    report = {
+        "meta": {
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    regressions = []
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        rows = compare(results, baseline, args.threshold)
+        report["comparison"] = [
+            {"case": c, "baseline_s": b, "current_s": cur, "ratio": r, "status": st}
+            for c, b, cur, r, st in rows
+        ]
+        regressions = [row for row in rows if row[4] == "regression"]
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+    Synthetic departments and months for the benchmark suite.
+    Everything is deterministic (seeded) so runs are comparable.
+"""
+
+import calendar
+import random
+from typing import Dict, List, Tuple
+
+from scheduler.api.utils.holidays import get_holidays_for_month
+from scheduler.logic.generator.generator import build_month_schedule
+from scheduler.logic.months_logic import iter_months
+
+
+ADMIN_ID = "1"
+
+
+def make_department(size: int) -> Tuple[List[str], str]:
+    """
+        Returns (workers, admin_id) for a department of size employees.
+    """
+    workers = [str(i) for i in range(2, size + 1)]
+    return workers, ADMIN_ID
+
+
+def make_employees(size: int) -> List[dict]:
+    return [
+        {"id": i, "full_name": f"Служител {i:05d}", "card_number": f"{i:06d}", "is_active": True}
+        for i in range(1, size + 1)
+    ]
+
+
+def generate_range(size: int, months: int, start: Tuple[int, int] = (2026, 1)) -> List[dict]:
+    """
+        Builds months consecutive months for a department, chaining the state.
+    """
+    workers, admin_id = make_department(size)
+    end_year = start[0] + (start[1] - 1 + months - 1) // 12
+    end_month = (start[1] - 1 + months - 1) % 12 + 1
+
+    state: Dict[str, dict] = {}
+    result = []
+
+    for year, month in iter_months(start, (end_year, end_month)):
+        holidays = set(get_holidays_for_month(year, month))
+        built = build_month_schedule(year, month, workers, admin_id, state, holidays)
+        state = built["final_cycle_state"]
+        result.append(built)
+
+    return result
+
+
+def make_month(size: int, year: int = 2026, month: int = 1) -> dict:
+    """
+        Returns a generated month document as stored on disk.
+    """
+    workers, admin_id = make_department(size)
+    holidays = set(get_holidays_for_month(year, month))
+    built = build_month_schedule(year, month, workers, admin_id, {}, holidays)
+
+    return {
+        "year": year,
+        "month": month,
+        "schedule": built["schedule"],
+        "overrides": {},
+        "warnings": built["warnings"],
+        "generator_locked": False,
+        "ui_locked": False,
+        "month_admin_id": admin_id,
+    }
+
+
+def punch_holes(schedule: Dict[str, Dict[str, str]], ratio: float, seed: int = 0) -> Dict[str, Dict[str, str]]:
+    """
+        Returns a copy of schedule with a ratio of the cells cleared.
+    """
+    rng = random.Random(seed)
+    return {
+        emp_id: {d: ("" if rng.random() < ratio else s) for d, s in days.items()}
+        for emp_id, days in schedule.items()
+    }
+
+
+def make_overrides(schedule: Dict[str, Dict[str, str]], ratio: float, seed: int = 0) -> Dict[str, Dict[str, str]]:
+    rng = random.Random(seed)
+    overrides: Dict[str, Dict[str, str]] = {}
+
+    for emp_id, days in schedule.items():
+        for d in days:
+            if rng.random() < ratio:
+                overrides.setdefault(emp_id, {})[d] = rng.choice(["", "Д", "В", "Н", "О", "Б"])
+
+    return overrides
+
+
+def weekdays_for(year: int, month: int) -> Dict[int, int]:
+    days = calendar.monthrange(year, month)[1]
+    return {d: calendar.weekday(year, month, d) for d in range(1, days + 1)}
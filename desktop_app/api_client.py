@@ -46,12 +46,21 @@ class APIClient:
         return data
 
 
-    def generate_month(self, year: int, month: int, strict: bool = True):
+    def generate_month(
+        self,
+        year: int,
+        month: int,
+        strict: bool = True,
+        mode: str = "cycle",
+        leave_aware: bool = False,
+    ):
         url = f"{self.base}/schedule/generate/"
         payload = {
             "year": int(year),
             "month": int(month),
             "strict": strict,
+            "mode": mode,
+            "leave_aware": leave_aware,
         }
 
         r = requests.post(url, json=payload)
@@ -97,6 +106,24 @@ class APIClient:
         return r.json()
 
 
+    def post_overrides(self, year, month, changes: list[dict]):
+        r = requests.post(
+            f"{self.base}/schedule/{year}/{month}/overrides/batch/",
+            json={"changes": changes}
+        )
+
+        if r.status_code >= 400:
+            try:
+                error = r.json().get("error", {})
+                message = error.get("message", "Невалидни корекции.")
+                hint = error.get("hint", "")
+            except Exception:
+                raise RuntimeError("Невалидни корекции.")
+            raise RuntimeError(f"{message}\n{hint}")
+
+        return r.json()
+
+
     def get_employees(self):
         r = requests.get(f"{self.base}/employees/")
         r.raise_for_status()
@@ -1,24 +1,29 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QBrush
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QColor, QBrush, QFont
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
-    QComboBox, QSizePolicy, QHeaderView
+    QWidget, QVBoxLayout, QTableView, QComboBox, QSizePolicy, QHeaderView,
+    QStyledItemDelegate,
 )
 from desktop_app.msgbox import warning
+from scheduler.logic.calendar_service import month_calendar
+from scheduler.logic.validators.validators import IncrementalValidator
+from scheduler.logic.workload import count_worked
 
 
 SHIFT_OPTIONS = ["", "Д", "В", "Н", "А", "О", "Б"]
-COUNT_AS_WORKED: Set[str] = {"Д", "В", "Н", "А", "О", "Б"}
 
 DAY_GREEN = QColor(198, 224, 180)
 DAY_RED = QColor(244, 177, 177)
 GRID_BG = QColor(230, 230, 230)
 CELL_BG = QColor(255, 255, 255)
 TEXT_DARK = QColor(0, 0, 0)
+HEADER_ROW_BG = QColor(240, 240, 240)
+EDIT_BG = QColor(55, 55, 55)
+EDIT_FG = QColor(240, 240, 240)
 
 EMPLOYEE_NAME_COLORS = [
     QColor(255, 217, 102),
@@ -28,6 +33,31 @@ EMPLOYEE_NAME_COLORS = [
     QColor(197, 224, 180),
 ]
 
+SHIFT_EDITOR_STYLE = """
+QComboBox {
+    background-color: #373737;
+    color: #f0f0f0;
+    border: none;
+    padding-left: 6px;
+    min-width: 22px;
+}
+QComboBox::drop-down {
+    width: 0px;
+    border: none;
+}
+QComboBox::down-arrow {
+    image: none;
+}
+QComboBox QAbstractItemView {
+    background-color: #2d2d2d;
+    color: #f0f0f0;
+    selection-background-color: #5a8dee;
+}
+"""
+
+FIRST_DAY_COL = 3
+OVERRIDE_FLUSH_MS = 400
+
 
 
 @dataclass
@@ -37,15 +67,206 @@ class EmpRow:
     card_number: str
 
 
+class CalendarModel(QAbstractTableModel):
+    """
+        Table model of the month grid.
+        Row 0 is the coloured day header, every other row is an employee:
+        №, worked days, name, one column per day and the card number.
+        Cells are computed on request, nothing is stored per cell.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.employees: List[EmpRow] = []
+        self.schedule: Dict[str, Dict[int, str]] = {}
+        self.days: List[int] = []
+        self.off_days: Set[int] = set()
+        self.editable = False
+        self.commit: Optional[Callable[[EmpRow, int, str], bool]] = None
+
+        self._bold = QFont()
+        self._bold.setBold(True)
+
+    def reset(self, employees, schedule, days, off_days):
+        self.beginResetModel()
+        self.employees = employees
+        self.schedule = schedule
+        self.days = days
+        self.off_days = off_days
+        self.endResetModel()
+
+    def set_editable(self, editable: bool):
+        if editable == self.editable:
+            return
+        self.editable = editable
+        if self.employees and self.days:
+            self.dataChanged.emit(
+                self.index(1, FIRST_DAY_COL),
+                self.index(len(self.employees), FIRST_DAY_COL + len(self.days) - 1),
+            )
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.days:
+            return 0
+        return len(self.employees) + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.days:
+            return 0
+        return FIRST_DAY_COL + len(self.days) + 1
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return str(section + 1)
+        if section < FIRST_DAY_COL:
+            return ("№", "Бр.", "Служител")[section]
+        if section < FIRST_DAY_COL + len(self.days):
+            return str(self.days[section - FIRST_DAY_COL])
+        return "Служебен №"
+
+    def _day(self, col: int) -> Optional[int]:
+        if FIRST_DAY_COL <= col < FIRST_DAY_COL + len(self.days):
+            return self.days[col - FIRST_DAY_COL]
+        return None
+
+    def count_worked(self, emp_id: str) -> int:
+        return count_worked(self.schedule.get(str(emp_id), {}), self.days)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        r, c = index.row(), index.column()
+        day = self._day(c)
+
+        if r == 0:
+            if role == Qt.ItemDataRole.BackgroundRole:
+                if day is None:
+                    return QBrush(HEADER_ROW_BG)
+                return QBrush(DAY_RED if day in self.off_days else DAY_GREEN)
+            if role == Qt.ItemDataRole.DisplayRole:
+                return ""
+            return None
+
+        i = r - 1
+        emp = self.employees[i]
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if day is not None:
+                return self.schedule.get(emp.emp_id, {}).get(day, "")
+            if c == 0:
+                return str(r)
+            if c == 1:
+                return str(self.count_worked(emp.emp_id))
+            if c == 2:
+                return emp.full_name
+            return emp.card_number
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if day is not None:
+                if self.editable:
+                    return QBrush(EDIT_BG)
+                return QBrush(DAY_RED if day in self.off_days else DAY_GREEN)
+            if c == 2:
+                return QBrush(EMPLOYEE_NAME_COLORS[i % len(EMPLOYEE_NAME_COLORS)])
+            return QBrush(CELL_BG)
+
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QBrush(EDIT_FG if day is not None and self.editable else TEXT_DARK)
+
+        if role == Qt.ItemDataRole.FontRole and c == 2:
+            return self._bold
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and c != 2:
+            return Qt.AlignmentFlag.AlignCenter
+
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled
+        if index.isValid() and self.editable and index.row() > 0 and self._day(index.column()) is not None:
+            flags |= Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsSelectable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """
+            Applies an override from the editor. The commit callback posts
+            it to the backend; the cell only changes when it accepts.
+        """
+
+        if role != Qt.ItemDataRole.EditRole or not index.isValid() or index.row() == 0:
+            return False
+
+        day = self._day(index.column())
+        if day is None:
+            return False
+
+        emp = self.employees[index.row() - 1]
+        new = str(value)
+        if new == self.schedule.get(emp.emp_id, {}).get(day, ""):
+            return False
+
+        if self.commit and not self.commit(emp, day, new):
+            return False
+
+        self.set_shift(index.row() - 1, day, new)
+        return True
+
+    def set_shift(self, row: int, day: int, shift: str):
+        """
+            Sets one cell without going through the commit callback.
+        """
+
+        emp = self.employees[row]
+        self.schedule.setdefault(emp.emp_id, {})[day] = shift
+
+        cell = self.index(row + 1, FIRST_DAY_COL + self.days.index(day))
+        count = self.index(row + 1, 1)
+        self.dataChanged.emit(cell, cell)
+        self.dataChanged.emit(count, count)
+
+
+class ShiftDelegate(QStyledItemDelegate):
+    """
+        Shift editor for day cells. Only the cell being edited has a
+        combo box; it commits as soon as a shift is picked.
+    """
+
+    def createEditor(self, parent, option, index):
+        cb = QComboBox(parent)
+        cb.setStyleSheet(SHIFT_EDITOR_STYLE)
+        cb.addItems(SHIFT_OPTIONS)
+        cb.activated.connect(lambda _: self._commit(cb))
+        return cb
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.ItemDataRole.EditRole) or "")
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def _commit(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.NoHint)
+
+
 class CalendarWidget(QWidget):
     """
         Interactive calendar table for displaying and editing monthly work schedules.
         Renders employees, daily shifts, worked-day counts, and metadata in a grid.
         Supports read-only and override modes, visual highlighting of weekends
-        and holidays, and inline shift overrides via combo boxes with backend
-        synchronization.
+        and holidays, and inline shift overrides via an on-demand combo editor.
+        Overrides are buffered and sent to the backend in one batch after a
+        short pause in editing.
+        Emits validation_changed with the current validation errors after
+        every load and every accepted override.
     """
 
+    validation_changed = pyqtSignal(list)
+
     def __init__(self):
         super().__init__()
 
@@ -61,49 +282,72 @@ class CalendarWidget(QWidget):
         self._days: List[int] = []
         self._weekends: Set[int] = set()
         self._holidays: Set[int] = set()
+        self._validator: Optional[IncrementalValidator] = None
+
+        # (emp_id, day) -> (row, shift before the first buffered edit, new shift)
+        self._pending: Dict[tuple, tuple] = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(OVERRIDE_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush_overrides)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectItems)
-        self.table.setStyleSheet("QTableWidget { background-color: #2d2d2d; }")
+        self.model = CalendarModel(self)
+        self.model.commit = self._post_override
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(ShiftDelegate(self.table))
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectItems)
+        self.table.setStyleSheet("QTableView { background-color: #2d2d2d; }")
 
         layout.addWidget(self.table)
 
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
 
 
     def set_context(self, client, year: int, month: int):
+        self.flush_overrides()
         self.client = client
         self.year = year
         self.month = month
 
 
     def set_read_only(self, read_only: bool):
+        self.flush_overrides()
         self._read_only = read_only
-        self._render()
+        self._update_edit_mode()
 
 
     def set_override_mode(self, enabled: bool):
+        self.flush_overrides()
         self._override_mode = enabled
-        self._render()
+        self._update_edit_mode()
 
 
-    def load(self, data: dict):
+    def load(self, data: dict, employees: list | None = None, info: dict | None = None):
         """
             Loads employees, schedule data, and calendar metadata for the selected month.
             Fetches employees from the API, normalizes and filters the schedule,
             retrieves month structure (days, weekends, holidays), and renders the table.
+            Already fetched employees / month info can be passed in to skip the calls.
         """
 
         if not self.client:
             return
 
-        raw = sorted(self.client.get_employees(), key=lambda x: x["full_name"])
+        self.flush_overrides()
+
+        if employees is None:
+            employees = self.client.get_employees()
+
+        raw = sorted(employees, key=lambda x: x["full_name"])
 
         self._employees = [
             EmpRow(
@@ -125,209 +369,159 @@ class CalendarWidget(QWidget):
         }
 
 
-        info = self.client.get_month_info(self.year, self.month)
+        if info is None:
+            info = self.client.get_month_info(self.year, self.month)
         self._days = list(range(1, int(info["days"]) + 1))
         self._weekends = set(info.get("weekends", []))
         self._holidays = set(info.get("holidays", []))
 
+        self._build_validator(data.get("month_admin_id"))
         self._render()
 
 
     def _render(self):
         """
-            Renders or refreshes the calendar table UI.
-            Builds headers and rows, applies styling and layout rules,
-            and switches between read-only and override editing modes.
+            Hands the loaded month to the model and lays out the columns.
+            The view only paints the visible cells, so the cost does not
+            grow with the number of rows.
         """
 
-        rows = len(self._employees)
-        cols = 3 + len(self._days) + 1
-
-        self.table.clear()
-        self.table.setRowCount(rows + 1)
-        self.table.setColumnCount(cols)
-
-        headers = ["№", "Бр.", "Служител"] + [str(d) for d in self._days] + ["Служебен №"]
-        self.table.setHorizontalHeaderLabels(headers)
-
-        self._paint_day_header()
-
-        for i, emp in enumerate(self._employees):
-            r = i + 1
+        self.model.reset(
+            self._employees,
+            self._schedule,
+            self._days,
+            self._weekends | self._holidays,
+        )
+        self._update_edit_mode()
 
-            self._cell(r, 0, str(i + 1), center=True)
-            self._cell(r, 1, str(self._count_worked(str(emp.emp_id))), center=True)
-            name_bg = EMPLOYEE_NAME_COLORS[i % len(EMPLOYEE_NAME_COLORS)]
-            self._cell(r, 2, emp.full_name, bg=name_bg, fg=TEXT_DARK, bold=True)
-
-            for j, day in enumerate(self._days):
-                col = 3 + j
-                val = self._schedule.get(str(emp.emp_id), {}).get(day, "")
-
-                if self._override_mode and not self._read_only:
-                    self.table.setCellWidget(r, col, self._combo(emp, day, val))
-                else:
-                    bg = DAY_RED if day in self._weekends or day in self._holidays else DAY_GREEN
-                    self._cell(r, col, val, center=True, bg=bg, fg=TEXT_DARK)
-
-            self._cell(r, cols - 1, emp.card_number, center=True)
+        if not self._days:
+            return
 
         header = self.table.horizontalHeader()
-
+        # size-to-contents samples the visible rows instead of all of them
+        header.setResizeContentsPrecision(0)
+        last = self.model.columnCount() - 1
 
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
         self.table.setColumnWidth(2, 240)
 
-        for col in range(3, self.table.columnCount() - 1):
+        for col in range(FIRST_DAY_COL, last):
             header.setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
 
-        header.setSectionResizeMode(self.table.columnCount() - 1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(last, QHeaderView.ResizeMode.ResizeToContents)
         header.setMinimumSectionSize(28)
 
 
-    def _paint_day_header(self):
+    def _update_edit_mode(self):
+        editable = self._override_mode and not self._read_only
+        self.model.set_editable(editable)
+        self.table.setEditTriggers(
+            QTableView.EditTrigger.CurrentChanged | QTableView.EditTrigger.SelectedClicked
+            if editable else QTableView.EditTrigger.NoEditTriggers
+        )
+
+
+    def _post_override(self, emp: EmpRow, day: int, new: str) -> bool:
         """
-            Paints the header row with day-specific background colors.
-            Highlights weekends and holidays differently from workdays
-            to visually distinguish non-working days.
+            Buffers a single day's override and (re)starts the debounce
+            timer. The cell and the live validation update right away;
+            the backend gets the whole buffer in one flush_overrides().
         """
 
-        for col in range(self.table.columnCount()):
-            it = QTableWidgetItem("")
-            it.setFlags(Qt.ItemFlag.ItemIsEnabled)
+        key = (emp.emp_id, day)
+        row = self._employees.index(emp)
+
+        if key in self._pending:
+            _, old, _ = self._pending[key]
+        else:
+            old = self._schedule.get(emp.emp_id, {}).get(day, "")
+        self._pending[key] = (row, old, new)
 
-            if 3 <= col < self.table.columnCount() - 1:
-                day = int(self.table.horizontalHeaderItem(col).text())
-                it.setBackground(QBrush(DAY_RED if day in self._weekends or day in self._holidays else DAY_GREEN))
-            else:
-                it.setBackground(QBrush(QColor(240, 240, 240)))
+        if self._validator:
+            self._validator.apply(emp.emp_id, day, new)
+            self.validation_changed.emit(self._validator.errors())
 
-            self.table.setItem(0, col, it)
+        self._flush_timer.start()
+        return True
 
 
-    def _combo(self, emp: EmpRow, day: int, current: str):
+    def flush_overrides(self) -> bool:
         """
-            Creates a shift-selection combo box for override mode.
-            Allows changing a single day’s shift for an employee, posts the override
-            to the backend, updates local state and worked-day count, and rolls back
-            on validation errors.
+            Sends the buffered overrides with one post_overrides() call.
+            The batch is all-or-nothing: on error the cells and the live
+            validation are rolled back and the user is warned.
         """
 
-        cb = QComboBox()
-        cb.setMinimumWidth(48)
-        cb.view().setMinimumWidth(48)
-
-        cb.setStyleSheet("""
-        QComboBox {
-            background-color: #373737;
-            color: #f0f0f0;
-            border: none;
-            padding-left: 6px;
-            min-width: 22px;
-        }
-        QComboBox::drop-down {
-            width: 0px;
-            border: none;
-        }
-        QComboBox::down-arrow {
-            image: none;
-        }
-        QComboBox QAbstractItemView {
-            background-color: #2d2d2d;
-            color: #f0f0f0;
-            selection-background-color: #5a8dee;
-        }
-        """)
+        self._flush_timer.stop()
+        if not self._pending:
+            return True
 
-        cb.addItems(SHIFT_OPTIONS)
-        cb.blockSignals(True)
-        cb.setCurrentText(current)
-        cb.blockSignals(False)
-        old_value = current
-
-        def on_change():
-            new = cb.currentText()
-            if new == old_value:
-                return
-
-            try:
-                self.client.post_override(
-                    self.year,
-                    self.month,
-                    {
-                        "employee_id": emp.emp_id,
-                        "day": day,
-                        "new_shift": new,
-                    },
-                )
-
-
-                self._schedule.setdefault(str(emp.emp_id), {})[day] = new
-                self._cell(
-                    self._row(emp.full_name),
-                    1,
-                    str(self._count_worked(str(emp.emp_id))),
-                    center=True,
-                )
-
-            except Exception as e:
-                warning(
-                    self,
-                    "Невалидна корекция",
-                    str(e),
-                )
-                cb.blockSignals(True)
-                cb.setCurrentText(old_value)
-                cb.blockSignals(False)
-
-        cb.currentIndexChanged.connect(lambda _: on_change())
-        return cb
+        pending, self._pending = self._pending, {}
+        changes = [
+            {"employee_id": emp_id, "day": day, "new_shift": new}
+            for (emp_id, day), (_, _, new) in pending.items()
+        ]
 
+        try:
+            self.client.post_overrides(self.year, self.month, changes)
+        except Exception as e:
+            for (emp_id, day), (row, old, _) in pending.items():
+                self.model.set_shift(row, day, old)
+                if self._validator:
+                    self._validator.apply(emp_id, day, old)
+            if self._validator:
+                self.validation_changed.emit(self._validator.errors())
+
+            warning(
+                self,
+                "Невалидна корекция",
+                str(e),
+            )
+            return False
 
-    def _row(self, name: str) -> int:
-        for i, e in enumerate(self._employees):
-            if e.full_name == name:
-                return i + 1
-        return 1
+        return True
 
-    def _count_worked(self, emp_id: str) -> int:
-        days = self._schedule.get(str(emp_id), {})
-        return sum(1 for d in self._days if days.get(d) in COUNT_AS_WORKED)
 
-    def _cell(self, r, c, text, bg=None, fg=None, bold=False, center=False):
+    def _build_validator(self, admin_id):
         """
-            Creates and inserts a styled, non-editable table cell.
-            Applies text content, alignment, font weight, and background/foreground
-            colors, then places the item into the table at the given position.
+            Builds the live validator for the loaded month.
+            Skipped while the month has no administrator.
         """
 
-        it = QTableWidgetItem(str(text))
-        it.setFlags(Qt.ItemFlag.ItemIsEnabled)
-
-        if center:
-            it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if not admin_id or not self._days:
+            self._validator = None
+            self.validation_changed.emit([])
+            return
 
-        if bold:
-            f = it.font()
-            f.setBold(True)
-            it.setFont(f)
+        month_weekdays = month_calendar(self.year, self.month).weekdays
+        weekdays = {day: month_weekdays[day - 1] for day in self._days}
+        schedule = {
+            emp.emp_id: {
+                day: self._schedule.get(emp.emp_id, {}).get(day, "")
+                for day in self._days
+            }
+            for emp in self._employees
+        }
 
-        it.setBackground(QBrush(bg or CELL_BG))
-        it.setForeground(QBrush(fg or TEXT_DARK))
+        self._validator = IncrementalValidator(
+            schedule,
+            crisis_mode=False,
+            weekdays=weekdays,
+            admin_id=str(admin_id),
+        )
+        self.validation_changed.emit(self._validator.errors())
 
-        self.table.setItem(r, c, it)
+    def _count_worked(self, emp_id: str) -> int:
+        return self.model.count_worked(emp_id)
 
     def clear(self):
+        self.flush_overrides()
+        self._validator = None
         self._schedule = {}
         self._employees = []
         self._days = []
         self._weekends = set()
         self._holidays = set()
-        self.table.clear()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
-
-
-
+        self.model.reset([], {}, [], set())
@@ -1,11 +1,13 @@
-from copy import deepcopy
+from typing import Iterator, Optional
 
-from datetime import date
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill, Border, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
 
-from scheduler.api.utils.holidays import get_holidays_for_month
+from scheduler.logic.calendar_service import month_calendar
+from scheduler.logic.workload import count_worked
 
 
 
@@ -28,12 +30,79 @@ THIN_BORDER = Border(
     bottom=Side(style="thin"),
 )
 
+CENTER = Alignment(horizontal="center")
 
-COUNT_AS_WORKED = {"Д", "В", "Н", "А", "О", "Б"}
 
+FIRST_DAY_COL = 4
+FIRST_BODY_ROW = 6
 
-def export_schedule_to_excel(
-    filename: str,
+LEGEND = [
+    "Д – ДНЕВНА (08:00–16:00)",
+    "В – ВТОРА (16:00–24:00)",
+    "Н – НОЩНА (00:00–08:00)",
+    "А – АДМИНИСТРАЦИЯ",
+    "О – ОТПУСК",
+    "Б – БОЛНИЧЕН",
+    "ПРАЗНО – ПОЧИВЕН ДЕН",
+]
+
+# Row cells are (value, style name); None leaves the column empty.
+Cell = Optional[tuple]
+
+
+def _named_styles() -> list[NamedStyle]:
+    """
+        Builds the named styles used by the schedule sheet.
+        Every cell references one of these instead of carrying its own
+        font / fill / border / alignment objects.
+    """
+
+    styles = [
+        NamedStyle("sch_company", font=Font(size=14, bold=True), alignment=CENTER),
+        NamedStyle("sch_department", font=Font(size=16, bold=True), alignment=CENTER),
+        NamedStyle("sch_month", font=Font(size=12, bold=True), alignment=CENTER),
+        NamedStyle("sch_header", font=DEFAULT_FONT, fill=HEADER_FILL, border=THIN_BORDER, alignment=CENTER),
+        NamedStyle("sch_day_off", font=DEFAULT_FONT, fill=RED_FILL, border=THIN_BORDER, alignment=CENTER),
+        NamedStyle("sch_day_work", font=DEFAULT_FONT, fill=GREEN_FILL, border=THIN_BORDER, alignment=CENTER),
+        NamedStyle("sch_cell", font=DEFAULT_FONT, border=THIN_BORDER),
+        NamedStyle("sch_shift", font=DEFAULT_FONT, border=THIN_BORDER, alignment=CENTER),
+        NamedStyle("sch_bold", font=Font(bold=True)),
+    ]
+    styles += [
+        NamedStyle(f"sch_name_{i}", font=DEFAULT_FONT, fill=fill, border=THIN_BORDER)
+        for i, fill in enumerate(EMPLOYEE_ROW_FILLS)
+    ]
+    return styles
+
+
+def register_named_styles(wb: Workbook) -> None:
+    for style in _named_styles():
+        if style.name not in wb.named_styles:
+            wb.add_named_style(style)
+
+
+def _merged_ranges(card_col: int) -> list[tuple]:
+    return [
+        (3, 3, 3, 10),
+        (3, 11, 3, 22),
+        (3, 23, 3, card_col),
+        (4, 1, 4, card_col),
+    ]
+
+
+def _column_widths(card_col: int) -> dict:
+    widths = {"A": 5, "B": 6, "C": 34}
+    for col in range(FIRST_DAY_COL, card_col):
+        widths[get_column_letter(col)] = 4
+    widths[get_column_letter(card_col)] = 16
+    return widths
+
+
+def count_worked_days(emp_days: dict, days: list[int]) -> int:
+    return count_worked(emp_days, days)
+
+
+def schedule_rows(
     company: str,
     department: str,
     city: str,
@@ -43,127 +112,141 @@ def export_schedule_to_excel(
     employees: list[dict],
     days: list[int],
     schedule: dict,
-):
+) -> Iterator[list[Cell]]:
     """
-        Exports a monthly employee work schedule to a formatted Excel file.
-
-        Builds an Excel worksheet with company header, day-by-day schedule,
-        worked-days count, holiday/weekend highlighting, and a legend.
-        Applies consistent styling, borders, and column widths.
-
-        Assumes schedule keys are employee IDs as strings and day values
-        contain shift codes used for worked-day calculation.
+        Yields the sheet row by row, starting at row 1.
+        Each row is a list of cells by column; the rows are produced
+        lazily so a streaming workbook never holds the whole sheet.
     """
 
-
-    schedule = deepcopy(schedule)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "График"
-
-    holidays = set(get_holidays_for_month(year, month))
-
-    FIRST_DAY_COL = 4
-    LAST_DAY_COL = FIRST_DAY_COL + len(days) - 1
-    CARD_COL = LAST_DAY_COL + 1
+    month_days = month_calendar(year, month)
 
     # ===== HEADER =====
-    ws.merge_cells(start_row=3, start_column=3, end_row=3, end_column=10)
-    ws.cell(3, 3, company).font = Font(size=14, bold=True)
-    ws.cell(3, 3).alignment = Alignment(horizontal="center")
+    yield []
+    yield []
 
-    ws.merge_cells(start_row=3, start_column=11, end_row=3, end_column=22)
-    ws.cell(3, 11, department).font = Font(size=16, bold=True)
-    ws.cell(3, 11).alignment = Alignment(horizontal="center")
+    title = [None] * 22
+    title[2] = (company, "sch_company")
+    title[10] = (department, "sch_department")
+    title.append((city, "sch_company"))
+    yield title
 
-    ws.merge_cells(start_row=3, start_column=23, end_row=3, end_column=CARD_COL)
-    ws.cell(3, 23, city).font = Font(size=14, bold=True)
-    ws.cell(3, 23).alignment = Alignment(horizontal="center")
+    yield [(f"{month_name} {year} г.", "sch_month")]
 
-    ws.merge_cells(start_row=4, start_column=1, end_row=4, end_column=CARD_COL)
-    ws.cell(4, 1, f"{month_name} {year} г.").font = Font(size=12, bold=True)
-    ws.cell(4, 1).alignment = Alignment(horizontal="center")
+    header = [
+        ("№", "sch_header"),
+        ("Бр.", "sch_header"),
+        ("Име, Презиме, Фамилия", "sch_header"),
+    ]
+    for day in days:
+        off = month_days.weekdays[day - 1] >= 5 or month_days.is_holiday(day)
+        header.append((day, "sch_day_off" if off else "sch_day_work"))
+    header.append(("Служебен №", "sch_header"))
+    yield header
 
+    # ===== BODY =====
+    for idx, emp in enumerate(employees):
+        emp_days = schedule.get(str(emp["id"]), {})
 
-    headers = ["№", "Бр.", "Име, Презиме, Фамилия"]
-    for col, text in enumerate(headers, start=1):
-        c = ws.cell(row=5, column=col, value=text)
-        c.fill = HEADER_FILL
-        c.border = THIN_BORDER
-        c.alignment = Alignment(horizontal="center")
+        row = [
+            (idx + 1, "sch_cell"),
+            (count_worked_days(emp_days, days), "sch_cell"),
+            (emp["full_name"], f"sch_name_{idx % len(EMPLOYEE_ROW_FILLS)}"),
+        ]
+        row += [(emp_days.get(day, ""), "sch_shift") for day in days]
+        row.append((emp.get("card_number", ""), "sch_cell"))
+        yield row
 
+    # ===== LEGEND =====
+    yield []
+    yield []
+    yield [None, None, ("ЛЕГЕНДА:", "sch_bold")]
 
-    for idx, day in enumerate(days):
-        col = FIRST_DAY_COL + idx
-        c = ws.cell(row=5, column=col, value=day)
-        c.border = THIN_BORDER
-        c.alignment = Alignment(horizontal="center")
+    for text in LEGEND:
+        yield [None, None, (text, None)]
 
-        weekday = date(year, month, day).weekday()
-        c.fill = RED_FILL if (weekday >= 5 or day in holidays) else GREEN_FILL
 
-    ws.cell(row=5, column=CARD_COL, value="Служебен №").fill = HEADER_FILL
-    ws.cell(row=5, column=CARD_COL).border = THIN_BORDER
-    ws.cell(row=5, column=CARD_COL).alignment = Alignment(horizontal="center")
+def write_schedule_sheet(ws, rows: Iterator[list[Cell]], days_count: int) -> None:
+    """
+        Writes the schedule rows into a worksheet of either workbook
+        kind. Write-only sheets get the rows appended as they come,
+        normal sheets get the cells addressed directly.
+    """
 
-    # ===== BODY =====
-    for idx, emp in enumerate(employees):
-        row = 6 + idx
+    card_col = FIRST_DAY_COL + days_count
+    write_only = ws.parent.write_only
+
+    for col, width in _column_widths(card_col).items():
+        ws.column_dimensions[col].width = width
 
-        emp_id = str(emp["id"])
-        name = emp["full_name"]
-        card = emp.get("card_number", "")
+    for r1, c1, r2, c2 in _merged_ranges(card_col):
+        if write_only:
+            ws.merged_cells.add(f"{get_column_letter(c1)}{r1}:{get_column_letter(c2)}{r2}")
+        else:
+            ws.merge_cells(start_row=r1, start_column=c1, end_row=r2, end_column=c2)
 
-        emp_days = schedule.get(emp_id, {})
+    if write_only:
+        for row in rows:
+            ws.append([_write_only_cell(ws, item) for item in row])
+        return
 
-        worked_days = sum(
-            1 for d in days if emp_days.get(d, "") in COUNT_AS_WORKED
-        )
+    for r, row in enumerate(rows, start=1):
+        for c, item in enumerate(row, start=1):
+            if item is None:
+                continue
+            value, style = item
+            cell = ws.cell(row=r, column=c, value=value)
+            if style:
+                cell.style = style
 
-        fill = EMPLOYEE_ROW_FILLS[idx % len(EMPLOYEE_ROW_FILLS)]
 
-        ws.cell(row=row, column=1, value=idx + 1).border = THIN_BORDER
-        ws.cell(row=row, column=2, value=worked_days).border = THIN_BORDER
+def _write_only_cell(ws, item: Cell):
+    if item is None:
+        return None
+    value, style = item
+    cell = WriteOnlyCell(ws, value=value)
+    if style:
+        cell.style = style
+    return cell
 
-        name_cell = ws.cell(row=row, column=3, value=name)
-        name_cell.border = THIN_BORDER
-        name_cell.fill = fill
 
-        for i, day in enumerate(days):
-            col = FIRST_DAY_COL + i
-            val = emp_days.get(day, "")
-            c = ws.cell(row=row, column=col, value=val)
-            c.border = THIN_BORDER
-            c.alignment = Alignment(horizontal="center")
+def export_schedule_to_excel(
+    filename: str,
+    company: str,
+    department: str,
+    city: str,
+    month_name: str,
+    month: int,
+    year: int,
+    employees: list[dict],
+    days: list[int],
+    schedule: dict,
+    streaming: bool = False,
+):
+    """
+        Exports a monthly employee work schedule to a formatted Excel file.
 
-        ws.cell(row=row, column=CARD_COL, value=card).border = THIN_BORDER
+        Builds an Excel worksheet with company header, day-by-day schedule,
+        worked-days count, holiday/weekend highlighting, and a legend.
+        Applies consistent styling, borders, and column widths.
 
-    # ===== LEGEND =====
-    legend_row = row + 3
-    ws.cell(legend_row, 3, "ЛЕГЕНДА:").font = Font(bold=True)
-
-    legend = [
-        "Д – ДНЕВНА (08:00–16:00)",
-        "В – ВТОРА (16:00–24:00)",
-        "Н – НОЩНА (00:00–08:00)",
-        "А – АДМИНИСТРАЦИЯ",
-        "О – ОТПУСК",
-        "Б – БОЛНИЧЕН",
-        "ПРАЗНО – ПОЧИВЕН ДЕН",
-    ]
+        Assumes schedule keys are employee IDs as strings and day values
+        contain shift codes used for worked-day calculation.
 
-    for i, text in enumerate(legend, start=1):
-        ws.cell(legend_row + i, 3, text)
+        With streaming=True the workbook is write-only: rows are written
+        as they are produced and memory stays bounded for large exports.
+    """
 
-    # ===== WIDTHS =====
-    ws.column_dimensions["A"].width = 5
-    ws.column_dimensions["B"].width = 6
-    ws.column_dimensions["C"].width = 34
+    wb = Workbook(write_only=streaming)
+    register_named_styles(wb)
 
-    for col in range(FIRST_DAY_COL, CARD_COL):
-        ws.column_dimensions[get_column_letter(col)].width = 4
+    ws = wb.create_sheet("График") if streaming else wb.active
+    ws.title = "График"
 
-    ws.column_dimensions[get_column_letter(CARD_COL)].width = 16
+    rows = schedule_rows(
+        company, department, city, month_name, month, year,
+        employees, days, schedule,
+    )
+    write_schedule_sheet(ws, rows, len(days))
 
     wb.save(filename)
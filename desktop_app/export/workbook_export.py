@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from desktop_app.export.excel_export import (
+    register_named_styles,
+    count_worked_days,
+    schedule_rows,
+    write_schedule_sheet,
+)
+
+
+
+SUMMARY_TITLE = "Обобщение"
+
+
+def _prepare_month_sheet(job: dict) -> dict:
+    """
+        Renders one month into plain sheet rows and worked-day counts.
+        Takes and returns picklable data only, so it can also run in a
+        worker process; the workbook itself is built in the calling process.
+    """
+
+    days = job["days"]
+    schedule = job["schedule"]
+    employees = job["employees"]
+
+    rows = list(schedule_rows(
+        job["company"], job["department"], job["city"],
+        job["month_name"], job["month"], job["year"],
+        employees, days, schedule,
+    ))
+
+    worked = {
+        str(emp["id"]): count_worked_days(schedule.get(str(emp["id"]), {}), days)
+        for emp in employees
+    }
+
+    return {
+        "title": f"{job['month_name']} {job['year']}",
+        "days_count": len(days),
+        "rows": rows,
+        "worked": worked,
+    }
+
+
+def prepare_month_sheets(jobs: list[dict], max_workers: int = 1) -> list[dict]:
+    """
+        Prepares the month sheets in order of jobs. Serial by default:
+        a year takes tens of milliseconds, less than starting a process
+        pool (which re-imports the app per worker on Windows).
+        max_workers > 1 uses a process pool anyway.
+    """
+
+    if max_workers <= 1 or len(jobs) < 2:
+        return [_prepare_month_sheet(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_prepare_month_sheet, jobs))
+
+
+def _write_summary_sheet(ws, sheets: list[dict], employees: list[dict]) -> None:
+    def cell(value, style):
+        c = WriteOnlyCell(ws, value=value)
+        c.style = style
+        return c
+
+    ws.column_dimensions["A"].width = 5
+    ws.column_dimensions["B"].width = 34
+
+    header = [cell("№", "sch_header"), cell("Име, Презиме, Фамилия", "sch_header")]
+    header += [cell(sheet["title"], "sch_header") for sheet in sheets]
+    header.append(cell("Общо", "sch_header"))
+    ws.append(header)
+
+    for idx, emp in enumerate(employees):
+        emp_id = str(emp["id"])
+        counts = [sheet["worked"].get(emp_id, 0) for sheet in sheets]
+
+        row = [cell(idx + 1, "sch_cell"), cell(emp["full_name"], "sch_cell")]
+        row += [cell(count, "sch_shift") for count in counts]
+        row.append(cell(sum(counts), "sch_shift"))
+        ws.append(row)
+
+
+def export_months_to_excel(
+    filename: str,
+    company: str,
+    department: str,
+    city: str,
+    employees: list[dict],
+    months: list[dict],
+    max_workers: int = 1,
+):
+    """
+        Exports several months into one workbook: a summary sheet with
+        the worked days per employee and month, followed by one sheet
+        per month laid out like export_schedule_to_excel.
+
+        months items hold year, month, month_name, days and schedule
+        (employee ID -> {int day: shift}). Sheet rows are prepared first
+        (see prepare_month_sheets) and then streamed into a write-only
+        workbook.
+    """
+
+    if not months:
+        raise ValueError("Няма месеци за експорт.")
+
+    jobs = [
+        {
+            "company": company,
+            "department": department,
+            "city": city,
+            "employees": employees,
+            **m,
+        }
+        for m in months
+    ]
+    sheets = prepare_month_sheets(jobs, max_workers)
+
+    wb = Workbook(write_only=True)
+    register_named_styles(wb)
+
+    _write_summary_sheet(wb.create_sheet(SUMMARY_TITLE), sheets, employees)
+
+    for sheet in sheets:
+        ws = wb.create_sheet(sheet["title"])
+        write_schedule_sheet(ws, iter(sheet["rows"]), sheet["days_count"])
+
+    wb.save(filename)
@@ -3,7 +3,7 @@ from datetime import datetime
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QComboBox, QLabel, QGridLayout, QDialog, QScrollArea,
-    QFileDialog, QPushButton
+    QFileDialog, QPushButton, QCheckBox
 )
 from PyQt6.QtCore import Qt
 
@@ -12,7 +12,9 @@ from desktop_app.calendar_widget import CalendarWidget
 from desktop_app.employees_widget import EmployeesWidget
 from desktop_app.ui.admin.admin_window import AdminWindow
 from desktop_app.export.excel_export import export_schedule_to_excel
+from desktop_app.export.workbook_export import export_months_to_excel
 from desktop_app.msgbox import question, error, show_info, warning
+from desktop_app.workers import TaskRunner
 from PyQt6.QtGui import QDesktopServices
 from PyQt6.QtCore import QUrl
 from pathlib import Path
@@ -41,6 +43,7 @@ class MainWindow(QMainWindow):
         super().__init__()
 
         self.client = AppService()
+        self.tasks = TaskRunner(self)
         self.setWindowTitle("Мениджър на работни графици")
 
         self.current_year = None
@@ -53,6 +56,7 @@ class MainWindow(QMainWindow):
         self._ui_ready = False
 
         self.calendar_widget = CalendarWidget()
+        self.calendar_widget.validation_changed.connect(self._show_live_validation)
 
         self.build_ui()
 
@@ -135,6 +139,11 @@ class MainWindow(QMainWindow):
         export_btn = QPushButton("Експорт в Excel")
         export_btn.clicked.connect(self.export_to_excel)
         export_layout.addWidget(export_btn)
+        export_year_btn = QPushButton("Годишен експорт")
+        export_year_btn.setToolTip("Всички заключени месеци от годината в един файл")
+        export_year_btn.clicked.connect(self.export_year_to_excel)
+        export_layout.addWidget(export_year_btn)
+        self.export_buttons = (export_btn, export_year_btn)
         main_layout.addLayout(export_layout)
 
         self.section_title = QLabel("КАНТАР")
@@ -153,6 +162,11 @@ class MainWindow(QMainWindow):
         self.validation_label.hide()
         main_layout.addWidget(self.validation_label)
 
+        self.live_validation_label = QLabel("")
+        self.live_validation_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+        self.live_validation_label.hide()
+        main_layout.addWidget(self.live_validation_label)
+
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
         self.scroll.setWidget(self.calendar_widget)
@@ -170,6 +184,20 @@ class MainWindow(QMainWindow):
         self.generate_btn.setEnabled(False)
         tools.addWidget(self.generate_btn)
 
+        self.balanced_check = QCheckBox("Балансирано")
+        self.balanced_check.setToolTip(
+            "Разпределя допълнителните, нощните, почивните и празничните\n"
+            "смени според натрупаното натоварване на служителите."
+        )
+        tools.addWidget(self.balanced_check)
+
+        self.leave_check = QCheckBox("Съобрази отпуските")
+        self.leave_check.setToolTip(
+            "Запазва въведените отпуски и болнични (О, Б) и попълва\n"
+            "покритието около тях при генериране."
+        )
+        tools.addWidget(self.leave_check)
+
 
     def init_defaults(self):
         now = datetime.now()
@@ -187,8 +215,9 @@ class MainWindow(QMainWindow):
 
     def load_month(self):
         """
-            Loads or initializes the selected month.
-            Safe against backend-not-ready state.
+            Loads or initializes the selected month in the background.
+            Safe against backend-not-ready state; a newer selection
+            supersedes a load that is still in flight.
         """
 
         if not self._ui_ready:
@@ -203,10 +232,52 @@ class MainWindow(QMainWindow):
         year = int(year)
         month = int(month)
 
+        self.statusBar().showMessage("⏳ Зареждане...")
+        self.tasks.submit(
+            "load",
+            self._fetch_month,
+            year,
+            month,
+            on_done=self._apply_month,
+            on_error=lambda e: self.statusBar().clearMessage(),
+        )
+
+
+    def _fetch_month(self, year: int, month: int) -> dict:
+        """
+            Reads everything the month view needs. Runs on a worker
+            thread, so it only talks to the client, never to widgets.
+        """
+
         try:
             data = self.client.get_schedule(year, month)
-
         except FileNotFoundError:
+            data = None
+
+        return {
+            "year": year,
+            "month": month,
+            "data": data,
+            "employees": self.client.get_employees(),
+            "info": self.client.get_month_info(year, month),
+            "admin_id": self.client.get_month_admin(year, month),
+        }
+
+
+    def _apply_month(self, loaded: dict):
+        """
+            Shows a month fetched by _fetch_month (UI thread).
+        """
+
+        self.statusBar().clearMessage()
+
+        year = loaded["year"]
+        month = loaded["month"]
+        data = loaded["data"]
+        employees = loaded["employees"]
+        admin_id = loaded["admin_id"]
+
+        if data is None:
             self._backend_ready = True
 
             self.current_year = year
@@ -227,10 +298,7 @@ class MainWindow(QMainWindow):
             self.admin_btn.setEnabled(True)
 
             self._update_lock_ui()
-            self.validate_before_generate()
-            return
-
-        except Exception:
+            self.validate_before_generate(employees, admin_id)
             return
 
         self._backend_ready = True
@@ -262,7 +330,7 @@ class MainWindow(QMainWindow):
         self.calendar_widget.set_context(self.client, year, month)
         self.calendar_widget.set_read_only(self.is_locked)
         self.calendar_widget.set_override_mode(False)
-        self.calendar_widget.load(data)
+        self.calendar_widget.load(data, employees=employees, info=loaded["info"])
 
         self._update_lock_ui()
         self.month_title.setText(f"{MONTH_NAMES[month]} {year} г.")
@@ -271,7 +339,7 @@ class MainWindow(QMainWindow):
             not self.is_locked and not generator_locked
         )
 
-        self.validate_before_generate()
+        self.validate_before_generate(employees, admin_id)
 
 
     def toggle_override(self):
@@ -304,6 +372,32 @@ class MainWindow(QMainWindow):
             self.override_btn.setText("✏️ Ръчни корекции")
 
 
+    def _show_live_validation(self, errors: list):
+        """
+            Shows the live validation summary while in override mode.
+            Counts blocking (coverage) and soft (rotation) errors.
+        """
+
+        if not self.override_enabled:
+            self.live_validation_label.hide()
+            return
+
+        blocking = sum(1 for e in errors if e[3] == "blocking")
+        soft = len(errors) - blocking
+
+        if not errors:
+            self.live_validation_label.setText("✅ Графикът е валиден")
+            self.live_validation_label.setStyleSheet("color: green; font-weight: bold;")
+        else:
+            self.live_validation_label.setText(
+                f"❌ Блокиращи грешки: {blocking}   ⚠️ Предупреждения: {soft}"
+            )
+            self.live_validation_label.setStyleSheet(
+                f"color: {'red' if blocking else 'orange'}; font-weight: bold;"
+            )
+        self.live_validation_label.show()
+
+
     def _update_lock_ui(self):
         """
             Updates UI elements based on the month lock state.
@@ -332,6 +426,8 @@ class MainWindow(QMainWindow):
             current schedule context to the admin window.
         """
 
+        self.calendar_widget.flush_overrides()
+
         if self.is_locked:
             show_info(self, "Заключен месец", "Администрацията не е достъпна.")
             return
@@ -346,6 +442,8 @@ class MainWindow(QMainWindow):
 
 
     def open_employees(self):
+        self.calendar_widget.flush_overrides()
+
         if self.is_locked:
             return
 
@@ -381,6 +479,8 @@ class MainWindow(QMainWindow):
             and generates a formatted Excel schedule.
         """
 
+        self.calendar_widget.flush_overrides()
+
         if not self.is_locked:
             warning(self, "Експортът е блокиран", "Първо заключи месеца.")
             return
@@ -394,23 +494,144 @@ class MainWindow(QMainWindow):
         if not filename:
             return
 
-        month_info = self.client.get_month_info(self.current_year, self.current_month)
-        employees = self.client.get_employees()
+        self._run_export(
+            self._write_month_export,
+            filename,
+            self.current_year,
+            self.current_month,
+            self.current_schedule,
+        )
+
+
+    def _write_month_export(self, filename: str, year: int, month: int, schedule: dict) -> str:
+        month_info = self.client.get_month_info(year, month)
 
         export_schedule_to_excel(
             filename=filename,
             company="КАНТАР",
             department="ТРАКИЯ ГЛАС",
             city="ТЪРГОВИЩЕ",
-            month_name=MONTH_NAMES[self.current_month],
-            month=self.current_month,
-            year=self.current_year,
-            employees=employees,
+            month_name=MONTH_NAMES[month],
+            month=month,
+            year=year,
+            employees=self.client.get_employees(),
             days=list(range(1, int(month_info["days"]) + 1)),
-            schedule=self.current_schedule,
+            schedule=schedule,
         )
+        return "Excel файлът е създаден."
 
-        show_info(self, "Готово", "Excel файлът е създаден.")
+
+    def export_year_to_excel(self):
+        """
+            Exports every locked month of the selected year into one
+            workbook with a sheet per month and a summary sheet.
+        """
+
+        self.calendar_widget.flush_overrides()
+
+        year = self.year_select.currentData()
+        if year is None:
+            return
+        year = int(year)
+
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Запази годишния график",
+            f"График_{year}.xlsx",
+            "Excel (*.xlsx)"
+        )
+        if not filename:
+            return
+
+        self._run_export(self._write_year_export, filename, year, with_progress=True)
+
+
+    def _write_year_export(self, filename: str, year: int, report=None) -> str:
+        """
+            Collects the locked months of the year and writes the workbook.
+            Runs on a worker thread.
+        """
+
+        months = []
+        for month in range(1, 13):
+            if report:
+                report(month * 100 // 13, f"Чете се {MONTH_NAMES[month]}...")
+
+            try:
+                data = self.client.get_schedule(year, month)
+            except FileNotFoundError:
+                continue
+
+            if not data.get("ui_locked", False):
+                continue
+
+            month_info = self.client.get_month_info(year, month)
+            months.append({
+                "year": year,
+                "month": month,
+                "month_name": MONTH_NAMES[month],
+                "days": list(range(1, int(month_info["days"]) + 1)),
+                "schedule": data["schedule"],
+            })
+
+        if not months:
+            raise ValueError("Няма заключени месеци за тази година.")
+
+        if report:
+            report(95, "Записва се файлът...")
+
+        export_months_to_excel(
+            filename=filename,
+            company="КАНТАР",
+            department="ТРАКИЯ ГЛАС",
+            city="ТЪРГОВИЩЕ",
+            employees=self.client.get_employees(),
+            months=months,
+        )
+        return f"Excel файлът е създаден ({len(months)} месеца)."
+
+
+    def _run_export(self, fn, *args, with_progress: bool = False):
+        """
+            Runs an export on a worker thread; the export buttons stay
+            disabled until it finishes.
+        """
+
+        if self.tasks.is_running("export"):
+            warning(self, "Експорт", "Друг експорт все още се изпълнява.")
+            return
+
+        for btn in self.export_buttons:
+            btn.setEnabled(False)
+        self.statusBar().showMessage("📄 Експорт...")
+
+        def done(message):
+            finish()
+            show_info(self, "Готово", message)
+
+        def failed(exc):
+            finish()
+            if isinstance(exc, ValueError):
+                warning(self, "Експортът е блокиран", str(exc))
+            else:
+                error(self, "Грешка", f"Неуспешен експорт:\n{exc}")
+
+        def finish():
+            self.statusBar().clearMessage()
+            for btn in self.export_buttons:
+                btn.setEnabled(True)
+
+        self.tasks.submit(
+            "export",
+            fn,
+            *args,
+            on_done=done,
+            on_error=failed,
+            on_progress=(
+                (lambda percent, text: self.statusBar().showMessage(f"📄 {text} {percent}%"))
+                if with_progress else None
+            ),
+        )
 
 
     def generate_month(self):
@@ -419,6 +640,8 @@ class MainWindow(QMainWindow):
             after validating required preconditions in the UI.
         """
 
+        self.calendar_widget.flush_overrides()
+
         if self.is_locked:
             warning(
                 self,
@@ -456,11 +679,33 @@ class MainWindow(QMainWindow):
             )
             return
 
-        try:
-            result = self.client.generate_month(self.current_year, self.current_month)
-        except Exception as e:
-            error(self, "Грешка", str(e))
-            return
+        self.generate_btn.setEnabled(False)
+        self.statusBar().showMessage("⚙️ Генериране...")
+        self.tasks.submit(
+            "generate",
+            self.client.generate_month,
+            self.current_year,
+            self.current_month,
+            mode="balanced" if self.balanced_check.isChecked() else "cycle",
+            leave_aware=self.leave_check.isChecked(),
+            on_done=self._on_generated,
+            on_error=self._on_generate_failed,
+        )
+
+
+    def _on_generate_failed(self, exc: Exception):
+        self.statusBar().clearMessage()
+        self.generate_btn.setEnabled(True)
+        error(self, "Грешка", str(exc))
+
+
+    def _on_generated(self, result: dict):
+        """
+            Reports the outcome of a background generation and reloads
+            the month.
+        """
+
+        self.statusBar().clearMessage()
 
         warnings_list = result.get("warnings", [])
         if warnings_list:
@@ -517,6 +762,8 @@ class MainWindow(QMainWindow):
             and reloads the month in an unlocked state.
         """
 
+        self.calendar_widget.flush_overrides()
+
         if not question(
                 self,
                 "Изчистване на графика",
@@ -548,12 +795,13 @@ class MainWindow(QMainWindow):
         self.load_month()
 
 
-    def validate_before_generate(self):
-        employees = self.client.get_employees()
-        admin_id = self.client.get_month_admin(
-            self.current_year,
-            self.current_month
-        )
+    def validate_before_generate(self, employees=None, admin_id=None):
+        if employees is None:
+            employees = self.client.get_employees()
+            admin_id = self.client.get_month_admin(
+                self.current_year,
+                self.current_month
+            )
 
         if len(employees) < 4:
             self.validation_label.setText(
@@ -587,6 +835,10 @@ class MainWindow(QMainWindow):
 
 
     def closeEvent(self, event):
+        self.calendar_widget.flush_overrides()
+        for key in ("load", "generate"):
+            self.tasks.cancel(key)
+        self.tasks.wait()
         event.accept()
 
 
@@ -1,7 +1,18 @@
-import calendar
-from desktop_app.utils.holidays import get_holidays_for_month
-from scheduler.logic.generator.generator import generate_new_month
-from scheduler.logic.months_logic import load_month, save_month
+from scheduler.logic.calendar_service import month_info, weekday_map
+from scheduler.logic.generator.generator import (
+    generate_new_month,
+    generate_month_range,
+    save_generated_months,
+)
+from scheduler.logic.month_cache import MonthCache
+from scheduler.logic.overrides.batch import apply_override_batch
+from scheduler.logic.months_logic import (
+    MonthConflictError,
+    append_month_overrides,
+    read_month_versioned,
+    save_month,
+    update_month,
+)
 from scheduler.logic.validators.validators import validate_month
 from scheduler.storage.json_storage import (
     clear_month_data,
@@ -14,11 +25,17 @@ from scheduler.storage.json_storage import (
 
 
 class AppService:
+    def __init__(self):
+        self.months = MonthCache()
+
+
     def get_schedule(self, year: int, month: int):
-        data = load_month(year, month)
+        data = self.months.get(year, month)
         if not data:
             raise FileNotFoundError
 
+        self.months.prefetch_adjacent(year, month)
+
         raw = data.get("schedule", {})
         data["schedule"] = {
             emp: {int(day): shift for day, shift in days.items()}
@@ -32,24 +49,23 @@ class AppService:
 
 
     def get_month_info(self, year: int, month: int):
-        days_in_month = calendar.monthrange(year, month)[1]
-
-        weekends = [
-            day
-            for day in range(1, days_in_month + 1)
-            if calendar.weekday(year, month, day) >= 5
-        ]
-
-        holidays = get_holidays_for_month(year, month)
+        info = month_info(year, month)
 
         return {
-            "days": days_in_month,
-            "weekends": weekends,
-            "holidays": holidays,
+            "days": info["days"],
+            "weekends": info["weekends"],
+            "holidays": info["holidays"],
         }
 
 
-    def generate_month(self, year: int, month: int, strict: bool = True):
+    def generate_month(
+        self,
+        year: int,
+        month: int,
+        strict: bool = True,
+        mode: str = "cycle",
+        leave_aware: bool = False,
+    ):
         raw_employees = load_employees()
 
         employees = {
@@ -58,20 +74,48 @@ class AppService:
             if e.get("is_active")
         }
 
-        result = generate_new_month(year, month, employees, strict)
+        result = generate_new_month(
+            year, month, employees, strict, mode, leave_aware=leave_aware
+        )
 
         save_month(year, month, result)
+        self.months.invalidate(year, month)
         return result
 
 
+    def generate_range(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        mode: str = "cycle",
+        leave_aware: bool = False,
+    ):
+        raw_employees = load_employees()
+
+        employees = {
+            str(e["id"]): e["full_name"]
+            for e in raw_employees
+            if e.get("is_active")
+        }
+
+        generated = generate_month_range(
+            start, end, employees, mode, leave_aware=leave_aware
+        )
+        save_generated_months(generated)
+        for m in generated:
+            self.months.invalidate(m["year"], m["month"])
+        return generated
+
+
     def clear_month(self, year: int, month: int):
         clear_month_data(year, month)
+        self.months.invalidate(year, month)
         return {"ok": True}
 
 
     def get_month_admin(self, year: int, month: int):
         try:
-            data = load_month(year, month)
+            data = self.months.get(year, month)
             return data.get("month_admin_id")
         except FileNotFoundError:
             return None
@@ -119,41 +163,50 @@ class AppService:
 
 
     def set_month_admin(self, year: int, month: int, admin_id: int | str):
+        def set_admin(data):
+            data["month_admin_id"] = str(admin_id)
+
         try:
-            data = load_month(year, month)
+            update_month(year, month, set_admin)
         except FileNotFoundError:
-            data = {
+            save_month(year, month, {
                 "year": year,
                 "month": month,
                 "schedule": {},
                 "overrides": {},
                 "generator_locked": False,
                 "ui_locked": False,
-            }
-
-        data["month_admin_id"] = str(admin_id)
-        save_month(year, month, data)
+                "month_admin_id": str(admin_id),
+            })
+        finally:
+            self.months.invalidate(year, month)
         return {"ok": True}
 
 
     def post_override(self, year: int, month: int, data: dict):
-        month_data = load_month(year, month)
-
-        overrides = month_data.setdefault("overrides", {})
-
         emp_id = str(data["employee_id"])
         day = str(data["day"])
         shift = data.get("new_shift", "")
 
-        overrides.setdefault(emp_id, {})[day] = shift
-
-        save_month(year, month, month_data)
+        append_month_overrides(year, month, [(emp_id, day, shift)])
+        self.months.invalidate(year, month)
 
         return {"ok": True}
 
 
+    def post_overrides(self, year: int, month: int, changes: list[dict]):
+        employee_ids = [str(e["id"]) for e in load_employees()]
+
+        try:
+            result = apply_override_batch(year, month, changes, employee_ids)
+        finally:
+            self.months.invalidate(year, month)
+
+        return {"ok": True, **result}
+
+
     def lock_month(self, year: int, month: int):
-        data = load_month(year, month)
+        data, version = read_month_versioned(year, month)
 
         schedule = data.get("schedule", {})
         admin_id = data.get("month_admin_id")
@@ -164,11 +217,7 @@ class AppService:
                 "message": "Няма избран администратор."
             }
 
-        days_in_month = calendar.monthrange(year, month)[1]
-        weekdays = {
-            day: calendar.weekday(year, month, day)
-            for day in range(1, days_in_month + 1)
-        }
+        weekdays = weekday_map(year, month)
 
         errors = validate_month(
             schedule=schedule,
@@ -185,6 +234,14 @@ class AppService:
             }
 
         data["ui_locked"] = True
-        save_month(year, month, data)
+        try:
+            save_month(year, month, data, expected_version=version)
+        except MonthConflictError:
+            return {
+                "ok": False,
+                "message": "Месецът беше променен междувременно. Провери графика и заключи отново."
+            }
+        finally:
+            self.months.invalidate(year, month)
 
         return {"ok": True}
@@ -15,8 +15,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 
 from desktop_app.msgbox import warning, error
-from scheduler.logic.cycle_state import save_last_cycle_state
-from scheduler.logic.generator.generator import CYCLE, CYCLE_LEN
+from scheduler.logic.cycle_state import load_last_cycle_state, save_last_cycle_state
+from scheduler.logic.generator.matrix import CYCLE, CYCLE_LEN
 
 
 ALLOWED_SHIFTS = ["", "Д", "В", "Н", "А", "О", "Б"]
@@ -202,6 +202,8 @@ class AdminWindow(QWidget):
 
             last_day = date(year, month, calendar.monthrange(year, month)[1])
 
+            # the balanced mode fairness counters survive a new cycle start
+            previous = load_last_cycle_state()
             state = {}
 
             for emp_id, days in schedule.items():
@@ -223,6 +225,9 @@ class AdminWindow(QWidget):
                 state[str(emp_id)] = {
                     "cycle_index": cycle_index % CYCLE_LEN
                 }
+                balance = previous.get(str(emp_id), {}).get("balance")
+                if balance:
+                    state[str(emp_id)]["balance"] = balance
 
             save_last_cycle_state(state, last_day)
             self.main_window.load_month()
@@ -0,0 +1,145 @@
+"""
+    Background task layer for the desktop UI.
+
+    Blocking work (file I/O, generation, export) runs on a QThreadPool and
+    reports back through Qt signals, so the window keeps repainting while
+    it runs. Tasks are submitted under a key; submitting a new task under
+    the same key supersedes the previous one and its result is dropped.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class TaskSignals(QObject):
+    """
+        Signals of one task. Every signal carries the task first so the
+        runner can tell stale results apart from current ones.
+    """
+
+    progress = pyqtSignal(object, int, str)
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, object)
+
+
+class Task(QRunnable):
+    """
+        Runs fn(*args, **kwargs) on a pool thread.
+        With progress=True the callable also receives report(percent, text).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key: str, fn: Callable, *args, progress: bool = False, **kwargs):
+        super().__init__()
+        self.id = next(self._ids)
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+
+        if progress:
+            self.kwargs["report"] = self.report
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report(self, percent: int, text: str = ""):
+        if not self.cancelled:
+            self.signals.progress.emit(self, percent, text)
+
+    @pyqtSlot()
+    def run(self):
+        if self.cancelled:
+            return
+
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self, e)
+            return
+
+        self.signals.finished.emit(self, result)
+
+
+class TaskRunner(QObject):
+    """
+        Submits tasks to a thread pool and delivers their results on the
+        thread the runner lives in (the UI thread).
+            - One current task per key; older tasks under the key are
+              cancelled and their results ignored
+            - Callbacks: on_done(result), on_error(exception),
+              on_progress(percent, text)
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, pool: Optional[QThreadPool] = None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._current: Dict[str, Task] = {}
+        self._callbacks: Dict[int, tuple] = {}
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable,
+        *args,
+        on_done: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        on_progress: Optional[Callable] = None,
+        **kwargs,
+    ) -> Task:
+        self.cancel(key)
+
+        task = Task(key, fn, *args, progress=on_progress is not None, **kwargs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        task.signals.progress.connect(self._on_progress)
+
+        self._current[key] = task
+        self._callbacks[task.id] = (on_done, on_error, on_progress)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, key: str):
+        task = self._current.pop(key, None)
+        if task is not None:
+            task.cancel()
+            self._callbacks.pop(task.id, None)
+
+    def is_running(self, key: str) -> bool:
+        return key in self._current
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+    def _take(self, task: Task):
+        if task.cancelled or self._current.get(task.key) is not task:
+            return None
+        del self._current[task.key]
+        return self._callbacks.pop(task.id, None)
+
+    @pyqtSlot(object, object)
+    def _on_finished(self, task: Task, result):
+        callbacks = self._take(task)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    @pyqtSlot(object, object)
+    def _on_failed(self, task: Task, exc):
+        callbacks = self._take(task)
+        if callbacks and callbacks[1]:
+            callbacks[1](exc)
+
+    @pyqtSlot(object, int, str)
+    def _on_progress(self, task: Task, percent: int, text: str):
+        if task.cancelled or self._current.get(task.key) is not task:
+            return
+        callbacks = self._callbacks.get(task.id)
+        if callbacks and callbacks[2]:
+            callbacks[2](percent, text)
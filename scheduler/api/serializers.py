@@ -1,10 +1,32 @@
 from rest_framework import serializers
+from scheduler.logic.generator.generator import GENERATOR_MODES
+from scheduler.logic.generator.leave_solver import DEFAULT_TIME_BUDGET
 from scheduler.models import Employee
 
 
 class GenerateMonthSerializer(serializers.Serializer):
     year = serializers.IntegerField()
     month = serializers.IntegerField(min_value=1, max_value=12)
+    mode = serializers.ChoiceField(choices=GENERATOR_MODES, default="cycle")
+    leave_aware = serializers.BooleanField(default=False)
+    time_budget = serializers.FloatField(min_value=0.1, max_value=60, default=DEFAULT_TIME_BUDGET)
+
+
+class GenerateRangeSerializer(serializers.Serializer):
+    start_year = serializers.IntegerField()
+    start_month = serializers.IntegerField(min_value=1, max_value=12)
+    end_year = serializers.IntegerField()
+    end_month = serializers.IntegerField(min_value=1, max_value=12)
+    mode = serializers.ChoiceField(choices=GENERATOR_MODES, default="cycle")
+    leave_aware = serializers.BooleanField(default=False)
+    time_budget = serializers.FloatField(min_value=0.1, max_value=60, default=DEFAULT_TIME_BUDGET)
+
+    def validate(self, attrs):
+        start = (attrs["start_year"], attrs["start_month"])
+        end = (attrs["end_year"], attrs["end_month"])
+        if start > end:
+            raise serializers.ValidationError("Началото е след края на периода.")
+        return attrs
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
@@ -38,3 +60,18 @@ class OverrideSerializer(serializers.Serializer):
     new_shift = serializers.CharField(max_length=5)
 
 
+class OverrideBatchSerializer(serializers.Serializer):
+    changes = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=5000,
+    )
+
+
+class WorkloadQuerySerializer(serializers.Serializer):
+    start = serializers.RegexField(r"^\d{4}-(0[1-9]|1[0-2])$")
+    end = serializers.RegexField(r"^\d{4}-(0[1-9]|1[0-2])$")
+    employee = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+    )
@@ -2,13 +2,16 @@ from django.urls import path, include
 from scheduler.api.views import (
     ScheduleView,
     GenerateMonthView,
+    GenerateRangeView,
     EmployeeListCreateView,
     EmployeeDetailView,
     ScheduleOverrideAPI,
+    ScheduleOverrideBatchAPI,
     LockMonthView,
     ClearScheduleAPI,
     ClearMonthScheduleAPI,
     SetMonthAdminView,
+    WorkloadAnalyticsView,
 )
 
 
@@ -17,7 +20,9 @@ urlpatterns = [
     # --- Schedule API ---
     path('schedule/<int:year>/<int:month>/', ScheduleView.as_view(), name='api_schedule'),
     path('schedule/generate/', GenerateMonthView.as_view(), name='api_generate_month'),
+    path('schedule/generate-range/', GenerateRangeView.as_view(), name='api_generate_range'),
     path('schedule/<int:year>/<int:month>/override/', ScheduleOverrideAPI.as_view(), name='api_schedule_override'),
+    path('schedule/<int:year>/<int:month>/overrides/batch/', ScheduleOverrideBatchAPI.as_view(), name='api_schedule_override_batch'),
     path('employees/', EmployeeListCreateView.as_view(), name='api_employees'),
     path('employees/<int:id>/', EmployeeDetailView.as_view(), name='api_employee_detail'),
     path("meta/", include("scheduler.api.meta.urls")),
@@ -25,6 +30,7 @@ urlpatterns = [
     path("schedule/<int:year>/<int:month>/clear/", ClearScheduleAPI.as_view(),),
     path("schedule/<int:year>/<int:month>/clear/", ClearMonthScheduleAPI.as_view(),),
     path("schedule/<int:year>/<int:month>/admin/", SetMonthAdminView.as_view(), name="api_set_month_admin"),
+    path("analytics/workload/", WorkloadAnalyticsView.as_view(), name="api_workload_analytics"),
 
 ]
 
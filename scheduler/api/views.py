@@ -1,4 +1,3 @@
-import calendar
 from datetime import date
 
 from rest_framework.views import APIView
@@ -6,21 +5,37 @@ from rest_framework.response import Response
 from rest_framework import status
 from scheduler.logic.cycle_state import load_last_cycle_state, save_last_cycle_state
 from scheduler.logic.generator.generator import generate_new_month
-from scheduler.logic.json_help_functions import _load_json
-from scheduler.logic.months_logic import list_month_files, get_month_path
+from scheduler.logic.months_logic import list_month_files
 from scheduler.logic.generator.apply_overrides import apply_overrides
 from scheduler.api.serializers import (
     GenerateMonthSerializer,
+    GenerateRangeSerializer,
+    OverrideBatchSerializer,
+    WorkloadQuerySerializer,
     EmployeeSerializer,
     EmployeeUpdateSerializer,
 )
-from scheduler.api.utils.holidays import get_holidays_for_month
+from scheduler.logic.calendar_service import days_in_month, month_info, weekday_map
+from scheduler.logic.overrides.batch import apply_override_batch
 from scheduler.logic.validators.validators import validate_month
 from scheduler.models import Employee, MonthAdmin
 from scheduler.api.utils.validation_errors import humanize_validation_error
-from scheduler.logic.months_logic import load_month, save_month
+from scheduler.logic.months_logic import (
+    MonthConflictError,
+    MonthLockedError,
+    load_month,
+    save_month,
+    read_month_versioned,
+    update_month,
+    normalize_month,
+    month_hash,
+    save_month_if_changed,
+    append_month_overrides,
+)
 from scheduler.api.errors import api_error
 from scheduler.logic.cycle_state_extractor import extract_cycle_state_from_schedule
+from scheduler.services.generation_service import GenerationService
+from scheduler.services.workload_service import WorkloadService
 
 
 
@@ -52,28 +67,20 @@ class MonthInfoView(APIView):
     """
 
     def get(self, request, year, month):
-        days = calendar.monthrange(year, month)[1]
-        weekends = [d for d in range(1, days + 1) if calendar.weekday(year, month, d) >= 5]
-        holidays = get_holidays_for_month(year, month)
-
-        return Response({
-            "year": year,
-            "month": month,
-            "days": days,
-            "weekends": weekends,
-            "holidays": holidays
-        })
+        return Response(month_info(year, month))
 
 
 class ScheduleView(APIView):
     """
         Read-only normalization view.
         NEVER modifies ui_locked.
+        Normalizes in memory and writes back only when the normalized
+        month differs from the stored one (content hash).
     """
 
     def get(self, request, year, month):
         try:
-            data = load_month(year, month)
+            stored, version = read_month_versioned(year, month)
         except FileNotFoundError:
             return Response({
                 "year": year,
@@ -85,43 +92,18 @@ class ScheduleView(APIView):
                 "is_new": True,
             })
 
-        days = calendar.monthrange(year, month)[1]
-        employees = Employee.objects.all()
-
-        schedule = data.get("schedule", {})
-        overrides = data.get("overrides", {})
-        ui_locked = bool(data.get("ui_locked", False))
-        generator_locked = bool(data.get("generator_locked", False))
-
-        rebuilt = {}
-
-        for emp in employees:
-            eid = str(emp.id)
-            emp_days = schedule.get(eid, {})
-
-            rebuilt[eid] = {
-                str(d): emp_days.get(str(d), "")
-                for d in range(1, days + 1)
-            }
-
-        data["schedule"] = rebuilt
-        data["overrides"] = {
-            emp_id: {
-                str(day): shift
-                for day, shift in days_map.items()
-                if str(day) in rebuilt.get(emp_id, {})
-            }
-            for emp_id, days_map in overrides.items()
-            if emp_id in rebuilt
-        }
-
-        data["ui_locked"] = ui_locked
-        data["generator_locked"] = generator_locked
+        days = days_in_month(year, month)
+        employee_ids = [str(emp.id) for emp in Employee.objects.all()]
 
-        save_month(year, month, data)
+        data = normalize_month(stored, employee_ids, days)
+        try:
+            save_month_if_changed(year, month, data, month_hash(stored), expected_version=version)
+        except MonthConflictError:
+            # changed by another writer meanwhile; the next read normalizes
+            pass
 
         final_schedule = apply_overrides(
-            data["schedule"],
+            {eid: dict(emp_days) for eid, emp_days in data["schedule"].items()},
             data["overrides"]
         )
 
@@ -130,8 +112,8 @@ class ScheduleView(APIView):
             "month": month,
             "schedule": final_schedule,
             "overrides": data["overrides"],
-            "generator_locked": generator_locked,
-            "ui_locked": ui_locked,
+            "generator_locked": data["generator_locked"],
+            "ui_locked": data["ui_locked"],
             "month_admin_id": data.get("month_admin_id"),
         })
 
@@ -170,6 +152,9 @@ class GenerateMonthView(APIView):
         year = serializer.validated_data["year"]
         month = serializer.validated_data["month"]
         strict = serializer.validated_data.get("strict", True)
+        mode = serializer.validated_data["mode"]
+        leave_aware = serializer.validated_data["leave_aware"]
+        time_budget = serializer.validated_data["time_budget"]
 
         employees_count = Employee.objects.filter(is_active=True).count()
         try:
@@ -205,13 +190,15 @@ class GenerateMonthView(APIView):
                     month=month,
                     employees=employees,
                     strict=strict,
+                    mode=mode,
+                    leave_aware=leave_aware,
+                    time_budget=time_budget,
                 )
 
                 if "final_cycle_state" in generated:
-                    _, days_in_month = calendar.monthrange(year, month)
                     save_last_cycle_state(
                         generated["final_cycle_state"],
-                        date(year, month, days_in_month)
+                        date(year, month, days_in_month(year, month))
                     )
 
                 generated["ui_locked"] = False
@@ -260,6 +247,9 @@ class GenerateMonthView(APIView):
                 month=month,
                 employees=employees,
                 strict=strict,
+                mode=mode,
+                leave_aware=leave_aware,
+                time_budget=time_budget,
             )
         except Exception:
             return api_error(
@@ -270,10 +260,9 @@ class GenerateMonthView(APIView):
             )
 
         if "final_cycle_state" in generated:
-            _, days_in_month = calendar.monthrange(year, month)
             save_last_cycle_state(
                 generated["final_cycle_state"],
-                date(year, month, days_in_month)
+                date(year, month, days_in_month(year, month))
             )
 
         generated["ui_locked"] = False
@@ -290,6 +279,58 @@ class GenerateMonthView(APIView):
         )
 
 
+class GenerateRangeView(APIView):
+    """
+        API endpoint for generating several consecutive months at once.
+        Chains the cycle state between months in memory and saves all
+        month files in one batch after every month is generated.
+    """
+
+    def post(self, request):
+        serializer = GenerateRangeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return api_error(
+                "INVALID_INPUT",
+                "Невалидни параметри.",
+                hint=str(serializer.errors),
+                http_status=400
+            )
+
+        v = serializer.validated_data
+        start = (v["start_year"], v["start_month"])
+        end = (v["end_year"], v["end_month"])
+
+        try:
+            generated = GenerationService.generate_range(
+                start,
+                end,
+                mode=v["mode"],
+                leave_aware=v["leave_aware"],
+                time_budget=v["time_budget"],
+            )
+        except RuntimeError as e:
+            return api_error(
+                "GENERATOR_ERROR",
+                str(e),
+                http_status=409
+            )
+
+        return Response(
+            {
+                "generated": True,
+                "months": [
+                    {
+                        "year": m["year"],
+                        "month": m["month"],
+                        "warnings": m.get("warnings", []),
+                    }
+                    for m in generated
+                ],
+            },
+            status=201
+        )
+
+
 class ScheduleOverrideAPI(APIView):
     """
         API endpoint for applying manual schedule overrides.
@@ -302,21 +343,79 @@ class ScheduleOverrideAPI(APIView):
         day = int(request.data.get("day"))
         shift = _normalize_shift(request.data.get("new_shift"))
 
-        data = load_month(year, month)
-
-        if data.get("ui_locked"):
+        try:
+            append_month_overrides(year, month, [(emp_id, str(day), shift)], reject_locked=True)
+        except FileNotFoundError:
+            return api_error(
+                "NOT_FOUND",
+                "Месецът не съществува.",
+                http_status=404
+            )
+        except MonthLockedError:
             return api_error(
                 "MONTH_LOCKED",
                 "Месецът е заключен.",
                 http_status=409
             )
 
-        data.setdefault("schedule", {}).setdefault(emp_id, {})[day] = shift
-        data.setdefault("overrides", {}).setdefault(emp_id, {})[day] = shift
+        return Response({"status": "ok"})
 
-        save_month(year, month, data)
 
-        return Response({"status": "ok"})
+class ScheduleOverrideBatchAPI(APIView):
+    """
+        API endpoint for applying many manual overrides at once.
+        All changes are validated first and written with one journal
+        append (all or nothing), followed by one validation pass whose
+        errors are returned for the UI.
+    """
+
+    def post(self, request, year, month):
+        serializer = OverrideBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return api_error(
+                "INVALID_INPUT",
+                "Невалидни параметри.",
+                hint=str(serializer.errors),
+                http_status=400
+            )
+
+        employee_ids = [str(emp.id) for emp in Employee.objects.all()]
+
+        try:
+            result = apply_override_batch(
+                year,
+                month,
+                serializer.validated_data["changes"],
+                employee_ids,
+            )
+        except FileNotFoundError:
+            return api_error(
+                "NOT_FOUND",
+                "Месецът не съществува.",
+                http_status=404
+            )
+        except RuntimeError as e:
+            return api_error(
+                "MONTH_LOCKED",
+                str(e),
+                http_status=409
+            )
+        except ValueError as e:
+            return api_error(
+                "INVALID_OVERRIDE",
+                str(e),
+                hint="Нито една от корекциите не е записана.",
+                http_status=400
+            )
+
+        return Response({
+            "status": "ok",
+            "applied": result["applied"],
+            "errors": [
+                humanize_validation_error(emp, day, msg, error_type)
+                for emp, day, msg, error_type in result["errors"]
+            ],
+        })
 
 
 class LockMonthView(APIView):
@@ -325,10 +424,8 @@ class LockMonthView(APIView):
     """
 
     def post(self, request, year, month):
-        path = get_month_path(year, month)
-
         try:
-            data = _load_json(path)
+            data, version = read_month_versioned(year, month)
         except FileNotFoundError:
             return api_error(
                 "NOT_FOUND",
@@ -348,11 +445,7 @@ class LockMonthView(APIView):
 
         final_schedule = apply_overrides(schedule, overrides)
 
-        days = calendar.monthrange(year, month)[1]
-        weekdays = {
-            d: calendar.weekday(year, month, d)
-            for d in range(1, days + 1)
-        }
+        weekdays = weekday_map(year, month)
 
         admin_id = data.get("month_admin_id")
 
@@ -388,7 +481,15 @@ class LockMonthView(APIView):
         data["schedule"] = final_schedule
         data["ui_locked"] = True
 
-        save_month(year, month, data)
+        try:
+            save_month(year, month, data, expected_version=version)
+        except MonthConflictError:
+            return api_error(
+                "MONTH_CHANGED",
+                "Месецът беше променен междувременно.",
+                hint="Провери графика и заключи отново.",
+                http_status=409
+            )
 
         return Response(
             {
@@ -573,8 +674,13 @@ class SetMonthAdminView(APIView):
                 http_status=404
             )
 
+        def set_admin(data):
+            if data.get("ui_locked"):
+                return False
+            data["month_admin_id"] = emp_id
+
         try:
-            data = load_month(year, month)
+            data = update_month(year, month, set_admin)
         except FileNotFoundError:
             data = {
                 "year": year,
@@ -583,7 +689,9 @@ class SetMonthAdminView(APIView):
                 "overrides": {},
                 "ui_locked": False,
                 "generator_locked": False,
+                "month_admin_id": emp_id,
             }
+            save_month(year, month, data)
 
         if data.get("ui_locked"):
             return api_error(
@@ -592,10 +700,51 @@ class SetMonthAdminView(APIView):
                 http_status=409
             )
 
-        data["month_admin_id"] = emp_id
-        save_month(year, month, data)
-
         return Response({"ok": True})
 
 
+class WorkloadAnalyticsView(APIView):
+    """
+        API endpoint for per-employee workload totals over a month range.
+        Query: ?start=YYYY-MM&end=YYYY-MM, optionally repeated
+        &employee=<id>. Totals come from the monthly aggregates.
+    """
 
+    def get(self, request):
+        serializer = WorkloadQuerySerializer(data={
+            "start": request.query_params.get("start"),
+            "end": request.query_params.get("end"),
+            **(
+                {"employee": request.query_params.getlist("employee")}
+                if "employee" in request.query_params else {}
+            ),
+        })
+        if not serializer.is_valid():
+            return api_error(
+                "INVALID_INPUT",
+                "Невалидни параметри.",
+                hint="Очаква се start=YYYY-MM и end=YYYY-MM.",
+                http_status=400
+            )
+
+        start = tuple(int(p) for p in serializer.validated_data["start"].split("-"))
+        end = tuple(int(p) for p in serializer.validated_data["end"].split("-"))
+
+        try:
+            employees = WorkloadService.summary(
+                start,
+                end,
+                serializer.validated_data.get("employee"),
+            )
+        except ValueError as e:
+            return api_error(
+                "INVALID_RANGE",
+                str(e),
+                http_status=400
+            )
+
+        return Response({
+            "start": serializer.validated_data["start"],
+            "end": serializer.validated_data["end"],
+            "employees": employees,
+        })
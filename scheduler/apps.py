@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class SchedulerConfig(AppConfig):
+    name = "scheduler"
+
+    def ready(self):
+        from scheduler.logic.months_logic import add_save_listener
+        from scheduler.services.shift_assignment_service import ShiftAssignmentService
+        from scheduler.services.workload_service import WorkloadService
+
+        # the workload rows of an override append are recomputed from
+        # the ShiftAssignment rows, so those have to be updated first
+        add_save_listener(ShiftAssignmentService.on_month_saved)
+        add_save_listener(WorkloadService.on_month_saved)
@@ -0,0 +1,259 @@
+"""
+    Calendar metadata shared by the backend and the desktop app.
+
+    Every year is computed once into flat tables (days per month,
+    weekday of every day, holiday and working-day bitmasks) and cached;
+    month and range queries are answered from those tables.
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+
+FIXED_HOLIDAYS = [
+    (1, 1),    # New Year
+    (3, 3),    # Liberation
+    (5, 1),    # Labor Day
+    (5, 6),    # St. George's Day
+    (5, 24),   # Alphabet Day
+    (9, 6),    # Union Day
+    (9, 22),   # Independence Day
+    (12, 24),  # Christmas Eve
+    (12, 25),  # Christmas
+    (12, 26),  # Christmas
+]
+
+
+
+def orthodox_easter(year):
+    """
+        Calculates the date of Orthodox Easter for a given year.
+        Computes the Julian calendar Easter date and converts it
+        to the Gregorian calendar.
+    """
+
+    a = year % 4
+    b = year % 7
+    c = year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month = (d + e + 114) // 31
+    day = ((d + e + 114) % 31) + 1
+
+    easter_julian = date(year, month, day)
+    easter_gregorian = easter_julian + timedelta(days=13)
+    return easter_gregorian
+
+
+def easter_holidays(year):
+    """
+        Returns Orthodox Easter-related holiday dates for a given year.
+        Includes Good Friday, Holy Saturday, Easter Sunday,
+        and Bright Monday.
+    """
+
+    easter = orthodox_easter(year)
+    good_friday = easter - timedelta(days=2)
+    holy_saturday = easter - timedelta(days=1)
+    easter_sunday = easter
+    bright_monday = easter + timedelta(days=1)
+    return [good_friday, holy_saturday, easter_sunday, bright_monday,]
+
+
+@dataclass(frozen=True)
+class MonthCalendar:
+    """
+        Precomputed calendar of one month.
+        weekdays[d - 1] is the weekday of day d (0 = Monday); bit d of
+        holiday_mask / working_mask is set for holidays / working days.
+    """
+
+    year: int
+    month: int
+    days: int
+    weekdays: Tuple[int, ...]
+    weekends: Tuple[int, ...]
+    holidays: Tuple[int, ...]
+    holiday_mask: int
+    working_mask: int
+
+    def is_holiday(self, day: int) -> bool:
+        return bool(self.holiday_mask >> day & 1)
+
+    def is_working_day(self, day: int) -> bool:
+        return bool(self.working_mask >> day & 1)
+
+
+@dataclass(frozen=True)
+class YearCalendar:
+    """
+        Precomputed calendar of one year, indexed by day of year (0-based).
+        month_offsets[m - 1] is the day-of-year index of the 1st of month m.
+    """
+
+    year: int
+    month_days: Tuple[int, ...]
+    month_offsets: Tuple[int, ...]
+    weekdays: bytes
+    holiday_mask: int
+    working_mask: int
+    months: Tuple[MonthCalendar, ...]
+
+
+class DayInfo(NamedTuple):
+    date: date
+    weekday: int
+    holiday: bool
+    working: bool
+
+
+def _month_table(year: int, month: int, holiday_days: List[int]) -> MonthCalendar:
+    first_weekday, days = calendar.monthrange(year, month)
+    weekdays = tuple((first_weekday + i) % 7 for i in range(days))
+
+    holiday_mask = 0
+    for d in holiday_days:
+        holiday_mask |= 1 << d
+
+    working_mask = 0
+    for d in range(1, days + 1):
+        if weekdays[d - 1] < 5 and not holiday_mask >> d & 1:
+            working_mask |= 1 << d
+
+    return MonthCalendar(
+        year=year,
+        month=month,
+        days=days,
+        weekdays=weekdays,
+        weekends=tuple(d for d in range(1, days + 1) if weekdays[d - 1] >= 5),
+        holidays=tuple(sorted(holiday_days)),
+        holiday_mask=holiday_mask,
+        working_mask=working_mask,
+    )
+
+
+@lru_cache(maxsize=64)
+def year_calendar(year: int) -> YearCalendar:
+    """
+        Returns the cached calendar tables of a year.
+    """
+
+    by_month: Dict[int, List[int]] = {m: [] for m in range(1, 13)}
+    for m, d in FIXED_HOLIDAYS:
+        by_month[m].append(d)
+    for easter_day in easter_holidays(year):
+        if easter_day.year == year:
+            by_month[easter_day.month].append(easter_day.day)
+
+    months = tuple(_month_table(year, m, by_month[m]) for m in range(1, 13))
+
+    offsets = []
+    weekdays = bytearray()
+    holiday_mask = 0
+    working_mask = 0
+
+    for mc in months:
+        offset = len(weekdays)
+        offsets.append(offset)
+        weekdays.extend(mc.weekdays)
+        # month masks are 1-based by day, the year masks 0-based by index
+        holiday_mask |= (mc.holiday_mask >> 1) << offset
+        working_mask |= (mc.working_mask >> 1) << offset
+
+    return YearCalendar(
+        year=year,
+        month_days=tuple(mc.days for mc in months),
+        month_offsets=tuple(offsets),
+        weekdays=bytes(weekdays),
+        holiday_mask=holiday_mask,
+        working_mask=working_mask,
+        months=months,
+    )
+
+
+def month_calendar(year: int, month: int) -> MonthCalendar:
+    return year_calendar(year).months[month - 1]
+
+
+def days_in_month(year: int, month: int) -> int:
+    return year_calendar(year).month_days[month - 1]
+
+
+def get_holidays_for_month(year, month):
+    """
+        Returns all official holidays for a given month.
+        Combines fixed-date holidays and Orthodox Easter-related holidays
+        and returns the list of day numbers within the month.
+    """
+
+    return list(month_calendar(year, month).holidays)
+
+
+def weekday_map(year: int, month: int) -> Dict[int, int]:
+    """
+        Returns {day: weekday} for the month, as the validators expect.
+    """
+
+    return dict(enumerate(month_calendar(year, month).weekdays, start=1))
+
+
+def month_info(year: int, month: int) -> dict:
+    """
+        Returns the month metadata served to the UI: days, weekend days
+        and holidays.
+    """
+
+    mc = month_calendar(year, month)
+    return {
+        "year": year,
+        "month": month,
+        "days": mc.days,
+        "weekends": list(mc.weekends),
+        "holidays": list(mc.holidays),
+    }
+
+
+def _year_slices(start: date, end: date) -> Iterator[Tuple[YearCalendar, int, int]]:
+    """
+        Splits [start, end] into (year table, first index, last index)
+        pieces, one per calendar year.
+    """
+
+    for year in range(start.year, end.year + 1):
+        yc = year_calendar(year)
+        first = start.timetuple().tm_yday - 1 if year == start.year else 0
+        last = end.timetuple().tm_yday - 1 if year == end.year else len(yc.weekdays) - 1
+        yield yc, first, last
+
+
+def iter_days(start: date, end: date) -> Iterator[DayInfo]:
+    """
+        Yields the calendar of every day from start to end (inclusive).
+    """
+
+    current = start
+    for yc, first, last in _year_slices(start, end):
+        for i in range(first, last + 1):
+            yield DayInfo(
+                current,
+                yc.weekdays[i],
+                bool(yc.holiday_mask >> i & 1),
+                bool(yc.working_mask >> i & 1),
+            )
+            current += timedelta(days=1)
+
+
+def count_working_days(start: date, end: date) -> int:
+    """
+        Counts the working days from start to end (inclusive) straight
+        from the year bitmasks.
+    """
+
+    total = 0
+    for yc, first, last in _year_slices(start, end):
+        window = (1 << (last - first + 1)) - 1
+        total += bin(yc.working_mask >> first & window).count("1")
+    return total
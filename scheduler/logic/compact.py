@@ -0,0 +1,220 @@
+"""
+    Compact integer-coded schedules.
+
+    A CompactSchedule keeps one array('B') per employee, one byte per
+    day, holding a Shift code; employees are rows reached through an
+    index map. A month of 1000 employees is ~31 KB of cells instead of
+    tens of MB of nested dicts and strings.
+
+    Conversion with the JSON form ({employee: {"day": "Д"}}) is lossless:
+    cells missing from the JSON are stored as MISSING, and shift strings
+    outside Shift get codes from EXTRA_BASE up, remembered per schedule.
+"""
+
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from scheduler.logic.calendar_service import days_in_month
+from scheduler.logic.rules import SHIFT_INDEX, is_rest_like, to_lat
+
+
+class Shift(IntEnum):
+    REST = 0
+    D = 1
+    V = 2
+    N = 3
+    A = 4
+    LEAVE = 5
+    SICK = 6
+
+
+SHIFT_CODES: Tuple[str, ...] = ("", "Д", "В", "Н", "А", "О", "Б")
+CODE_OF: Dict[str, int] = {s: i for i, s in enumerate(SHIFT_CODES)}
+
+MISSING = 0xFF
+EXTRA_BASE = 16
+
+
+class CompactSchedule:
+    """
+        Employees x days matrix of shift codes.
+            - rows[i][d - 1] is the code of employees[i] on day d
+            - index maps an employee id (str) to its row
+            - extra holds the strings of codes >= EXTRA_BASE
+    """
+
+    __slots__ = ("days", "employees", "index", "rows", "extra")
+
+    def __init__(self, days: int, employees: Iterable[str] = ()):
+        self.days = days
+        self.employees: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.rows: List[array] = []
+        self.extra: List[str] = []
+
+        for emp_id in employees:
+            self.add_employee(emp_id)
+
+    # ── structure ──
+
+    def add_employee(self, emp_id, fill: int = Shift.REST) -> array:
+        emp_id = str(emp_id)
+        if emp_id in self.index:
+            return self.rows[self.index[emp_id]]
+
+        row = array("B", bytes([fill]) * self.days)
+        self.index[emp_id] = len(self.employees)
+        self.employees.append(emp_id)
+        self.rows.append(row)
+        return row
+
+    def row(self, emp_id) -> array:
+        return self.rows[self.index[str(emp_id)]]
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def __contains__(self, emp_id) -> bool:
+        return str(emp_id) in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.employees)
+
+    def copy(self) -> "CompactSchedule":
+        other = CompactSchedule(self.days)
+        other.employees = list(self.employees)
+        other.index = dict(self.index)
+        other.rows = [array("B", row) for row in self.rows]
+        other.extra = list(self.extra)
+        return other
+
+    @property
+    def nbytes(self) -> int:
+        """ Bytes held by the cell arrays """
+
+        return sum(row.itemsize * len(row) for row in self.rows)
+
+    # ── codes ──
+
+    def encode(self, shift: str) -> int:
+        code = CODE_OF.get(shift)
+        if code is not None:
+            return code
+
+        try:
+            return EXTRA_BASE + self.extra.index(shift)
+        except ValueError:
+            pass
+
+        if EXTRA_BASE + len(self.extra) >= MISSING:
+            raise ValueError(f"Твърде много непознати кодове на смени: {shift}")
+        self.extra.append(shift)
+        return EXTRA_BASE + len(self.extra) - 1
+
+    def decode(self, code: int) -> Optional[str]:
+        if 0 <= code < len(SHIFT_CODES):
+            return SHIFT_CODES[code]
+        if code == MISSING:
+            return None
+        if EXTRA_BASE <= code < EXTRA_BASE + len(self.extra):
+            return self.extra[code - EXTRA_BASE]
+        raise ValueError(f"Непознат код на смяна: {code}")
+
+    def code_table(self) -> List[Optional[str]]:
+        """ decode() as a list indexed by code (all 256 codes) """
+
+        table: List[Optional[str]] = [None] * 256
+        for code, shift in enumerate(SHIFT_CODES):
+            table[code] = shift
+        for i, shift in enumerate(self.extra):
+            table[EXTRA_BASE + i] = shift
+        return table
+
+    def lat_tables(self) -> Tuple[List[Optional[str]], List[int], List[bool]]:
+        """
+            Per-code rules tables: the latin code (rules.to_lat), its
+            rules.SHIFT_INDEX and whether it is rest-like.
+        """
+
+        lat: List[Optional[str]] = [None] * 256
+        for code, shift in enumerate(self.code_table()):
+            if shift is not None:
+                lat[code] = to_lat(shift)
+        index = [SHIFT_INDEX.get(c, 0) if c else 0 for c in lat]
+        rest = [c is None or is_rest_like(c) for c in lat]
+        return lat, index, rest
+
+    # ── cells ──
+
+    def get(self, emp_id, day: int) -> Optional[str]:
+        return self.decode(self.row(emp_id)[int(day) - 1])
+
+    def set(self, emp_id, day: int, shift: str) -> None:
+        self.row(emp_id)[int(day) - 1] = self.encode(shift)
+
+    # ── JSON boundary ──
+
+    @classmethod
+    def from_json(cls, schedule: Mapping[str, Mapping], days: Optional[int] = None) -> "CompactSchedule":
+        """
+            Builds a compact schedule from {employee: {day: shift}}.
+            days defaults to the largest day present.
+        """
+
+        if days is None:
+            days = max(
+                (int(d) for cells in schedule.values() for d in cells),
+                default=0,
+            )
+
+        result = cls(days)
+        for emp_id, cells in schedule.items():
+            row = result.add_employee(emp_id, MISSING)
+            for day, shift in cells.items():
+                d = int(day)
+                if not 1 <= d <= days:
+                    raise ValueError(f"Денят {d} е извън месеца.")
+                row[d - 1] = result.encode(shift)
+        return result
+
+    def to_json(self) -> Dict[str, Dict[str, str]]:
+        """
+            Returns {employee: {"day": shift}} with string keys, days in
+            order and cells that were missing on input left out.
+        """
+
+        table = self.code_table()
+        day_keys = [str(d) for d in range(1, self.days + 1)]
+
+        result = {}
+        for emp_id, row in zip(self.employees, self.rows):
+            if MISSING in row:
+                result[emp_id] = {
+                    key: table[code] for key, code in zip(day_keys, row) if code != MISSING
+                }
+            else:
+                result[emp_id] = dict(zip(day_keys, [table[code] for code in row]))
+        return result
+
+
+def month_to_compact(data: Mapping, overrides: bool = True) -> CompactSchedule:
+    """
+        Builds the compact schedule of a stored month (read_month data),
+        with the overrides folded in unless overrides=False.
+    """
+
+    schedule = CompactSchedule.from_json(
+        data.get("schedule", {}) or {},
+        days_in_month(int(data["year"]), int(data["month"])),
+    )
+
+    if overrides:
+        for emp_id, cells in (data.get("overrides", {}) or {}).items():
+            if emp_id in schedule:
+                for day, shift in cells.items():
+                    schedule.set(emp_id, day, shift)
+
+    return schedule
@@ -14,6 +14,10 @@ def save_last_cycle_state(final_cycle_positions: dict, last_date):
                 "cycle_index": int(info["cycle_index"]),
                 "last_date": last_date.isoformat(),
             }
+            if info.get("balance"):
+                state[str(emp_id)]["balance"] = {
+                    k: int(v) for k, v in info["balance"].items()
+                }
         else:
             state[str(emp_id)] = {
                 "last_shift": info.get("last_shift"),
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Sequence
+
+from scheduler.logic.generator.matrix import CYCLE, REQUIRED_SHIFTS, SHIFT_CAPACITY, Column
+
+
+BALANCE_KEYS = ("shifts", "nights", "weekends", "holidays")
+
+Counters = Dict[str, int]
+
+
+def initial_balance(workers: Sequence[str], last_state: Dict[str, dict]) -> List[Counters]:
+    """
+        Returns the running counters of every worker, in worker order.
+        Counters come from the "balance" entry of the saved cycle state;
+        workers without one start at the lowest value of the others, so
+        a newcomer does not absorb every extra shift until caught up.
+    """
+
+    saved = [last_state.get(str(emp_id), {}).get("balance") for emp_id in workers]
+    known = [b for b in saved if b]
+
+    floor = {
+        key: min((int(b.get(key, 0)) for b in known), default=0)
+        for key in BALANCE_KEYS
+    }
+
+    return [
+        {key: int(b.get(key, 0)) for key in BALANCE_KEYS} if b else dict(floor)
+        for b in saved
+    ]
+
+
+def assign_balanced_column(
+    row: Sequence[int],
+    workers: Sequence[str],
+    counters: List[Counters],
+    weekend: bool,
+    holiday: bool,
+) -> Column:
+    """
+        Assigns one day like assign_column, but when a shift has more
+        eligible workers than capacity it takes the least loaded ones:
+        fewest holidays (on a holiday), weekends (on a weekend), nights
+        (for Н), then total shifts, then worker order. Updates counters.
+    """
+
+    candidates: Dict[str, List[int]] = {s: [] for s in REQUIRED_SHIFTS}
+    for i, idx in enumerate(row):
+        shift = CYCLE[idx]
+        if shift in candidates:
+            candidates[shift].append(i)
+
+    missing = [s for s in REQUIRED_SHIFTS if not candidates[s]]
+    if missing:
+        return [], missing
+
+    assignments = []
+    for s in REQUIRED_SHIFTS:
+        eligible = candidates[s]
+        capacity = SHIFT_CAPACITY[s]
+
+        if len(eligible) > capacity:
+            def load(i, s=s):
+                c = counters[i]
+                return (
+                    c["holidays"] if holiday else 0,
+                    c["weekends"] if weekend else 0,
+                    c["nights"] if s == "Н" else 0,
+                    c["shifts"],
+                    i,
+                )
+            eligible = sorted(heapq.nsmallest(capacity, eligible, key=load))
+
+        for i in eligible:
+            c = counters[i]
+            c["shifts"] += 1
+            if s == "Н":
+                c["nights"] += 1
+            if weekend:
+                c["weekends"] += 1
+            if holiday:
+                c["holidays"] += 1
+            assignments.append((workers[i], s))
+
+    return assignments, []
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from scheduler.logic.compact import CODE_OF, CompactSchedule, Shift
+from scheduler.logic.generator.generator import plan_month
+
+
+def build_compact_month(
+    year: int,
+    month: int,
+    workers: List[str],
+    admin_id: str,
+    last_state: Dict[str, dict],
+    holidays: set,
+    mode: str = "cycle",
+) -> dict:
+    """
+        build_month_schedule writing into a CompactSchedule.
+        Same plan, warnings and final cycle state; the schedule's
+        to_json() equals the dict build_month_schedule returns.
+    """
+
+    month_days, columns, final_cycle_state = plan_month(
+        year, month, workers, last_state, holidays, mode
+    )
+
+    schedule = CompactSchedule(month_days.days, list(workers) + [admin_id])
+    rows = schedule.rows
+    index = schedule.index
+    admin_row = rows[index[str(admin_id)]]
+
+    warnings = []
+
+    for day in range(1, month_days.days + 1):
+        if month_days.weekdays[day - 1] < 5 and day not in holidays:
+            admin_row[day - 1] = Shift.A
+
+        assignments, missing = columns[day - 1]
+
+        if missing:
+            warnings.append({
+                "day": day,
+                "missing": list(missing),
+            })
+            continue
+
+        for emp_id, shift in assignments:
+            rows[index[emp_id]][day - 1] = CODE_OF[shift]
+
+    return {
+        "schedule": schedule,
+        "warnings": warnings,
+        "final_cycle_state": final_cycle_state,
+    }
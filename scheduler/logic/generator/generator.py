@@ -1,127 +1,275 @@
 from __future__ import annotations
 
-import calendar
 from datetime import date
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from scheduler.logic.cycle_state import load_last_cycle_state, save_last_cycle_state
-from scheduler.api.utils.holidays import get_holidays_for_month
-from scheduler.logic.months_logic import load_month
+from scheduler.logic.calendar_service import (
+    MonthCalendar,
+    days_in_month,
+    get_holidays_for_month,
+    month_calendar,
+)
+from scheduler.logic.months_logic import load_month, iter_months, save_months
+from scheduler.logic.generator.matrix import (
+    CYCLE_LEN,
+    Column,
+    cycle_start_offsets,
+    cycle_matrix,
+    coverage_columns,
+)
+from scheduler.logic.generator.balance import assign_balanced_column, initial_balance
+from scheduler.logic.generator.leave_solver import (
+    DEFAULT_TIME_BUDGET,
+    complete_with_leaves,
+    leaves_from_overrides,
+)
 
 
-CYCLE = [
-    "Д", "Д", "Д", "Д",
-    "",
-    "Н", "Н", "Н", "Н",
-    "", "",
-    "В", "В", "В", "В",
-    ""
-]
-CYCLE_LEN = len(CYCLE)
+GENERATOR_MODES = ("cycle", "balanced")
 
-REQUIRED_SHIFTS = ("Д", "В", "Н")
 
-
-def generate_new_month(
+def plan_month(
     year: int,
     month: int,
-    employees: Dict[str, str],
-    strict: bool = True,
-) -> dict:
-    _, days_in_month = calendar.monthrange(year, month)
-    holidays = set(get_holidays_for_month(year, month))
+    workers: List[str],
+    last_state: Dict[str, dict],
+    holidays: set,
+    mode: str = "cycle",
+) -> Tuple[MonthCalendar, List[Column], Dict[str, dict]]:
+    """
+        Decides the coverage of every day of a month.
+        Returns the month calendar, the (assignments, missing) column of
+        every day and the final cycle state; build_month_schedule and
+        build_compact_month only write the columns out.
+    """
 
-    data = load_month(year, month)
-    admin_id = data.get("month_admin_id")
+    if mode not in GENERATOR_MODES:
+        raise ValueError(f"Непознат режим на генериране: {mode}")
 
-    if not admin_id:
-        raise RuntimeError("Няма зададен администратор за месеца.")
+    month_days = month_calendar(year, month)
 
-    if admin_id not in employees:
-        raise RuntimeError("Администраторът не е активен служител.")
+    offsets = cycle_start_offsets(workers, last_state)
+    matrix = cycle_matrix(offsets, month_days.days)
 
-    workers = [eid for eid in employees if eid != admin_id]
+    balanced = mode == "balanced"
+    if balanced:
+        counters = initial_balance(workers, last_state)
+        columns = [
+            assign_balanced_column(
+                matrix[day - 1], workers, counters,
+                month_days.weekdays[day - 1] >= 5, day in holidays,
+            )
+            for day in range(1, month_days.days + 1)
+        ]
+    else:
+        columns = coverage_columns(matrix, workers)
 
-    if len(workers) < 4:
-        raise RuntimeError("Нужни са минимум 4 ротационни служители.")
+    final_cycle_state = {
+        str(emp_id): {"cycle_index": (offset + month_days.days) % CYCLE_LEN}
+        for emp_id, offset in zip(workers, offsets)
+    }
+    if balanced:
+        for emp_id, balance in zip(workers, counters):
+            final_cycle_state[str(emp_id)]["balance"] = balance
 
-    last_state = load_last_cycle_state() or {}
+    return month_days, columns, final_cycle_state
+
+
+def build_month_schedule(
+    year: int,
+    month: int,
+    workers: List[str],
+    admin_id: str,
+    last_state: Dict[str, dict],
+    holidays: set,
+    mode: str = "cycle",
+) -> dict:
+    """
+        Builds the schedule of one month without touching the disk.
+        Derives every day at once from the cycle matrix and returns the
+        schedule, the coverage warnings and the final cycle state.
 
-    cycle_pos: Dict[str, int] = {}
-    for i, emp_id in enumerate(workers):
-        start = last_state.get(str(emp_id), {}).get("cycle_index")
-        if start is None:
-            start = i * 4
-        cycle_pos[str(emp_id)] = int(start) % CYCLE_LEN
+        mode="balanced" picks among the eligible workers of each day by
+        their running night / weekend / holiday counters instead of by
+        worker order; the counters are carried in the cycle state.
+    """
 
+    month_days, columns, final_cycle_state = plan_month(
+        year, month, workers, last_state, holidays, mode
+    )
+
+    day_keys = [str(day) for day in range(1, month_days.days + 1)]
     schedule = {
-        emp_id: {str(day): "" for day in range(1, days_in_month + 1)}
+        emp_id: dict.fromkeys(day_keys, "")
         for emp_id in workers + [admin_id]
     }
+    admin_days = schedule[admin_id]
 
     warnings = []
 
-    for day in range(1, days_in_month + 1):
-        weekday = calendar.weekday(year, month, day)
+    for day, day_key in enumerate(day_keys, start=1):
+        weekday = month_days.weekdays[day - 1]
 
         if weekday < 5 and day not in holidays:
-            schedule[admin_id][str(day)] = "А"
-
-        candidates = {s: [] for s in REQUIRED_SHIFTS}
+            admin_days[day_key] = "А"
 
-        for emp_id in workers:
-            shift = CYCLE[cycle_pos[str(emp_id)]]
-            if shift in candidates:
-                candidates[shift].append(emp_id)
-
-        missing = [s for s in REQUIRED_SHIFTS if not candidates[s]]
+        assignments, missing = columns[day - 1]
 
         if missing:
             warnings.append({
                 "day": day,
-                "missing": missing,
+                "missing": list(missing),
             })
-
-            for emp_id in workers:
-                cycle_pos[str(emp_id)] = (cycle_pos[str(emp_id)] + 1) % CYCLE_LEN
             continue
 
-        # assign shifts
-        for s in REQUIRED_SHIFTS:
-            allowed = 2 if s == "Д" else 1
-            for emp_id in candidates[s][:allowed]:
-                schedule[emp_id][str(day)] = s
-
-        # advance cycle after successful day
-        for emp_id in workers:
-            cycle_pos[str(emp_id)] = (cycle_pos[str(emp_id)] + 1) % CYCLE_LEN
+        for emp_id, shift in assignments:
+            schedule[emp_id][day_key] = shift
 
-    # SAVE FINAL CYCLE STATE
-    final_state = {
-        str(emp_id): {"cycle_index": cycle_pos[str(emp_id)]}
-        for emp_id in workers
+    return {
+        "schedule": schedule,
+        "warnings": warnings,
+        "final_cycle_state": final_cycle_state,
     }
 
-    save_last_cycle_state(
-        final_state,
-        date(year, month, days_in_month)
-    )
 
-    final_cycle_state = {}
+def _split_workers(admin_id, employees: Dict[str, str]) -> List[str]:
+    if not admin_id:
+        raise RuntimeError("Няма зададен администратор за месеца.")
+
+    if admin_id not in employees:
+        raise RuntimeError("Администраторът не е активен служител.")
+
+    workers = [eid for eid in employees if eid != admin_id]
+
+    if len(workers) < 4:
+        raise RuntimeError("Нужни са минимум 4 ротационни служители.")
+
+    return workers
 
-    for emp_id in workers:
-        final_cycle_state[str(emp_id)] = {
-            "cycle_index": cycle_pos[str(emp_id)]
-        }
 
+def _month_result(year: int, month: int, admin_id: str, built: dict) -> dict:
     return {
         "year": year,
         "month": month,
-        "schedule": schedule,
-        "overrides": {},
-        "warnings": warnings,
+        "schedule": built["schedule"],
+        "overrides": built.get("overrides", {}),
+        "warnings": built["warnings"],
         "generator_locked": False,
         "month_admin_id": admin_id,
-        "final_cycle_state": final_cycle_state,
+        "final_cycle_state": built["final_cycle_state"],
     }
 
+
+def generate_new_month(
+    year: int,
+    month: int,
+    employees: Dict[str, str],
+    strict: bool = True,
+    mode: str = "cycle",
+    leave_aware: bool = False,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> dict:
+    """
+        Generates one month from the saved cycle state.
+        With leave_aware=True the leave and sick-day overrides already
+        entered for the month (О, Б) are kept as hard constraints and the
+        coverage they break is refilled within time_budget seconds.
+    """
+
+    holidays = set(get_holidays_for_month(year, month))
+
+    data = load_month(year, month)
+    admin_id = data.get("month_admin_id")
+    workers = _split_workers(admin_id, employees)
+
+    last_state = load_last_cycle_state() or {}
+
+    built = build_month_schedule(
+        year, month, workers, admin_id, last_state, holidays, mode
+    )
+    if leave_aware:
+        built = complete_with_leaves(
+            built, year, month, admin_id,
+            leaves_from_overrides(data.get("overrides", {})),
+            time_budget,
+        )
+
+    # SAVE FINAL CYCLE STATE
+    save_last_cycle_state(
+        built["final_cycle_state"],
+        date(year, month, days_in_month(year, month))
+    )
+
+    return _month_result(year, month, admin_id, built)
+
+
+def generate_month_range(
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    employees: Dict[str, str],
+    mode: str = "cycle",
+    leave_aware: bool = False,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> List[dict]:
+    """
+        Generates every month from start to end inclusive in memory.
+        Chains the final cycle state of each month into the next one and
+        writes nothing; the caller persists the whole batch at the end.
+        time_budget applies to each month separately.
+    """
+
+    months = iter_months(start, end)
+    if not months:
+        raise RuntimeError("Невалиден период за генериране.")
+
+    state = load_last_cycle_state() or {}
+    generated = []
+
+    for year, month in months:
+        try:
+            data = load_month(year, month)
+        except FileNotFoundError:
+            raise RuntimeError(
+                f"Няма зададен администратор за {month:02d}.{year}."
+            )
+
+        if data.get("ui_locked"):
+            raise RuntimeError(f"Месецът {month:02d}.{year} е заключен.")
+
+        admin_id = data.get("month_admin_id")
+        workers = _split_workers(admin_id, employees)
+        holidays = set(get_holidays_for_month(year, month))
+
+        built = build_month_schedule(
+            year, month, workers, admin_id, state, holidays, mode
+        )
+        if leave_aware:
+            built = complete_with_leaves(
+                built, year, month, admin_id,
+                leaves_from_overrides(data.get("overrides", {})),
+                time_budget,
+            )
+        state = built["final_cycle_state"]
+
+        generated.append(_month_result(year, month, admin_id, built))
+
+    return generated
+
+
+def save_generated_months(generated: List[dict]) -> None:
+    """
+        Persists a batch from generate_month_range in one pass.
+        Writes every month file and then the final cycle state once.
+    """
+
+    for month_data in generated:
+        month_data["ui_locked"] = False
+
+    save_months([(m["year"], m["month"], m) for m in generated])
+
+    last = generated[-1]
+    save_last_cycle_state(
+        last["final_cycle_state"],
+        date(last["year"], last["month"], days_in_month(last["year"], last["month"]))
+    )
@@ -0,0 +1,344 @@
+"""
+    Leave-aware completion of a generated month.
+
+    Approved leave is written over the rotation as a hard constraint and
+    the coverage holes it opens (plus any the rotation already had) are
+    filled by a bounded backtracking search:
+        - a hole is one missing shift on one day (Д when the day line has
+          neither Д nor А, В and Н when absent)
+        - a worker may fill it when the cell is free and
+          rules.is_shift_allowed accepts it against the neighbouring
+          working days, the same check the rule-aware repair uses
+        - forward checking recomputes the candidates of every open hole
+          after each step; the hole with the fewest candidates goes next
+          and holes left without candidates are counted as unfilled
+        - the search keeps the assignment with the fewest unfilled holes
+          and stops when it finds a complete one or its share of the
+          time budget ends
+
+    The rotation itself does not satisfy is_shift_allowed everywhere
+    (validate_month reports those as soft errors), so holes no worker
+    can take within the rules are filled in a second, relaxed pass that
+    prefers the candidates that break no rule. Only holes without any
+    free worker stay open.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from scheduler.logic.calendar_service import days_in_month
+from scheduler.logic.rules import get_preferred_next_shift, is_rest_like, is_shift_allowed, to_lat
+
+
+DEFAULT_TIME_BUDGET = 5.0
+STRICT_SHARE = 0.5
+
+# leave_override.LEAVE_CODES are latin, the month files use cyrillic
+LEAVE_SHIFTS = {"O": "О", "B": "Б", "О": "О", "Б": "Б"}
+
+DAY_LINE = {"Д", "А"}
+WORK_SHIFTS = {"Д", "В", "Н"}
+
+Hole = Tuple[int, str]
+Assignment = Tuple[str, int, str]
+
+
+def normalize_leaves(leaves: Dict[str, Dict], days: int) -> Dict[str, Dict[int, str]]:
+    """
+        Validates {employee_id: {day: code}} and returns it with int days
+        and cyrillic codes (О, Б). Latin O / B are accepted as well.
+    """
+
+    result: Dict[str, Dict[int, str]] = {}
+    for emp_id, cells in leaves.items():
+        for day, code in cells.items():
+            if code not in LEAVE_SHIFTS:
+                raise ValueError(f"Невалиден код за отпуск/болничен: {code}")
+            d = int(day)
+            if not 1 <= d <= days:
+                raise ValueError(f"Денят {d} е извън месеца.")
+            result.setdefault(str(emp_id), {})[d] = LEAVE_SHIFTS[code]
+    return result
+
+
+def expand_leave_intervals(
+    year: int,
+    month: int,
+    intervals: Iterable[Tuple[str, date, date, str]],
+) -> Dict[str, Dict[int, str]]:
+    """
+        Turns (employee_id, first date, last date, code) leave intervals
+        into the month's {employee_id: {day: code}}, clipped to the month.
+    """
+
+    days = days_in_month(year, month)
+    first, last = date(year, month, 1), date(year, month, days)
+
+    leaves: Dict[str, Dict[int, str]] = {}
+    for emp_id, start, end, code in intervals:
+        start, end = max(start, first), min(end, last)
+        for d in range(start.day, end.day + 1) if start <= end else ():
+            leaves.setdefault(str(emp_id), {})[d] = code
+    return normalize_leaves(leaves, days)
+
+
+def leaves_from_overrides(overrides: Dict[str, Dict]) -> Dict[str, Dict[int, str]]:
+    """
+        Picks the leave and sick-day cells (О, Б) out of month overrides.
+    """
+
+    return {
+        str(emp_id): {int(d): s for d, s in cells.items() if s in ("О", "Б")}
+        for emp_id, cells in overrides.items()
+        if any(s in ("О", "Б") for s in cells.values())
+    }
+
+
+class _LeaveSearch:
+    """
+        Search state over one schedule: free workers per day, working
+        days and load per worker. assign()/unassign() keep it current.
+    """
+
+    def __init__(self, schedule: Dict[str, Dict[str, str]], workers: List[str], days: int, crisis_mode: bool):
+        self.schedule = schedule
+        self.workers = workers
+        self.order = {w: i for i, w in enumerate(workers)}
+        self.crisis_mode = crisis_mode
+
+        self.free: Dict[int, set] = {d: set() for d in range(1, days + 1)}
+        self.work: Dict[str, List[int]] = {}
+        self.load: Dict[str, int] = {}
+
+        for w in workers:
+            cells = schedule[w]
+            self.work[w] = sorted(
+                int(d) for d, s in cells.items() if not is_rest_like(to_lat(s))
+            )
+            self.load[w] = sum(1 for s in cells.values() if s in WORK_SHIFTS)
+            for d in range(1, days + 1):
+                if cells.get(str(d), "") == "":
+                    self.free[d].add(w)
+
+        self.stack: List[Assignment] = []
+        self.nodes = 0
+        self.relaxed = False
+
+    def _lat(self, w: str, day: int):
+        return to_lat(self.schedule[w].get(str(day)))
+
+    def allowed(self, w: str, day: int, shift: str) -> bool:
+        new_lat = to_lat(shift)
+        work = self.work[w]
+        idx = bisect_left(work, day)
+        prev_day = work[idx - 1] if idx else None
+        next_day = work[idx] if idx < len(work) else None
+
+        if prev_day is None:
+            prev_lat, days_since = None, 999
+        else:
+            prev_lat, days_since = self._lat(w, prev_day), day - prev_day
+
+        if not is_shift_allowed(prev_lat, days_since, new_lat, self.crisis_mode):
+            return False
+
+        if next_day is not None:
+            next_lat = self._lat(w, next_day)
+            was_allowed = is_shift_allowed(
+                prev_lat, 999 if prev_day is None else next_day - prev_day, next_lat, self.crisis_mode
+            )
+            if was_allowed and not is_shift_allowed(new_lat, next_day - day, next_lat, self.crisis_mode):
+                return False
+
+        return True
+
+    def candidates(self, hole: Hole) -> List[str]:
+        day, shift = hole
+        if self.relaxed:
+            ranked = [(not self.allowed(w, day, shift), w) for w in self.free[day]]
+            ranked.sort(key=lambda item: (item[0], self._cost(item[1], day, shift), self.order[item[1]]))
+            return [w for _, w in ranked]
+
+        found = [w for w in self.free[day] if self.allowed(w, day, shift)]
+        found.sort(key=lambda w: (self._cost(w, day, shift), self.order[w]))
+        return found
+
+    def _cost(self, w: str, day: int, shift: str) -> Tuple[int, int]:
+        idx = bisect_left(self.work[w], day)
+        prev_lat = self._lat(w, self.work[w][idx - 1]) if idx else None
+        return self.load[w], get_preferred_next_shift(prev_lat) != to_lat(shift)
+
+    def assign(self, w: str, day: int, shift: str) -> None:
+        self.schedule[w][str(day)] = shift
+        self.free[day].discard(w)
+        insort(self.work[w], day)
+        self.load[w] += 1
+        self.stack.append((w, day, shift))
+
+    def unassign(self) -> None:
+        w, day, _ = self.stack.pop()
+        self.schedule[w][str(day)] = ""
+        self.free[day].add(w)
+        self.work[w].remove(day)
+        self.load[w] -= 1
+
+
+def coverage_holes(schedule: Dict[str, Dict[str, str]], days: int) -> List[Hole]:
+    """
+        Returns the (day, shift) pairs the month is missing, as
+        validate_month counts coverage.
+    """
+
+    holes = []
+    for d in range(1, days + 1):
+        key = str(d)
+        present = {cells.get(key, "") for cells in schedule.values()}
+        if not present & DAY_LINE:
+            holes.append((d, "Д"))
+        for shift in ("В", "Н"):
+            if shift not in present:
+                holes.append((d, shift))
+    return holes
+
+
+def _search(search: _LeaveSearch, holes: List[Hole], deadline: float) -> dict:
+    """
+        Depth-first search over the holes with forward checking and
+        branch and bound on the number of unfilled holes.
+    """
+
+    best = {"assignments": list(search.stack), "unfilled": list(holes), "timed_out": False}
+
+    def dfs(remaining: List[Hole], unfilled: List[Hole]) -> bool:
+        search.nodes += 1
+        if time.monotonic() > deadline:
+            best["timed_out"] = True
+            return True
+
+        # forward checking: current candidates of every open hole
+        domains = []
+        dead = list(unfilled)
+        for hole in remaining:
+            options = search.candidates(hole)
+            if options:
+                domains.append((len(options), hole, options))
+            else:
+                dead.append(hole)
+
+        if len(dead) >= len(best["unfilled"]):
+            return False
+
+        if not domains:
+            best["assignments"] = list(search.stack)
+            best["unfilled"] = dead
+            return not dead
+
+        _, hole, options = min(domains, key=lambda item: (item[0], item[1]))
+        rest = [h for _, h, _ in domains if h != hole]
+
+        for w in options:
+            search.assign(w, hole[0], hole[1])
+            done = dfs(rest, dead)
+            search.unassign()
+            if done:
+                return True
+
+        # the hole may also stay open if that lets the others fill
+        return dfs(rest, dead + [hole])
+
+    if holes:
+        dfs(holes, [])
+    return best
+
+
+def solve_leave_holes(
+    schedule: Dict[str, Dict[str, str]],
+    workers: List[str],
+    days: int,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    crisis_mode: bool = False,
+) -> dict:
+    """
+        Fills the coverage holes of schedule in place with the best
+        assignment found within time_budget seconds.
+        Returns the assignments, the unfilled holes and search stats.
+    """
+
+    started = time.monotonic()
+    search = _LeaveSearch(schedule, workers, days, crisis_mode)
+    holes = coverage_holes(schedule, days)
+
+    strict = _search(search, holes, started + time_budget * STRICT_SHARE)
+    for w, day, shift in strict["assignments"]:
+        search.assign(w, day, shift)
+
+    assignments = list(strict["assignments"])
+    unfilled = strict["unfilled"]
+    timed_out = strict["timed_out"]
+
+    if unfilled:
+        search.relaxed = True
+        relaxed = _search(search, unfilled, started + time_budget)
+        assignments = relaxed["assignments"]
+        unfilled = relaxed["unfilled"]
+        timed_out = timed_out or relaxed["timed_out"]
+        for w, day, shift in assignments[len(strict["assignments"]):]:
+            schedule[w][str(day)] = shift
+
+    return {
+        "assignments": assignments,
+        "unfilled": sorted(unfilled),
+        "complete": not unfilled,
+        "timed_out": timed_out,
+        "nodes": search.nodes,
+    }
+
+
+def complete_with_leaves(
+    built: dict,
+    year: int,
+    month: int,
+    admin_id: str,
+    leaves: Dict[str, Dict],
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    crisis_mode: bool = False,
+) -> dict:
+    """
+        Applies leaves to a build_month_schedule result and fills the
+        coverage they break. Returns the result with the new schedule,
+        warnings for holes left open, the leave cells as overrides and
+        the search stats under "solver".
+    """
+
+    days = days_in_month(year, month)
+    leaves = normalize_leaves(leaves, days)
+    schedule = built["schedule"]
+
+    for emp_id, cells in leaves.items():
+        if emp_id not in schedule:
+            continue
+        for d, code in cells.items():
+            schedule[emp_id][str(d)] = code
+
+    workers = [w for w in schedule if w != str(admin_id)]
+    solved = solve_leave_holes(schedule, workers, days, time_budget, crisis_mode)
+
+    missing: Dict[int, List[str]] = {}
+    for day, shift in solved["unfilled"]:
+        missing.setdefault(day, []).append(shift)
+
+    return {
+        **built,
+        "schedule": schedule,
+        "warnings": [{"day": d, "missing": s} for d, s in sorted(missing.items())],
+        "overrides": {
+            emp_id: {str(d): code for d, code in cells.items()}
+            for emp_id, cells in leaves.items()
+            if emp_id in schedule
+        },
+        "solver": {k: solved[k] for k in ("complete", "timed_out", "nodes")},
+    }
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+
+CYCLE = [
+    "Д", "Д", "Д", "Д",
+    "",
+    "Н", "Н", "Н", "Н",
+    "", "",
+    "В", "В", "В", "В",
+    ""
+]
+CYCLE_LEN = len(CYCLE)
+
+REQUIRED_SHIFTS = ("Д", "В", "Н")
+SHIFT_CAPACITY = {"Д": 2, "В": 1, "Н": 1}
+
+Column = Tuple[List[Tuple[str, str]], List[str]]
+
+
+def cycle_start_offsets(workers: Sequence[str], last_state: Dict[str, dict]) -> List[int]:
+    """
+        Returns the cycle index every worker starts the month with.
+        Uses the saved cycle state when available, otherwise spreads
+        the workers evenly across the cycle (4 slots apart).
+    """
+
+    offsets = []
+    for i, emp_id in enumerate(workers):
+        start = last_state.get(str(emp_id), {}).get("cycle_index")
+        if start is None:
+            start = i * 4
+        offsets.append(int(start) % CYCLE_LEN)
+
+    return offsets
+
+
+def cycle_matrix(offsets: Sequence[int], days: int) -> List[Tuple[int, ...]]:
+    """
+        Builds the day × employee matrix of cycle indices.
+        The index of a worker on day d is (offset + d) mod CYCLE_LEN, so
+        the rows repeat every CYCLE_LEN days and are shared, not rebuilt.
+    """
+
+    rows = [
+        tuple((o + phase) % CYCLE_LEN for o in offsets)
+        for phase in range(min(days, CYCLE_LEN))
+    ]
+    return [rows[d % CYCLE_LEN] for d in range(days)]
+
+
+def assign_column(row: Sequence[int], workers: Sequence[str]) -> Column:
+    """
+        Assigns the coverage for one day column of the matrix.
+        Returns the (employee, shift) assignments in worker order and the
+        required shifts that have no candidate at all. Stops scanning as
+        soon as every shift is at capacity.
+    """
+
+    candidates: Dict[str, List[str]] = {s: [] for s in REQUIRED_SHIFTS}
+    open_slots = sum(SHIFT_CAPACITY.values())
+
+    for emp_id, idx in zip(workers, row):
+        shift = CYCLE[idx]
+        if shift in candidates and len(candidates[shift]) < SHIFT_CAPACITY[shift]:
+            candidates[shift].append(emp_id)
+            open_slots -= 1
+            if not open_slots:
+                break
+
+    missing = [s for s in REQUIRED_SHIFTS if not candidates[s]]
+    if missing:
+        return [], missing
+
+    assignments = [
+        (emp_id, s)
+        for s in REQUIRED_SHIFTS
+        for emp_id in candidates[s]
+    ]
+    return assignments, []
+
+
+def coverage_columns(matrix: List[Tuple[int, ...]], workers: Sequence[str]) -> List[Column]:
+    """
+        Resolves the coverage of every day in the matrix.
+        The matrix rows repeat every CYCLE_LEN days, so only the first
+        CYCLE_LEN columns are assigned and the rest reuse them.
+    """
+
+    phases = [assign_column(row, workers) for row in matrix[:CYCLE_LEN]]
+    return [phases[d % CYCLE_LEN] for d in range(len(matrix))]
@@ -1,10 +1,49 @@
+from dataclasses import dataclass
 from datetime import datetime
+import hashlib
 import json
+import logging
+import os
+import threading
+import zipfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import portalocker
 
 
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
+BACKUP_ARCHIVE_DIR = "backups"
+BACKUP_LOCK_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BackupPolicy:
+    """
+        Retention rules for the .bak-<timestamp> files next to a JSON file.
+        A backup is kept if any of the keep_* rules selects it; max_bytes
+        then caps the total size of the kept backups (newest win).
+        Expired backups are moved into a zip archive when archive=True.
+    """
+    keep_last: int = 5
+    keep_daily: int = 7
+    keep_monthly: int = 12
+    max_bytes: Optional[int] = 50 * 1024 * 1024
+    archive: bool = True
+
+
+BACKUP_POLICY = BackupPolicy()
+
+_compaction_lock = threading.Lock()
+_compaction_pending: set = set()
+
+
+def set_backup_policy(policy: BackupPolicy) -> None:
+    global BACKUP_POLICY
+    BACKUP_POLICY = policy
+
+
 def _load_json(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"JSON файлът не съществува: {path}")
@@ -13,29 +52,221 @@ def _load_json(path: Path) -> Dict[str, Any]:
         return json.load(f)
 
 
+def _content_hash(data: Any) -> str:
+    """
+        Returns a stable SHA-256 of the JSON content (key order independent).
+    """
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def _save_json_with_lock(path: Path, data: Dict[str, Any]) -> None:
+    _commit_staged_json(path, _stage_json(path, data))
+
+
+def _staged_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".tmp")
+
+
+def _stage_json(path: Path, data: Dict[str, Any]) -> Path:
+    """
+        Writes data next to path as <name>.tmp (fsynced) and returns the
+        temp path; path itself is not touched yet.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path = _staged_path(path)
 
     with tmp_path.open("w", encoding="utf-8") as f:
         portalocker.lock(f, portalocker.LOCK_EX)
         json.dump(data, f, ensure_ascii=False, indent=2)
         f.flush()
         try:
-            import os
             os.fsync(f.fileno())
         except OSError:
             pass
         portalocker.unlock(f)
 
+    return tmp_path
+
+
+def _commit_staged_json(path: Path, tmp_path: Path) -> None:
+    """
+        Moves the current file to a .bak-<timestamp> backup and renames
+        the staged temp file into place.
+    """
     if path.exists():
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        timestamp = datetime.now().strftime(BACKUP_TIMESTAMP_FORMAT)
         backup_path = path.with_suffix(path.suffix + f".bak-{timestamp}")
         path.replace(backup_path)
+        _schedule_backup_compaction(path)
 
     tmp_path.replace(path)
 
 
+def _list_backups(path: Path) -> List[Tuple[datetime, Path]]:
+    """
+        Returns the backups of path as (timestamp, path), newest first.
+    """
+    prefix = path.name + ".bak-"
+    result = []
+
+    for p in path.parent.glob(prefix + "*"):
+        try:
+            stamp = datetime.strptime(p.name[len(prefix):], BACKUP_TIMESTAMP_FORMAT)
+        except ValueError:
+            continue
+        result.append((stamp, p))
+
+    result.sort(key=lambda x: x[0], reverse=True)
+    return result
+
+
+def _select_backups_to_keep(backups: List[Tuple[datetime, Path]], policy: BackupPolicy) -> set:
+    keep = set()
+    days = set()
+    months = set()
+
+    for i, (stamp, p) in enumerate(backups):
+        day = stamp.date()
+        month = (stamp.year, stamp.month)
+
+        if i < policy.keep_last:
+            keep.add(p)
+
+        if day not in days and len(days) < policy.keep_daily:
+            days.add(day)
+            keep.add(p)
+
+        if month not in months and len(months) < policy.keep_monthly:
+            months.add(month)
+            keep.add(p)
+
+    if policy.max_bytes is not None:
+        total = 0
+        for i, (_, p) in enumerate(b for b in backups if b[1] in keep):
+            total += p.stat().st_size
+            if i > 0 and total > policy.max_bytes:
+                keep.discard(p)
+
+    return keep
+
+
+def compact_backups(path: Path, policy: Optional[BackupPolicy] = None) -> int:
+    """
+        Applies the retention policy to the backups of path.
+        Expired backups are added to backups/<name>.bak.zip (if enabled)
+        and deleted. Returns the number of removed backup files.
+
+        The archive is rebuilt in a temp file and replaced atomically while
+        holding its .lock file, so another process compacting the same
+        backups, or an exit in the middle, never leaves a broken archive.
+    """
+    policy = policy or BACKUP_POLICY
+
+    if not policy.archive:
+        return _remove_backups(_expired_backups(path, policy))
+
+    archive_dir = path.parent / BACKUP_ARCHIVE_DIR
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = archive_dir / f"{path.name}.bak.zip"
+    lock_path = archive_path.with_name(archive_path.name + ".lock")
+
+    with portalocker.Lock(lock_path, "a", timeout=BACKUP_LOCK_TIMEOUT):
+        expired = _expired_backups(path, policy)
+        if expired:
+            _write_archive(archive_path, expired)
+        return _remove_backups(expired)
+
+
+def _expired_backups(path: Path, policy: BackupPolicy) -> List[Path]:
+    backups = _list_backups(path)
+    keep = _select_backups_to_keep(backups, policy)
+    return [p for _, p in backups if p not in keep]
+
+
+def _remove_backups(paths: List[Path]) -> int:
+    for p in paths:
+        p.unlink(missing_ok=True)
+    return len(paths)
+
+
+def _open_archive(archive_path: Path) -> Optional[zipfile.ZipFile]:
+    """
+        Opens the archive for reading; None if there is none yet. An
+        unreadable archive is kept aside as <name>.corrupt-<timestamp>
+        so a new one can be started.
+    """
+    if not archive_path.exists():
+        return None
+
+    try:
+        return zipfile.ZipFile(archive_path)
+    except zipfile.BadZipFile:
+        timestamp = datetime.now().strftime(BACKUP_TIMESTAMP_FORMAT)
+        corrupt_path = archive_path.with_name(f"{archive_path.name}.corrupt-{timestamp}")
+        logger.warning("Backup archive %s is corrupt, moved to %s", archive_path, corrupt_path)
+        archive_path.replace(corrupt_path)
+        return None
+
+
+def _write_archive(archive_path: Path, files: List[Path]) -> None:
+    """
+        Writes the current archive entries plus files to a temp zip and
+        replaces the archive with it.
+    """
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    current = _open_archive(archive_path)
+
+    try:
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as out:
+            names = set()
+            if current is not None:
+                for info in current.infolist():
+                    out.writestr(info, current.read(info))
+                    names.add(info.filename)
+
+            for p in files:
+                if p.name not in names:
+                    out.write(p, arcname=p.name)
+
+        with tmp_path.open("rb") as f:
+            try:
+                os.fsync(f.fileno())
+            except OSError:
+                pass
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if current is not None:
+            current.close()
+
+    os.replace(tmp_path, archive_path)
+
+
+def _schedule_backup_compaction(path: Path) -> None:
+    """
+        Runs compact_backups for path in a daemon thread.
+        Repeated saves of the same file share one pending run.
+    """
+    with _compaction_lock:
+        if path in _compaction_pending:
+            return
+        _compaction_pending.add(path)
+
+    threading.Thread(target=_run_backup_compaction, args=(path,), daemon=True).start()
+
+
+def _run_backup_compaction(path: Path) -> None:
+    try:
+        compact_backups(path)
+    except Exception:
+        logger.exception("Backup compaction failed for %s", path)
+    finally:
+        with _compaction_lock:
+            _compaction_pending.discard(path)
+
+
 # -------- paths --------
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 
@@ -0,0 +1,152 @@
+"""
+    In-process LRU cache of loaded months.
+
+    An entry is valid while the storage signature of the month is
+    unchanged ((mtime_ns, size) of the month file and of its override
+    journal, or the row version in SQLite), so writes made by other
+    processes are picked up on the next read. Callers always get their
+    own copy.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from scheduler.logic import months_logic
+
+
+MonthKey = Tuple[int, int]
+Signature = Optional[Hashable]
+
+
+def month_signature(year: int, month: int) -> Signature:
+    """
+        Returns the change signature of a month from the storage backend,
+        None for a missing month.
+    """
+
+    return months_logic.get_storage().signature(year, month)
+
+
+def copy_json(value: Any) -> Any:
+    """
+        Copies JSON-shaped data (dicts, lists, scalars).
+        Much cheaper than deepcopy, which tracks shared references.
+    """
+
+    if isinstance(value, dict):
+        return {k: copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_json(v) for v in value]
+    return value
+
+
+def adjacent_months(year: int, month: int) -> Tuple[MonthKey, MonthKey]:
+    prev = (year - 1, 12) if month == 1 else (year, month - 1)
+    nxt = (year + 1, 1) if month == 12 else (year, month + 1)
+    return prev, nxt
+
+
+class MonthCache:
+    """
+        LRU cache in front of a month loader (months_logic.load_month).
+            - get() validates the entry against the file signature
+            - invalidate() drops an entry after a local write
+            - prefetch_adjacent() warms the previous and next month on a
+              background thread
+    """
+
+    def __init__(self, loader: Optional[Callable[[int, int], Dict[str, Any]]] = None, maxsize: int = 12):
+        self.loader = loader or (lambda year, month: months_logic.load_month(year, month))
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[MonthKey, Tuple[Signature, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._prefetching: set = set()
+        self._generations: Dict[MonthKey, int] = {}
+
+    def _load(self, year: int, month: int) -> Optional[Dict[str, Any]]:
+        """
+            Returns the cached month, reloading it when the files changed.
+            The returned dict is shared; get() copies it.
+        """
+
+        key = (year, month)
+        signature = month_signature(year, month)
+
+        if signature is None:
+            self.invalidate(year, month)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generations.get(key, 0)
+
+        # the signature is taken before reading, so a write racing with
+        # the read only makes the next get() reload again; an invalidate()
+        # during the read keeps the result out of the cache
+        data = self.loader(year, month)
+
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return data
+            self._entries[key] = (signature, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return data
+
+    def get(self, year: int, month: int) -> Dict[str, Any]:
+        data = self._load(year, month)
+        if data is None:
+            raise FileNotFoundError(f"Месецът {year:04d}-{month:02d} не съществува.")
+        return copy_json(data)
+
+    def invalidate(self, year: int, month: int) -> None:
+        key = (year, month)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: MonthKey) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def prefetch(self, year: int, month: int) -> Optional[threading.Thread]:
+        """
+            Loads a month into the cache on a daemon thread.
+            Returns the thread, or None when a prefetch is already running.
+        """
+
+        key = (year, month)
+        with self._lock:
+            if key in self._prefetching:
+                return None
+            self._prefetching.add(key)
+
+        def run():
+            try:
+                self._load(year, month)
+            except Exception:
+                # a prefetch is only a hint; the real read reports errors
+                pass
+            finally:
+                with self._lock:
+                    self._prefetching.discard(key)
+
+        thread = threading.Thread(target=run, name=f"month-prefetch-{year}-{month:02d}", daemon=True)
+        thread.start()
+        return thread
+
+    def prefetch_adjacent(self, year: int, month: int) -> list:
+        threads = [self.prefetch(y, m) for y, m in adjacent_months(year, month)]
+        return [t for t in threads if t is not None]
@@ -0,0 +1,213 @@
+"""
+    Manifest of the stored months: one small JSON file in the data
+    directory with an entry per month file (year, month, lock flags,
+    administrator, content hash, mtime and size).
+
+    save_month keeps it current, so listing months or finding the latest
+    one reads a single file instead of scanning the directory (where the
+    .bak-* backups pile up). A missing or unreadable manifest is rebuilt
+    from a scan. The manifest is replaced atomically and never backed up.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import portalocker
+
+from scheduler.logic.json_help_functions import _content_hash
+
+
+MANIFEST_NAME = "months.manifest.json"
+MANIFEST_VERSION = 1
+MONTH_FILE_PATTERN = re.compile(r"^(\d{4})-(\d{2})\.json$")
+
+Entry = Dict[str, Any]
+
+_lock = threading.Lock()
+
+
+def manifest_path(data_dir) -> Path:
+    return Path(data_dir) / MANIFEST_NAME
+
+
+def _lock_path(data_dir) -> Path:
+    return Path(data_dir) / (MANIFEST_NAME + ".lock")
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def month_entry(year: int, month: int, data: Optional[Dict[str, Any]], path: Path) -> Entry:
+    """
+        Manifest entry of a month file. data is None for a file that
+        could not be parsed; it is still listed, like the scans did.
+    """
+
+    try:
+        st = path.stat()
+        mtime_ns, size = st.st_mtime_ns, st.st_size
+    except FileNotFoundError:
+        mtime_ns, size = None, None
+
+    data = data or {}
+    admin_id = data.get("month_admin_id")
+
+    return {
+        "year": year,
+        "month": month,
+        "ui_locked": bool(data.get("ui_locked", False)),
+        "generator_locked": bool(data.get("generator_locked", False)),
+        "month_admin_id": str(admin_id) if admin_id else None,
+        "hash": _content_hash(data) if data else None,
+        "mtime_ns": mtime_ns,
+        "size": size,
+    }
+
+
+def scan_months(data_dir) -> Dict[str, Entry]:
+    """
+        Builds the entries from the month files in data_dir.
+    """
+
+    data_dir = Path(data_dir)
+    entries: Dict[str, Entry] = {}
+
+    if not data_dir.is_dir():
+        return entries
+
+    for name in os.listdir(data_dir):
+        m = MONTH_FILE_PATTERN.match(name)
+        if not m:
+            continue
+
+        path = data_dir / name
+        if not path.is_file():
+            continue
+
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        year, month = int(m.group(1)), int(m.group(2))
+        entries[month_key(year, month)] = month_entry(year, month, data, path)
+
+    return entries
+
+
+def _write(data_dir, entries: Dict[str, Entry]) -> None:
+    path = manifest_path(data_dir)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+    payload = {
+        "version": MANIFEST_VERSION,
+        "months": dict(sorted(entries.items())),
+    }
+
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+
+    tmp_path.replace(path)
+
+
+def _read(data_dir) -> Optional[Dict[str, Entry]]:
+    try:
+        with manifest_path(data_dir).open("r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+        return None
+    return payload.get("months") or {}
+
+
+def rebuild_manifest(data_dir) -> Dict[str, Entry]:
+    """
+        Rescans data_dir and rewrites the manifest.
+        Returns the entries; writes nothing when the directory is missing.
+    """
+
+    entries = scan_months(data_dir)
+    if Path(data_dir).is_dir():
+        with _lock, portalocker.Lock(_lock_path(data_dir), "a", timeout=10):
+            _write(data_dir, entries)
+    return entries
+
+
+def load_manifest(data_dir) -> Dict[str, Entry]:
+    """
+        Returns {"YYYY-MM": entry}, rebuilding the manifest when it is
+        missing or unreadable.
+    """
+
+    entries = _read(data_dir)
+    if entries is None:
+        entries = rebuild_manifest(data_dir)
+    return entries
+
+
+def _update(data_dir, key: str, entry: Optional[Entry]) -> None:
+    with _lock, portalocker.Lock(_lock_path(data_dir), "a", timeout=10):
+        entries = _read(data_dir)
+        if entries is None:
+            entries = scan_months(data_dir)
+
+        if entry is None:
+            entries.pop(key, None)
+        else:
+            entries[key] = entry
+
+        _write(data_dir, entries)
+
+
+def record_month(data_dir, year: int, month: int, data: Dict[str, Any], path: Path) -> None:
+    """
+        Stores the entry of a month that was just written to path.
+    """
+
+    _update(data_dir, month_key(year, month), month_entry(year, month, data, path))
+
+
+def forget_month(data_dir, year: int, month: int) -> None:
+    _update(data_dir, month_key(year, month), None)
+
+
+def invalidate_manifest(data_dir) -> None:
+    """
+        Drops the manifest so the next read rebuilds it.
+    """
+
+    manifest_path(data_dir).unlink(missing_ok=True)
+
+
+def get_entry(data_dir, year: int, month: int) -> Optional[Entry]:
+    return load_manifest(data_dir).get(month_key(year, month))
+
+
+def list_months(data_dir) -> List[Tuple[int, int]]:
+    return sorted((e["year"], e["month"]) for e in load_manifest(data_dir).values())
+
+
+def list_years(data_dir) -> List[int]:
+    return sorted({e["year"] for e in load_manifest(data_dir).values()})
+
+
+def latest_month(data_dir) -> Optional[Entry]:
+    entries = load_manifest(data_dir)
+    if not entries:
+        return None
+    return entries[max(entries)]
@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+OverrideRecord = Tuple[str, str, str]
+
+VERSIONED_READ_ATTEMPTS = 5
+
+
+class MonthConflictError(RuntimeError):
+    """
+        The month changed between the read and the write that was based on it.
+    """
+
+
+class MonthLockedError(RuntimeError):
+    """
+        The month is locked (ui_locked) and the write asked not to touch it.
+    """
+
+
+class MonthStorage(ABC):
+    """
+        Where the months live. months_logic talks only to this interface.
+            - read() returns the stored month with the overrides folded in
+              and raises FileNotFoundError for a missing month
+            - read_versioned() also returns the signature the data belongs to
+            - write() replaces the whole month; with expected_version it
+              raises MonthConflictError when the month changed since that
+              version was read (checked under the write lock)
+            - write_many() writes several months so that a failure while
+              writing leaves all of them as they were
+            - append_overrides() records (employee_id, day, shift) edits
+              without rewriting the month; returns the month data when the
+              backend had to write the whole month, None otherwise. With
+              reject_locked it raises MonthLockedError for a ui_locked month
+              (checked under the append lock)
+            - signature() changes whenever the month changes (None when
+              it does not exist); month_cache validates entries with it
+    """
+
+    name = ""
+
+    @abstractmethod
+    def read(self, year: int, month: int) -> Dict[str, Any]:
+        ...
+
+    def read_versioned(self, year: int, month: int) -> Tuple[Dict[str, Any], Hashable]:
+        """
+            Reads until the signature is the same before and after the read.
+        """
+        for _ in range(VERSIONED_READ_ATTEMPTS):
+            before = self.signature(year, month)
+            data = self.read(year, month)
+            if before is not None and self.signature(year, month) == before:
+                return data, before
+        raise MonthConflictError(f"Месецът {year:04d}-{month:02d} се променя в момента.")
+
+    @abstractmethod
+    def write(
+        self, year: int, month: int, data: Dict[str, Any], expected_version: Optional[Hashable] = None
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def write_many(self, batch: Iterable[Tuple[int, int, Dict[str, Any]]]) -> None:
+        ...
+
+    @abstractmethod
+    def append_overrides(
+        self, year: int, month: int, records: Iterable[OverrideRecord], reject_locked: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def delete(self, year: int, month: int) -> None:
+        ...
+
+    def exists(self, year: int, month: int) -> bool:
+        return self.signature(year, month) is not None
+
+    @abstractmethod
+    def signature(self, year: int, month: int) -> Optional[Hashable]:
+        ...
+
+    @abstractmethod
+    def list_months(self) -> List[Tuple[int, int]]:
+        ...
+
+    def latest_month(self) -> Optional[Tuple[int, int]]:
+        months = self.list_months()
+        return months[-1] if months else None
@@ -0,0 +1,188 @@
+"""
+    One YYYY-MM.json file per month, rewritten as a whole on save, with
+    the override journal and the month manifest next to it.
+
+    Writes, journal appends (with their compaction) and deletes of a month
+    hold its YYYY-MM.json.lock file, so a version check, the rewrite and
+    the journal clear cannot interleave with another process's append.
+"""
+
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import portalocker
+
+from scheduler.logic.json_help_functions import (
+    _commit_staged_json,
+    _load_json,
+    _save_json_with_lock,
+    _stage_json,
+    _staged_path,
+)
+from scheduler.logic.month_manifest import (
+    forget_month,
+    get_entry,
+    invalidate_manifest,
+    list_months,
+    record_month,
+)
+from scheduler.logic.month_storage.base import (
+    MonthConflictError,
+    MonthLockedError,
+    MonthStorage,
+    OverrideRecord,
+)
+from scheduler.logic.override_journal import (
+    append_overrides,
+    clear_journal,
+    fold_journal,
+    get_journal_path,
+    journal_needs_compaction,
+    read_journal,
+)
+
+
+LOCK_TIMEOUT = 10
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    # a rewrite replaces the file, so the inode changes even when the
+    # mtime resolution is too coarse to tell two writes apart
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class JsonMonthStorage(MonthStorage):
+
+    name = "json"
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+
+    def path(self, year: int, month: int) -> Path:
+        return self.data_dir / f"{year:04d}-{month:02d}.json"
+
+    def _lock(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return portalocker.Lock(path.with_name(path.name + ".lock"), "a", timeout=LOCK_TIMEOUT)
+
+    def read(self, year: int, month: int) -> Dict[str, Any]:
+        path = self.path(year, month)
+        data = _load_json(path)
+
+        records = read_journal(path)
+        if records:
+            fold_journal(data, records)
+
+        return data
+
+    def write(
+        self, year: int, month: int, data: Dict[str, Any], expected_version: Optional[Hashable] = None
+    ) -> None:
+        """
+            The data is expected to contain the folded override journal,
+            so the journal is cleared.
+        """
+        path = self.path(year, month)
+        with self._lock(path):
+            if expected_version is not None and self.signature(year, month) != expected_version:
+                raise MonthConflictError(f"Месецът {year:04d}-{month:02d} е променен междувременно.")
+            self._write_locked(year, month, data, path)
+
+    def write_many(self, batch: Iterable[Tuple[int, int, Dict[str, Any]]]) -> None:
+        """
+            Stages every month file before any of them is replaced, so a
+            failure while writing leaves all months untouched. Only the
+            final renames (with their backups) run one after another.
+        """
+        months = {(year, month): data for year, month, data in batch}
+        paths = {key: self.path(*key) for key in months}
+
+        with ExitStack() as locks:
+            for key in sorted(paths):
+                locks.enter_context(self._lock(paths[key]))
+
+            staged = {}
+            try:
+                for key, data in months.items():
+                    staged[key] = _staged_path(paths[key])
+                    _stage_json(paths[key], data)
+            except BaseException:
+                for tmp_path in staged.values():
+                    tmp_path.unlink(missing_ok=True)
+                raise
+
+            for key, data in months.items():
+                _commit_staged_json(paths[key], staged[key])
+                clear_journal(paths[key])
+                self._record_in_manifest(key[0], key[1], data, paths[key])
+
+    def _write_locked(self, year: int, month: int, data: Dict[str, Any], path: Path) -> None:
+        _save_json_with_lock(path, data)
+        clear_journal(path)
+        self._record_in_manifest(year, month, data, path)
+
+    def _record_in_manifest(self, year: int, month: int, data: Dict[str, Any], path: Path) -> None:
+        """
+            The month file is already written; if the manifest cannot be
+            updated it is dropped and rebuilt on the next read.
+        """
+        try:
+            record_month(self.data_dir, year, month, data, path)
+        except Exception:
+            try:
+                invalidate_manifest(self.data_dir)
+            except OSError:
+                pass
+
+    def append_overrides(
+        self, year: int, month: int, records: Iterable[OverrideRecord], reject_locked: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+            Appends to the journal; the journal is folded into the month
+            file once it grows too big. The lock flag is taken from the
+            manifest, which every write updates under the same lock.
+        """
+        path = self.path(year, month)
+        with self._lock(path):
+            if not path.exists():
+                raise FileNotFoundError(f"JSON файлът не съществува: {path}")
+
+            if reject_locked and (get_entry(self.data_dir, year, month) or {}).get("ui_locked"):
+                raise MonthLockedError("Месецът е заключен.")
+
+            size = append_overrides(path, records)
+            if not journal_needs_compaction(size):
+                return None
+
+            data = self.read(year, month)
+            self._write_locked(year, month, data, path)
+            return data
+
+    def delete(self, year: int, month: int) -> None:
+        path = self.path(year, month)
+        with self._lock(path):
+            if path.exists():
+                path.unlink()
+            clear_journal(path)
+        try:
+            forget_month(self.data_dir, year, month)
+        except Exception:
+            invalidate_manifest(self.data_dir)
+
+    def signature(self, year: int, month: int):
+        """
+            (inode, mtime_ns, size) of the month file and of its journal.
+        """
+        path = self.path(year, month)
+        month_stat = _stat(path)
+        if month_stat is None:
+            return None
+        return month_stat, _stat(get_journal_path(path))
+
+    def list_months(self) -> List[Tuple[int, int]]:
+        return list_months(self.data_dir)
@@ -0,0 +1,20 @@
+from typing import List, Tuple
+
+from scheduler.logic.month_storage.base import MonthStorage
+
+
+def migrate_storage(source: MonthStorage, target: MonthStorage, overwrite: bool = False) -> List[Tuple[int, int]]:
+    """
+        Copies every month of source into target (overrides folded in).
+        Months already in target are kept unless overwrite=True.
+        Returns the copied (year, month) pairs; source is not modified.
+    """
+
+    copied = []
+    for year, month in source.list_months():
+        if not overwrite and target.exists(year, month):
+            continue
+        target.write(year, month, source.read(year, month))
+        copied.append((year, month))
+
+    return copied
@@ -0,0 +1,376 @@
+"""
+    Months in one SQLite database (WAL mode).
+
+    A month is split into a header row (the top-level keys, lock flags and
+    administrator), one row per employee schedule and one row per override
+    cell. Saving compares the new month with the stored rows and upserts
+    only what changed, inside one write transaction, so concurrent server
+    threads and the desktop app never rewrite a whole month for one cell.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from scheduler.logic.month_storage.base import (
+    MonthConflictError,
+    MonthLockedError,
+    MonthStorage,
+    OverrideRecord,
+)
+
+
+BUSY_TIMEOUT_MS = 10_000
+
+# Keys stored as rows; the header keeps a null placeholder so the key
+# order and presence of the month dict survive a round trip.
+ROW_KEYS = ("schedule", "overrides")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS months (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    ui_locked INTEGER NOT NULL DEFAULT 0,
+    generator_locked INTEGER NOT NULL DEFAULT 0,
+    month_admin_id TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (year, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS schedule_rows (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    employee_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    days TEXT NOT NULL,
+    PRIMARY KEY (year, month, employee_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS overrides (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    employee_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    shift TEXT NOT NULL,
+    PRIMARY KEY (year, month, employee_id, day)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS overrides_by_employee ON overrides (employee_id, year, month);
+
+CREATE TABLE IF NOT EXISTS storage_clock (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO storage_clock (id, value)
+SELECT 0, COALESCE(MAX(version), 0) FROM months;
+"""
+
+_instances: Dict[Path, "SqliteMonthStorage"] = {}
+_instances_lock = threading.Lock()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def open_sqlite_storage(db_path) -> "SqliteMonthStorage":
+    """
+        Returns the shared storage of a database file, so every caller in
+        the process reuses the same per-thread connections.
+    """
+    path = Path(db_path).resolve()
+    with _instances_lock:
+        storage = _instances.get(path)
+        if storage is None:
+            storage = _instances[path] = SqliteMonthStorage(path)
+        return storage
+
+
+class SqliteMonthStorage(MonthStorage):
+
+    name = "sqlite"
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+            One connection per thread, in autocommit mode; write
+            transactions are opened explicitly with BEGIN IMMEDIATE.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+
+        self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _write_transaction(self):
+        return _Transaction(self._connection(), "BEGIN IMMEDIATE")
+
+    def _read_transaction(self):
+        """
+            One snapshot for all SELECTs of a read (WAL keeps it stable
+            while writers commit).
+        """
+        return _Transaction(self._connection(), "BEGIN")
+
+    @staticmethod
+    def _tick(conn) -> int:
+        """
+            Next value of the database-wide clock. Month versions come from
+            it, so a month deleted and written again never reuses a version.
+        """
+        conn.execute("UPDATE storage_clock SET value = value + 1 WHERE id = 0")
+        return conn.execute("SELECT value FROM storage_clock WHERE id = 0").fetchone()[0]
+
+    # -------- reads --------
+
+    def read(self, year: int, month: int) -> Dict[str, Any]:
+        return self.read_versioned(year, month)[0]
+
+    def read_versioned(self, year: int, month: int) -> Tuple[Dict[str, Any], int]:
+        with self._read_transaction() as conn:
+            return self._read_month(conn, year, month)
+
+    def _read_month(self, conn, year: int, month: int) -> Tuple[Dict[str, Any], int]:
+        row = conn.execute(
+            "SELECT header, version FROM months WHERE year = ? AND month = ?", (year, month)
+        ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Месецът {year:04d}-{month:02d} не съществува в {self.db_path}")
+
+        data = json.loads(row[0])
+
+        if "schedule" in data:
+            data["schedule"] = {
+                emp_id: json.loads(days)
+                for emp_id, days in conn.execute(
+                    "SELECT employee_id, days FROM schedule_rows"
+                    " WHERE year = ? AND month = ? ORDER BY position",
+                    (year, month),
+                )
+            }
+
+        overrides: Dict[str, Dict[str, str]] = {}
+        for emp_id, day, shift in conn.execute(
+            "SELECT employee_id, day, shift FROM overrides WHERE year = ? AND month = ?",
+            (year, month),
+        ):
+            overrides.setdefault(emp_id, {})[day] = shift
+
+        if overrides or "overrides" in data:
+            data["overrides"] = overrides
+
+        return data, row[1]
+
+    def signature(self, year: int, month: int) -> Optional[int]:
+        """
+            The version of the month: the storage clock value of its last
+            write or override append.
+        """
+        row = self._connection().execute(
+            "SELECT version FROM months WHERE year = ? AND month = ?", (year, month)
+        ).fetchone()
+        return row[0] if row else None
+
+    def list_months(self) -> List[Tuple[int, int]]:
+        return [
+            (year, month)
+            for year, month in self._connection().execute(
+                "SELECT year, month FROM months ORDER BY year, month"
+            )
+        ]
+
+    # -------- writes --------
+
+    def write(
+        self, year: int, month: int, data: Dict[str, Any], expected_version: Optional[Hashable] = None
+    ) -> None:
+        with self._write_transaction() as conn:
+            if expected_version is not None:
+                row = conn.execute(
+                    "SELECT version FROM months WHERE year = ? AND month = ?", (year, month)
+                ).fetchone()
+                if row is None or row[0] != expected_version:
+                    raise MonthConflictError(f"Месецът {year:04d}-{month:02d} е променен междувременно.")
+
+            self._write_month(conn, year, month, data)
+
+    def write_many(self, batch: Iterable[Tuple[int, int, Dict[str, Any]]]) -> None:
+        """
+            All months in one transaction: either every month is written
+            or none is.
+        """
+        with self._write_transaction() as conn:
+            for year, month, data in batch:
+                self._write_month(conn, year, month, data)
+
+    def _write_month(self, conn, year: int, month: int, data: Dict[str, Any]) -> None:
+        schedule = data.get("schedule") or {}
+        overrides = data.get("overrides") or {}
+        header = {k: (None if k in ROW_KEYS else v) for k, v in data.items()}
+        admin_id = data.get("month_admin_id")
+
+        conn.execute(
+            "INSERT INTO months (year, month, header, ui_locked, generator_locked, month_admin_id, version)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (year, month) DO UPDATE SET"
+            " header = excluded.header, ui_locked = excluded.ui_locked,"
+            " generator_locked = excluded.generator_locked,"
+            " month_admin_id = excluded.month_admin_id, version = excluded.version",
+            (
+                year,
+                month,
+                _dumps(header),
+                int(bool(data.get("ui_locked", False))),
+                int(bool(data.get("generator_locked", False))),
+                str(admin_id) if admin_id else None,
+                self._tick(conn),
+            ),
+        )
+        self._sync_schedule(conn, year, month, schedule)
+        self._sync_overrides(conn, year, month, overrides)
+
+    def _sync_schedule(self, conn, year: int, month: int, schedule: Dict[str, Any]) -> None:
+        stored = {
+            emp_id: (position, days)
+            for emp_id, position, days in conn.execute(
+                "SELECT employee_id, position, days FROM schedule_rows WHERE year = ? AND month = ?",
+                (year, month),
+            )
+        }
+
+        changed = []
+        for position, (emp_id, days) in enumerate(schedule.items()):
+            row = (position, _dumps(days))
+            if stored.pop(str(emp_id), None) != row:
+                changed.append((year, month, str(emp_id)) + row)
+
+        if changed:
+            conn.executemany(
+                "INSERT INTO schedule_rows (year, month, employee_id, position, days)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (year, month, employee_id) DO UPDATE SET"
+                " position = excluded.position, days = excluded.days",
+                changed,
+            )
+        if stored:
+            conn.executemany(
+                "DELETE FROM schedule_rows WHERE year = ? AND month = ? AND employee_id = ?",
+                [(year, month, emp_id) for emp_id in stored],
+            )
+
+    def _sync_overrides(self, conn, year: int, month: int, overrides: Dict[str, Dict[str, str]]) -> None:
+        stored = {
+            (emp_id, day): shift
+            for emp_id, day, shift in conn.execute(
+                "SELECT employee_id, day, shift FROM overrides WHERE year = ? AND month = ?",
+                (year, month),
+            )
+        }
+
+        cells = [
+            (str(emp_id), str(day), shift)
+            for emp_id, days in overrides.items()
+            for day, shift in days.items()
+        ]
+        changed = []
+        for emp_id, day, shift in cells:
+            if stored.pop((emp_id, day), None) != shift:
+                changed.append((emp_id, day, shift))
+
+        self._upsert_overrides(conn, year, month, changed)
+        if stored:
+            conn.executemany(
+                "DELETE FROM overrides WHERE year = ? AND month = ? AND employee_id = ? AND day = ?",
+                [(year, month, emp_id, day) for emp_id, day in stored],
+            )
+
+    @staticmethod
+    def _upsert_overrides(conn, year: int, month: int, records: Iterable[OverrideRecord]) -> None:
+        conn.executemany(
+            "INSERT INTO overrides (year, month, employee_id, day, shift) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (year, month, employee_id, day) DO UPDATE SET shift = excluded.shift",
+            [(year, month, str(emp_id), str(day), shift) for emp_id, day, shift in records],
+        )
+
+    def append_overrides(
+        self, year: int, month: int, records: Iterable[OverrideRecord], reject_locked: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+            Upserts the override cells; the month rows are not touched.
+        """
+        records = list(records)
+
+        with self._write_transaction() as conn:
+            row = conn.execute(
+                "SELECT ui_locked FROM months WHERE year = ? AND month = ?", (year, month)
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Месецът {year:04d}-{month:02d} не съществува в {self.db_path}")
+            if reject_locked and row[0]:
+                raise MonthLockedError("Месецът е заключен.")
+
+            conn.execute(
+                "UPDATE months SET version = ? WHERE year = ? AND month = ?",
+                (self._tick(conn), year, month),
+            )
+            self._upsert_overrides(conn, year, month, records)
+
+        return None
+
+    def delete(self, year: int, month: int) -> None:
+        with self._write_transaction() as conn:
+            self._tick(conn)
+            for table in ("overrides", "schedule_rows", "months"):
+                conn.execute(f"DELETE FROM {table} WHERE year = ? AND month = ?", (year, month))
+
+
+class _Transaction:
+    """
+        BEGIN ... COMMIT, rolled back on any error. Writers use BEGIN
+        IMMEDIATE: taking the write lock up front keeps two writers from
+        deadlocking on upgrade.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, begin: str):
+        self.conn = conn
+        self.begin = begin
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute(self.begin)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
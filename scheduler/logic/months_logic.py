@@ -1,32 +1,329 @@
 from __future__ import annotations
 
-import re
+import logging
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Callable, Dict, Any, Hashable, Optional, Tuple, List
 
 from scheduler.logic.generator.apply_overrides import apply_overrides
 from scheduler.logic.file_paths import DATA_DIR
-from scheduler.logic.json_help_functions import _load_json, _save_json_with_lock
+from scheduler.logic.configuration_helpers import load_config
+from scheduler.logic.json_help_functions import _content_hash
+from scheduler.logic.month_storage.base import (
+    MonthConflictError,
+    MonthLockedError,
+    MonthStorage,
+    OverrideRecord,
+)
+from scheduler.logic.month_storage.json_backend import JsonMonthStorage
+from scheduler.logic.month_storage.migration import migrate_storage
+from scheduler.logic.month_storage.sqlite_backend import open_sqlite_storage
 
-MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})\.json$")
+logger = logging.getLogger(__name__)
 
+RUNTIME_KEYS = ("_runtime_schedule",)
+
+# Called as listener(year, month, data, records) after a month changes.
+# A whole-month write passes data and records=None; an override append
+# passes data=None and the appended (employee_id, day, shift) records.
+SaveListener = Callable[[int, int, Optional[Dict[str, Any]], Optional[List[OverrideRecord]]], None]
+_SAVE_LISTENERS: List[SaveListener] = []
+
+
+def add_save_listener(listener: SaveListener) -> None:
+    if listener not in _SAVE_LISTENERS:
+        _SAVE_LISTENERS.append(listener)
+
+
+def remove_save_listener(listener: SaveListener) -> None:
+    if listener in _SAVE_LISTENERS:
+        _SAVE_LISTENERS.remove(listener)
+
+
+def _notify_saved(
+    year: int,
+    month: int,
+    data: Optional[Dict[str, Any]],
+    records: Optional[List[OverrideRecord]] = None,
+) -> None:
+    """
+        Listeners keep derived data in sync; the stored month is the source
+        of truth, so a failing listener never fails the save. Failures are
+        logged; replay_stored_months() rebuilds what a listener missed.
+    """
+    for listener in list(_SAVE_LISTENERS):
+        try:
+            listener(year, month, data, records)
+        except Exception:
+            logger.exception(
+                "Save listener %r failed for %04d-%02d", listener, year, month
+            )
+
+
+def replay_stored_months(
+    listener: SaveListener,
+    months: Optional[List[Tuple[int, int]]] = None,
+) -> List[Tuple[int, int]]:
+    """
+        Calls listener with the whole data of every stored month (or of
+        the given months), as if each was just saved. Used to backfill
+        derived tables; errors propagate. Returns the replayed months.
+    """
+    months = list_stored_months() if months is None else months
+    for year, month in months:
+        listener(year, month, read_month(year, month), None)
+    return list(months)
+
+
+
+STORAGE_BACKENDS = ("json", "sqlite")
+STORAGE_CONFIG_KEY = "month_storage"
+SQLITE_FILE_NAME = "months.sqlite3"
+
+_STORAGE_BACKEND: Optional[str] = None
+
+
+def storage_backend_name() -> str:
+    """
+        The backend set with set_storage_backend(), else the
+        "month_storage" key of config.json, else "json".
+    """
+    global _STORAGE_BACKEND
+    if _STORAGE_BACKEND is None:
+        try:
+            name = load_config().get(STORAGE_CONFIG_KEY) or "json"
+        except (OSError, ValueError, AttributeError):
+            name = "json"
+        _STORAGE_BACKEND = name if name in STORAGE_BACKENDS else "json"
+    return _STORAGE_BACKEND
+
+
+def set_storage_backend(name: Optional[str]) -> None:
+    """
+        Selects the month backend for this process; None re-reads config.json.
+    """
+    global _STORAGE_BACKEND
+    if name is not None and name not in STORAGE_BACKENDS:
+        raise ValueError(f"Непознато хранилище: {name}")
+    _STORAGE_BACKEND = name
+
+
+def get_storage(name: Optional[str] = None) -> MonthStorage:
+    """
+        Returns the month backend (the configured one by default) rooted
+        in the current DATA_DIR.
+    """
+    name = name or storage_backend_name()
+    if name == "sqlite":
+        return open_sqlite_storage(DATA_DIR / SQLITE_FILE_NAME)
+    if name == "json":
+        return JsonMonthStorage(DATA_DIR)
+    raise ValueError(f"Непознато хранилище: {name}")
+
+
+def migrate_month_storage(target: str, overwrite: bool = False) -> List[Tuple[int, int]]:
+    """
+        One-shot copy of every month from the current backend into target,
+        which then becomes the backend of this process. Persist the choice
+        in config.json ("month_storage") to keep it after a restart.
+    """
+    source = get_storage()
+    if target == source.name:
+        return []
+
+    copied = migrate_storage(source, get_storage(target), overwrite=overwrite)
+    set_storage_backend(target)
+    return copied
 
 
 def get_month_path(year: int, month: int) -> Path:
     return DATA_DIR / f"{year:04d}-{month:02d}.json"
 
 
-def save_month(year: int, month: int, data: Dict[str, Any]) -> None:
+def save_month(
+    year: int,
+    month: int,
+    data: Dict[str, Any],
+    expected_version: Optional[Hashable] = None,
+) -> None:
+    """
+    Saves the month through the storage backend (safe write).
+    The data is expected to contain the folded override journal
+    (load_month/read_month do that). Pass the version from
+    read_month_versioned to fail with MonthConflictError instead of
+    dropping overrides appended after that read.
+    """
+    if any(key in data for key in RUNTIME_KEYS):
+        data = {k: v for k, v in data.items() if k not in RUNTIME_KEYS}
+    get_storage().write(year, month, data, expected_version=expected_version)
+    _notify_saved(year, month, data)
+
+
+def update_month(
+    year: int,
+    month: int,
+    change: Callable[[Dict[str, Any]], Optional[bool]],
+    attempts: int = 3,
+) -> Dict[str, Any]:
+    """
+        Read-modify-write with the optimistic check: change(data) edits a
+        freshly read month in place and is run again on a new read when
+        another writer got in between. change may return False to leave
+        the month unsaved. Returns the data as last read and changed.
+    """
+    for attempt in range(attempts):
+        data, version = read_month_versioned(year, month)
+        if change(data) is False:
+            return data
+        try:
+            save_month(year, month, data, expected_version=version)
+            return data
+        except MonthConflictError:
+            if attempt == attempts - 1:
+                raise
+
+
+def delete_month(year: int, month: int) -> None:
+    """
+        Removes the month and its overrides.
+    """
+    get_storage().delete(year, month)
+
+
+def month_exists(year: int, month: int) -> bool:
+    return get_storage().exists(year, month)
+
+
+def append_month_overrides(
+    year: int, month: int, records: List[OverrideRecord], reject_locked: bool = False
+) -> None:
+    """
+        Records (employee_id, day, shift) overrides without rewriting the month.
+        Listeners get only the appended records, also when the JSON backend
+        folds its journal into the month file.
+        With reject_locked a ui_locked month raises MonthLockedError; the
+        flag is checked under the same lock as the append.
+    """
+    records = [(str(emp_id), str(day), shift) for emp_id, day, shift in records]
+    get_storage().append_overrides(year, month, records, reject_locked=reject_locked)
+    _notify_saved(year, month, None, records)
+
+
+def compact_month_journal(year: int, month: int) -> None:
+    """
+        Folds the override journal into the month snapshot.
+    """
+    save_month(year, month, read_month(year, month))
+
+
+def save_month_if_changed(
+    year: int,
+    month: int,
+    data: Dict[str, Any],
+    stored_hash: str,
+    expected_version: Optional[Hashable] = None,
+) -> bool:
+    """
+        Saves the month only when its content differs from stored_hash.
+        Returns True when a write happened.
+    """
+    if month_hash(data) == stored_hash:
+        return False
+
+    save_month(year, month, data, expected_version=expected_version)
+    return True
+
+
+def month_hash(data: Dict[str, Any]) -> str:
+    """
+        Content hash of a month as it would be persisted.
+    """
+    return _content_hash({k: v for k, v in data.items() if k not in RUNTIME_KEYS})
+
+
+def save_months(batch: List[Tuple[int, int, Dict[str, Any]]]) -> None:
+    """
+        Saves several months as one batch (one SQLite transaction, or every
+        JSON file staged before any is replaced), after all of them are
+        prepared. Used by batch generation so nothing is written when one
+        month fails. Listeners are called once the whole batch is stored.
+    """
+    batch = [
+        (year, month, {k: v for k, v in data.items() if k not in RUNTIME_KEYS})
+        for year, month, data in batch
+    ]
+    get_storage().write_many(batch)
+
+    for year, month, data in batch:
+        _notify_saved(year, month, data)
+
+
+def iter_months(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+        Returns every (year, month) pair from start to end inclusive.
+    """
+    year, month = start
+    result: List[Tuple[int, int]] = []
+
+    while (year, month) <= tuple(end):
+        result.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    return result
+
+
+def read_month(year: int, month: int) -> Dict[str, Any]:
     """
-    Saves month YYYY-MM.json (safe write).
+        Reads the stored month with the overrides folded in.
+        No defaults are added and overrides are not applied to the schedule.
     """
-    path = get_month_path(year, month)
-    _save_json_with_lock(path, data)
+    return get_storage().read(year, month)
+
+
+def read_month_versioned(year: int, month: int) -> Tuple[Dict[str, Any], Hashable]:
+    """
+        read_month plus the storage version the data belongs to, for a
+        later save_month(..., expected_version=version).
+    """
+    return get_storage().read_versioned(year, month)
+
+
+def normalize_month(data: Dict[str, Any], employee_ids: List[str], days: int) -> Dict[str, Any]:
+    """
+        Returns a normalized copy of a stored month.
+        Every employee gets every day of the month, overrides for unknown
+        employees/days are dropped and the lock flags become booleans.
+        The input is not modified.
+    """
+    schedule = data.get("schedule", {}) or {}
+    overrides = data.get("overrides", {}) or {}
+
+    rebuilt = {}
+    for eid in employee_ids:
+        emp_days = schedule.get(eid, {})
+        rebuilt[eid] = {
+            str(d): emp_days.get(str(d), "")
+            for d in range(1, days + 1)
+        }
+
+    normalized = {k: v for k, v in data.items() if k not in RUNTIME_KEYS}
+    normalized["schedule"] = rebuilt
+    normalized["overrides"] = {
+        emp_id: {
+            str(day): shift
+            for day, shift in days_map.items()
+            if str(day) in rebuilt.get(emp_id, {})
+        }
+        for emp_id, days_map in overrides.items()
+        if emp_id in rebuilt
+    }
+    normalized["ui_locked"] = bool(data.get("ui_locked", False))
+    normalized["generator_locked"] = bool(data.get("generator_locked", False))
+
+    return normalized
 
 
 def load_month(year: int, month: int) -> Dict[str, Any]:
-    path = get_month_path(year, month)
-    data = _load_json(path)
+    data = read_month(year, month)
     data.setdefault("schedule", {})
     data.setdefault("overrides", {})
     data.setdefault("ui_locked", False)
@@ -40,43 +337,31 @@ def load_month(year: int, month: int) -> Dict[str, Any]:
 
 
 
-def list_month_files() -> List[Tuple[int, int, Path]]:
+def list_stored_months() -> List[Tuple[int, int]]:
     """
-        Returns list of existing month files (year, month, path).
+        Returns the stored (year, month) pairs in order.
     """
-    result: List[Tuple[int, int, Path]] = []
+    return get_storage().list_months()
 
-    if not DATA_DIR.exists():
-        return result
 
-    for p in DATA_DIR.iterdir():
-        if not p.is_file():
-            continue
-
-        m = MONTH_PATTERN.match(p.name)
-        if not m:
-            continue
-
-        year = int(m.group(1))
-        month = int(m.group(2))
-        result.append((year, month, p))
-
-    result.sort(key=lambda x: (x[0], x[1]))
-    return result
+def list_month_files() -> List[Tuple[int, int, Path]]:
+    """
+        Returns list of existing month files (year, month, path).
+        The path is where the JSON backend keeps the month.
+    """
+    return [
+        (year, month, get_month_path(year, month))
+        for year, month in list_stored_months()
+    ]
 
 
 def get_latest_month() -> Optional[Tuple[int, int, Dict[str, Any]]]:
     """
         Returns (year, month, data) for the last available month.
     """
-    months = list_month_files()
-    if not months:
+    latest = get_storage().latest_month()
+    if latest is None:
         return None
 
-    year, month, path = months[-1]
-    data = _load_json(path)
-
-    return year, month, data
-
-
-
+    year, month = latest
+    return year, month, read_month(year, month)
@@ -0,0 +1,192 @@
+"""
+    Copy-on-write schedule overlays.
+
+    A ScheduleOverlay is a base schedule ({employee: {day: shift}}) plus
+    sparse edits. It reads like the plain nested dicts the validators,
+    repair and exporters take (the Mapping interface), but setting a cell
+    only records an edit and never copies or touches the base. fork()
+    copies the edits alone, so many what-if variants of a month can be
+    evaluated without copying the month each time.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_MISSING = object()
+_NO_EDITS: Dict[Any, str] = {}
+
+
+def _day_key(base_days: Mapping, day) -> Any:
+    """
+        Returns the key a day has in the base (str or int), so edits
+        shadow the base cell whichever type the caller uses.
+    """
+
+    if day in base_days:
+        return day
+    alt = str(day) if isinstance(day, int) else (int(day) if str(day).isdigit() else day)
+    return alt if alt in base_days else day
+
+
+class DayOverlay(Mapping):
+    """
+        One employee's days: the edits first, then the base.
+        Supports item assignment (recorded as an edit) and copy(), so
+        code written for plain day dicts works on it unchanged.
+        The employee's edits dict is looked up in the overlay's edits and
+        only created by the first assignment, so reading never adds one.
+    """
+
+    __slots__ = ("_base", "_all_edits", "_emp_id")
+
+    def __init__(self, base: Mapping, all_edits: Dict[Any, Dict[Any, str]], emp_id):
+        self._base = base
+        self._all_edits = all_edits
+        self._emp_id = emp_id
+
+    @property
+    def _edits(self) -> Dict[Any, str]:
+        return self._all_edits.get(self._emp_id, _NO_EDITS)
+
+    def __getitem__(self, day):
+        value = self._edits.get(day, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._base[day]
+
+    def __contains__(self, day) -> bool:
+        return day in self._edits or day in self._base
+
+    def __iter__(self) -> Iterator:
+        yield from self._base
+        for day in self._edits:
+            if day not in self._base:
+                yield day
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for day in self._edits if day not in self._base)
+
+    def __setitem__(self, day, shift: str) -> None:
+        self._all_edits.setdefault(self._emp_id, {})[_day_key(self._base, day)] = shift
+
+    def copy(self) -> Dict[Any, str]:
+        days = dict(self._base)
+        days.update(self._edits)
+        return days
+
+    def __repr__(self) -> str:
+        return f"DayOverlay({self.copy()!r})"
+
+
+class ScheduleOverlay(Mapping):
+    """
+        Base schedule plus sparse {employee: {day: shift}} edits.
+            - lookups are O(1): one dict probe in the edits, one in the base
+            - set_shift() / overlay[emp][day] = shift record an edit
+            - fork() starts an independent variant (copies the edits only)
+            - materialize() returns plain dicts with the edits applied
+        Employees must exist in the base; the base is never modified.
+    """
+
+    __slots__ = ("base", "_edits")
+
+    def __init__(self, base: Mapping[str, Mapping], edits: Optional[Dict[str, Dict]] = None):
+        self.base = base
+        self._edits: Dict[str, Dict[Any, str]] = {}
+        for emp_id, days in (edits or {}).items():
+            for day, shift in days.items():
+                self.set_shift(emp_id, day, shift)
+
+    @classmethod
+    def with_overrides(cls, schedule: Mapping[str, Mapping], overrides: Dict[str, Dict]) -> "ScheduleOverlay":
+        """
+            Overlay counterpart of apply_overrides: unknown employees
+            are ignored and the schedule is left untouched.
+        """
+
+        known = {
+            str(emp_id): days for emp_id, days in overrides.items()
+            if str(emp_id) in schedule
+        }
+        return cls(schedule, known)
+
+    def _employee_key(self, emp_id):
+        if emp_id in self.base:
+            return emp_id
+        if str(emp_id) in self.base:
+            return str(emp_id)
+        raise KeyError(emp_id)
+
+    def __getitem__(self, emp_id) -> DayOverlay:
+        return DayOverlay(self.base[emp_id], self._edits, emp_id)
+
+    def __contains__(self, emp_id) -> bool:
+        return emp_id in self.base
+
+    def __iter__(self) -> Iterator:
+        return iter(self.base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def get_shift(self, emp_id, day, default: str = "") -> str:
+        """
+            Looks the cell up with the key types set_shift() stores it
+            under, so str and int employee / day keys both find it.
+        """
+
+        try:
+            emp_id = self._employee_key(emp_id)
+        except KeyError:
+            return default
+
+        base_days = self.base[emp_id]
+        day = _day_key(base_days, day)
+        edits = self._edits.get(emp_id)
+        if edits:
+            value = edits.get(day, _MISSING)
+            if value is not _MISSING:
+                return value
+        return base_days.get(day, default)
+
+    def set_shift(self, emp_id, day, shift: str) -> None:
+        emp_id = self._employee_key(emp_id)
+        self._edits.setdefault(emp_id, {})[_day_key(self.base[emp_id], day)] = shift
+
+    def changes(self) -> List[Tuple[Any, Any, str]]:
+        """
+            Returns the (employee, day, shift) edits that differ from the base.
+        """
+
+        return [
+            (emp_id, day, shift)
+            for emp_id, days in self._edits.items()
+            for day, shift in days.items()
+            if self.base[emp_id].get(day, _MISSING) != shift
+        ]
+
+    def fork(self) -> "ScheduleOverlay":
+        forked = ScheduleOverlay(self.base)
+        forked._edits = {emp_id: dict(days) for emp_id, days in self._edits.items() if days}
+        return forked
+
+    def materialize(self) -> Dict[Any, Dict[Any, str]]:
+        """
+            Returns a plain copy of the schedule with the edits applied;
+            employees without edits share nothing with the base either.
+        """
+
+        result = {}
+        for emp_id, days in self.base.items():
+            copied = dict(days)
+            edits = self._edits.get(emp_id)
+            if edits:
+                copied.update(edits)
+            result[emp_id] = copied
+        return result
+
+    def __repr__(self) -> str:
+        return f"ScheduleOverlay({len(self.base)} employees, {len(self.changes())} changes)"
@@ -0,0 +1,94 @@
+"""
+    Append-only journal of manual overrides, one file per month.
+
+    Every cell edit is appended as one JSON line to YYYY-MM.overrides.jsonl
+    next to the month file instead of rewriting the whole month. The journal
+    is folded into the month snapshot whenever the month is saved (lock,
+    regeneration, normalization) or when it grows past the compaction size.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import portalocker
+
+
+JOURNAL_SUFFIX = ".overrides.jsonl"
+JOURNAL_COMPACT_BYTES = 64 * 1024
+
+OverrideRecord = Tuple[str, str, str]
+
+
+def get_journal_path(month_path: Path) -> Path:
+    return month_path.with_name(month_path.stem + JOURNAL_SUFFIX)
+
+
+def append_overrides(month_path: Path, records: Iterable[OverrideRecord]) -> int:
+    """
+        Appends (employee_id, day, shift) records to the month journal.
+        Returns the journal size in bytes after the write.
+    """
+    path = get_journal_path(month_path)
+    timestamp = datetime.now().isoformat(timespec="seconds")
+
+    lines = "".join(
+        json.dumps(
+            {"employee_id": str(emp_id), "day": str(day), "shift": shift, "ts": timestamp},
+            ensure_ascii=False,
+        ) + "\n"
+        for emp_id, day, shift in records
+    )
+
+    with path.open("a", encoding="utf-8") as f:
+        portalocker.lock(f, portalocker.LOCK_EX)
+        f.write(lines)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+        size = f.tell()
+        portalocker.unlock(f)
+
+    return size
+
+
+def read_journal(month_path: Path) -> List[Dict[str, str]]:
+    """
+        Returns the journal records in write order.
+        A torn last line (interrupted write) is ignored.
+    """
+    path = get_journal_path(month_path)
+    if not path.exists():
+        return []
+
+    records = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+    return records
+
+
+def fold_journal(data: Dict[str, Any], records: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+        Folds journal records into data["overrides"] in place (last write wins).
+    """
+    overrides = data.setdefault("overrides", {})
+    for r in records:
+        overrides.setdefault(r["employee_id"], {})[r["day"]] = r["shift"]
+    return data
+
+
+def clear_journal(month_path: Path) -> None:
+    get_journal_path(month_path).unlink(missing_ok=True)
+
+
+def journal_needs_compaction(size: int) -> bool:
+    return size >= JOURNAL_COMPACT_BYTES
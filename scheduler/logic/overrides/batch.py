@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from scheduler.logic.calendar_service import days_in_month, weekday_map
+from scheduler.logic.generator.apply_overrides import apply_overrides
+from scheduler.logic.months_logic import append_month_overrides, read_month
+from scheduler.logic.validators.validators import validate_month
+
+
+OVERRIDE_SHIFTS = ("", "Д", "В", "Н", "А", "О", "Б")
+
+
+def normalize_override_batch(
+    changes: Iterable[Dict[str, Any]],
+    days: int,
+    employee_ids: Optional[Iterable[str]] = None,
+) -> List[Tuple[str, str, str]]:
+    """
+        Validates a batch of {employee_id, day, new_shift} changes.
+        Every change is checked before anything is written, so one bad
+        entry rejects the whole batch. Repeated edits of the same cell
+        collapse into the last one (in the position of the first).
+    """
+
+    known = {str(e) for e in employee_ids} if employee_ids is not None else None
+    cells: Dict[Tuple[str, str], str] = {}
+
+    for n, change in enumerate(changes, start=1):
+        emp_id = str(change.get("employee_id") or "").strip()
+        if not emp_id:
+            raise ValueError(f"Корекция {n}: липсва служител.")
+        if known is not None and emp_id not in known:
+            raise ValueError(f"Корекция {n}: непознат служител {emp_id}.")
+
+        try:
+            day = int(change.get("day"))
+        except (TypeError, ValueError):
+            raise ValueError(f"Корекция {n}: невалиден ден.")
+        if not 1 <= day <= days:
+            raise ValueError(f"Корекция {n}: денят {day} е извън месеца.")
+
+        shift = str(change.get("new_shift") or "").strip()
+        if shift not in OVERRIDE_SHIFTS:
+            raise ValueError(f"Корекция {n}: невалидна смяна „{shift}“.")
+
+        cells[(emp_id, str(day))] = shift
+
+    return [(emp_id, day, shift) for (emp_id, day), shift in cells.items()]
+
+
+def apply_override_batch(
+    year: int,
+    month: int,
+    changes: Iterable[Dict[str, Any]],
+    employee_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+        Applies many overrides at once: one read, one journal append and
+        one validation pass over the resulting month.
+        Returns the number of applied cells and the validation errors
+        (empty while the month has no administrator or no schedule).
+    """
+
+    data = read_month(year, month)
+    if data.get("ui_locked"):
+        raise RuntimeError("Месецът е заключен.")
+
+    records = normalize_override_batch(changes, days_in_month(year, month), employee_ids)
+    if not records:
+        return {"applied": 0, "errors": []}
+
+    overrides = data.setdefault("overrides", {})
+    for emp_id, day, shift in records:
+        overrides.setdefault(emp_id, {})[day] = shift
+
+    # validated before the append, so nothing can fail once it is written
+    schedule = data.get("schedule") or {}
+    admin_id = data.get("month_admin_id")
+    errors = []
+    if admin_id and schedule:
+        errors = validate_month(
+            apply_overrides(schedule, overrides),
+            crisis_mode=False,
+            weekdays=weekday_map(year, month),
+            admin_id=str(admin_id),
+        )
+
+    # the lock is checked again under the append lock, in case the
+    # month was locked after the read above
+    append_month_overrides(year, month, records, reject_locked=True)
+
+    return {"applied": len(records), "errors": errors}
@@ -1,30 +1,36 @@
 from typing import Dict
 
+from scheduler.logic.overlay import ScheduleOverlay
+
 
 LEAVE_CODES = {"O", "B"}
 
 
-def apply_leave_overrides(schedule: Dict[str, Dict[int, str]], leaves: Dict[str, Dict[int, str]],):
+def apply_leave_overrides(
+    schedule: Dict[str, Dict[int, str]],
+    leaves: Dict[str, Dict[int, str]],
+    overlay: bool = False,
+):
     """
         Applies leave and sick-day overrides to an existing schedule.
         Returns a copied schedule where specified days are replaced
         with validated leave codes, without mutating the original data.
+        With overlay=True returns a ScheduleOverlay over the schedule
+        instead of copying it.
     """
 
-    new_schedule = {}
-
-    for name, days in schedule.items():
-        new_schedule[name] = days.copy()
+    result = ScheduleOverlay(schedule)
 
-        if name not in leaves:
+    for name, days in leaves.items():
+        if name not in schedule:
             continue
 
-        for day, leave_code in leaves[name].items():
+        for day, leave_code in days.items():
             if leave_code not in LEAVE_CODES:
                 raise ValueError(
                     f"Невалиден код за отпуск/болничен: {leave_code}"
                 )
 
-            new_schedule[name][day] = leave_code
+            result.set_shift(name, day, leave_code)
 
-    return new_schedule
+    return result if overlay else result.materialize()
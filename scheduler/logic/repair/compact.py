@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from scheduler.logic.calendar_service import month_calendar
+from scheduler.logic.compact import CODE_OF, MISSING, CompactSchedule, Shift
+from scheduler.logic.repair.repair_engine import SHIFT_ADMIN, SHIFT_WORK
+
+
+def find_missing_compact(schedule: CompactSchedule, year, month, holidays: set[int]) -> Dict[int, List[str]]:
+    """
+        find_missing_shifts on a CompactSchedule, counted per day column.
+        Like RepairContext, only the days of the first employee count.
+    """
+
+    weekdays = month_calendar(year, month).weekdays
+    missing = {}
+
+    for day, column in enumerate(zip(*schedule.rows), start=1):
+        if column[0] == MISSING:
+            continue
+
+        need = [s for s in SHIFT_WORK if CODE_OF[s] not in column]
+
+        if weekdays[day - 1] < 5 and day not in holidays:
+            if Shift.A not in column:
+                need.append(SHIFT_ADMIN)
+
+        if need:
+            missing[day] = need
+
+    return missing
+
+
+def apply_compact_repair(
+    schedule: CompactSchedule,
+    year,
+    month,
+    holidays: set[int],
+    admins: set[str],
+) -> CompactSchedule:
+    """
+        Greedy apply_repair on a CompactSchedule; returns a repaired copy.
+        Takes the first free employee (empty cell) in row order, and for
+        А the first free administrator, exactly like RepairContext.
+    """
+
+    result = schedule.copy()
+    rows = result.rows
+    admin_rows = [i for i, emp_id in enumerate(result.employees) if emp_id in admins]
+
+    for day, shifts in find_missing_compact(result, year, month, holidays).items():
+        col = day - 1
+        for shift in shifts:
+            candidates = admin_rows if shift == SHIFT_ADMIN else range(len(rows))
+            for i in candidates:
+                if rows[i][col] == Shift.REST:
+                    rows[i][col] = CODE_OF[shift]
+                    break
+
+    return result
@@ -0,0 +1,223 @@
+"""
+    Rule-aware repair: fills missing shifts day by day as a min-cost
+    assignment of the day's missing shifts to its free employees.
+
+    An assignment is allowed only when rules.is_shift_allowed accepts it and
+    it does not break the employee's next working day. Among the allowed ones
+    the solver prefers the rotation's preferred next shift and employees
+    with fewer worked shifts. Existing cells are never changed.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from scheduler.logic.overlay import ScheduleOverlay
+from scheduler.logic.repair.repair_engine import RepairContext, SHIFT_ADMIN, SHIFT_WORK
+from scheduler.logic.rules import (
+    get_preferred_next_shift,
+    is_rest_like,
+    is_shift_allowed,
+    to_lat,
+)
+
+
+FORBIDDEN = 10 ** 9
+WORKLOAD_COST = 10
+NOT_PREFERRED_COST = 5
+
+Assignment = Tuple[str, int, str]
+
+
+def _min_cost_assignment(cost: List[List[int]]) -> List[int]:
+    """
+        Hungarian algorithm for an n x m cost matrix with n <= m.
+        Returns the assigned column of every row.
+    """
+
+    n, m = len(cost), len(cost[0])
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [float("inf")] * (m + 1)
+        used = [False] * (m + 1)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = float("inf")
+            j1 = 0
+
+            row = cost[i0 - 1]
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - u[i0] - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    result = [0] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
+
+
+class _WorkIndex:
+    """
+        Per-employee sorted working days, kept current while repairing.
+    """
+
+    def __init__(self, schedule: Dict[str, Dict[str, str]]):
+        self.schedule = schedule
+        self.work: Dict[str, List[int]] = {}
+        self.load: Dict[str, int] = {}
+
+        for name, days in schedule.items():
+            self.work[name] = sorted(
+                int(d) for d, shift in days.items()
+                if not is_rest_like(to_lat(shift))
+            )
+            self.load[name] = sum(1 for shift in days.values() if shift in SHIFT_WORK)
+
+    def shift_lat(self, name: str, day: int):
+        return to_lat(self.schedule[name].get(str(day)))
+
+    def neighbours(self, name: str, day: int) -> Tuple[Optional[int], Optional[int]]:
+        work = self.work[name]
+        idx = bisect_left(work, day)
+        prev_day = work[idx - 1] if idx else None
+        next_day = work[idx] if idx < len(work) else None
+        return prev_day, next_day
+
+    def add(self, name: str, day: int, shift: str) -> None:
+        insort(self.work[name], day)
+        if shift in SHIFT_WORK:
+            self.load[name] += 1
+
+
+def _assignment_cost(index: _WorkIndex, name: str, day: int, shift: str, crisis_mode: bool) -> int:
+    new_lat = to_lat(shift)
+    prev_day, next_day = index.neighbours(name, day)
+
+    if prev_day is None:
+        prev_lat, days_since = None, 999
+    else:
+        prev_lat, days_since = index.shift_lat(name, prev_day), day - prev_day
+
+    if not is_shift_allowed(prev_lat, days_since, new_lat, crisis_mode):
+        return FORBIDDEN
+
+    if next_day is not None:
+        next_lat = index.shift_lat(name, next_day)
+        was_allowed = is_shift_allowed(
+            prev_lat, 999 if prev_day is None else next_day - prev_day, next_lat, crisis_mode
+        )
+        if was_allowed and not is_shift_allowed(new_lat, next_day - day, next_lat, crisis_mode):
+            return FORBIDDEN
+
+    cost = index.load[name] * WORKLOAD_COST
+    if get_preferred_next_shift(prev_lat) != new_lat:
+        cost += NOT_PREFERRED_COST
+    return cost
+
+
+def plan_optimal_repair(
+    schedule: Dict[str, Dict[str, str]],
+    year,
+    month,
+    holidays: set[int],
+    admins: set[str],
+    crisis_mode: bool = False,
+) -> Tuple[List[Assignment], Dict[int, List[str]]]:
+    """
+        Computes a rule-aware repair of schedule in place.
+        Returns the (employee, day, shift) assignments made and the
+        shifts per day that could not be filled without breaking a rule.
+    """
+
+    context = RepairContext(schedule, year, month, holidays)
+    index = _WorkIndex(schedule)
+
+    assignments: List[Assignment] = []
+    unfilled: Dict[int, List[str]] = {}
+
+    for day, shifts in context.missing().items():
+        candidates = list(context.free.get(day, {}))
+
+        cost = []
+        for shift in shifts:
+            row = []
+            for name in candidates:
+                if shift == SHIFT_ADMIN and name not in admins:
+                    row.append(FORBIDDEN)
+                else:
+                    row.append(_assignment_cost(index, name, day, shift, crisis_mode))
+            cost.append(row)
+
+        columns = len(candidates)
+        if columns < len(shifts):
+            for row in cost:
+                row.extend([FORBIDDEN] * (len(shifts) - columns))
+
+        chosen = _min_cost_assignment(cost) if cost and cost[0] else []
+
+        for shift, row, col in zip(shifts, cost, chosen):
+            if row[col] >= FORBIDDEN:
+                unfilled.setdefault(day, []).append(shift)
+                continue
+
+            name = candidates[col]
+            context.assign(name, day, shift)
+            index.add(name, day, shift)
+            assignments.append((name, day, shift))
+
+    return assignments, unfilled
+
+
+def apply_optimal_repair(
+    schedule,
+    year,
+    month,
+    holidays: set[int],
+    admins: set[str],
+    crisis_mode: bool = False,
+    overlay: bool = False,
+):
+    """
+        Rule-aware counterpart of apply_repair; returns a repaired copy,
+        or a ScheduleOverlay with overlay=True.
+    """
+
+    if overlay:
+        new_schedule = ScheduleOverlay(schedule)
+    else:
+        new_schedule = {
+            name: days.copy() for name, days in schedule.items()
+        }
+    plan_optimal_repair(new_schedule, year, month, holidays, admins, crisis_mode)
+    return new_schedule
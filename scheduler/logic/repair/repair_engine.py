@@ -1,6 +1,8 @@
-import calendar
 from typing import Dict, List, Optional
 
+from scheduler.logic.calendar_service import month_calendar
+from scheduler.logic.overlay import ScheduleOverlay
+
 SHIFT_WORK = {"Д", "В", "Н"}
 SHIFT_ADMIN = "А"
 BLOCKED = {"O", "B"}
@@ -10,38 +12,88 @@ def _day_int(day) -> int:
     return int(day)
 
 
-def find_missing_shifts(schedule: Dict[str, Dict[str, str]], year, month, holidays: set[int],) -> Dict[int, List[str]]:
+class RepairContext:
     """
-        Identifies missing required shifts for each day in the month.
-        Checks daily work shifts and admin coverage, accounting for weekends
-        and holidays, and returns a mapping of day to missing shift codes.
+        Day indexes for repairing one schedule.
+        Built in a single pass: day -> free employees (in schedule order),
+        day -> used work shifts and the days with admin coverage.
+        assign() keeps the indexes current, so every lookup is O(1)
+        instead of a rescan of the whole schedule.
     """
 
-    missing = {}
+    def __init__(self, schedule: Dict[str, Dict[str, str]], year, month, holidays: set[int],):
+        self.schedule = schedule
+        self.year = year
+        self.month = month
+        self.holidays = holidays
+        self.weekdays = month_calendar(year, month).weekdays
+
+        first = next(iter(schedule.values()), {})
+        self.days = sorted(_day_int(d) for d in first.keys())
+
+        self.free: Dict[int, Dict[str, None]] = {day: {} for day in self.days}
+        self.used: Dict[int, set] = {day: set() for day in self.days}
+        self.admin_days: set[int] = set()
+
+        day_keys = [(day, str(day)) for day in self.days]
+
+        for name, days in schedule.items():
+            for day, d in day_keys:
+                shift = days.get(d)
+                if shift == "":
+                    self.free[day][name] = None
+                elif shift in SHIFT_WORK:
+                    self.used[day].add(shift)
+                elif shift == SHIFT_ADMIN:
+                    self.admin_days.add(day)
+
+    def missing(self) -> Dict[int, List[str]]:
+        missing = {}
+
+        for day in self.days:
+            used = self.used[day]
+            need = [s for s in SHIFT_WORK if s not in used]
+
+            if self.weekdays[day - 1] < 5 and day not in self.holidays:
+                if day not in self.admin_days:
+                    need.append(SHIFT_ADMIN)
 
-    days = sorted(
-        int(d) for d in next(iter(schedule.values())).keys()
-    )
+            if need:
+                missing[day] = need
 
-    for day in days:
-        used = set()
+        return missing
 
-        for data in schedule.values():
-            if data.get(str(day)) in SHIFT_WORK:
-                used.add(data[str(day)])
+    def find_replacement(self, day, shift, admins: set[str],) -> Optional[str]:
+        free = self.free.get(_day_int(day), {})
 
-        need = [s for s in SHIFT_WORK if s not in used]
+        if shift != SHIFT_ADMIN:
+            return next(iter(free), None)
 
-        if calendar.weekday(year, month, day) < 5 and day not in holidays:
-            if SHIFT_ADMIN not in {
-                data.get(str(day)) for data in schedule.values()
-            }:
-                need.append(SHIFT_ADMIN)
+        for name in free:
+            if name in admins:
+                return name
 
-        if need:
-            missing[day] = need
+        return None
 
-    return missing
+    def assign(self, name: str, day, shift: str) -> None:
+        day = _day_int(day)
+        self.schedule[name][str(day)] = shift
+        self.free.get(day, {}).pop(name, None)
+
+        if shift in SHIFT_WORK:
+            self.used.setdefault(day, set()).add(shift)
+        elif shift == SHIFT_ADMIN:
+            self.admin_days.add(day)
+
+
+def find_missing_shifts(schedule: Dict[str, Dict[str, str]], year, month, holidays: set[int],) -> Dict[int, List[str]]:
+    """
+        Identifies missing required shifts for each day in the month.
+        Checks daily work shifts and admin coverage, accounting for weekends
+        and holidays, and returns a mapping of day to missing shift codes.
+    """
+
+    return RepairContext(schedule, year, month, holidays).missing()
 
 
 def find_replacement(schedule: Dict[str, Dict[str, str]], day, shift, admins: set[str],) -> Optional[str]:
@@ -49,6 +101,7 @@ def find_replacement(schedule: Dict[str, Dict[str, str]], day, shift, admins: se
         Finds a suitable employee to cover a missing shift on a given day.
         Selects the first available employee with no assigned shift,
         respects admin-only constraints, and skips blocked assignments.
+        Scans the whole schedule; repairs use RepairContext instead.
     """
 
     d = str(day)
@@ -64,27 +117,44 @@ def find_replacement(schedule: Dict[str, Dict[str, str]], day, shift, admins: se
     return None
 
 
-def apply_repair(schedule, year, month, holidays: set[int], admins: set[str],) -> Dict[str, Dict[str, str]]:
+def apply_repair(
+    schedule,
+    year,
+    month,
+    holidays: set[int],
+    admins: set[str],
+    mode: str = "greedy",
+    overlay: bool = False,
+):
     """
         Attempts to repair a schedule by filling missing shifts.
         Creates a copy of the schedule, detects missing daily shifts,
         and assigns available employees to cover gaps where possible.
+        mode="optimal" uses the rule-aware matching solver instead of
+        taking the first free employee. With overlay=True the repair is
+        returned as a ScheduleOverlay over the schedule (no copy).
     """
 
-    new_schedule = {
-        name: days.copy() for name, days in schedule.items()
-    }
+    if mode == "optimal":
+        from scheduler.logic.repair.matching import apply_optimal_repair
+        return apply_optimal_repair(schedule, year, month, holidays, admins, overlay=overlay)
+
+    if mode != "greedy":
+        raise ValueError(f"Непознат режим на поправка: {mode}")
+
+    if overlay:
+        new_schedule = ScheduleOverlay(schedule)
+    else:
+        new_schedule = {
+            name: days.copy() for name, days in schedule.items()
+        }
 
-    missing = find_missing_shifts(
-        new_schedule, year, month, holidays
-    )
+    context = RepairContext(new_schedule, year, month, holidays)
 
-    for day, shifts in missing.items():
+    for day, shifts in context.missing().items():
         for shift in shifts:
-            name = find_replacement(
-                new_schedule, day, shift, admins
-            )
+            name = context.find_replacement(day, shift, admins)
             if name:
-                new_schedule[name][str(day)] = shift
+                context.assign(name, day, shift)
 
     return new_schedule
@@ -80,8 +80,8 @@ def get_preferred_next_shift(prev_shift):
     return get_transition_rule(prev_shift).default_next
 
 
-def is_shift_allowed(prev_shift, days_since_last_work, new_shift, crisis_mode) -> bool:
-    """ Validation of allowed shift """
+def _is_shift_allowed_rules(prev_shift, days_since_last_work, new_shift, crisis_mode) -> bool:
+    """ Validation of allowed shift (reference rules, compiled below) """
 
     if is_rest_like(new_shift):
         return True
@@ -118,4 +118,70 @@ def is_shift_allowed(prev_shift, days_since_last_work, new_shift, crisis_mode) -
     return True
 
 
+# Compiled transition table
+# Indexed by (prev_shift, new_shift, capped days_since, crisis_mode).
+# The rules only compare days_since with the rest days, so every value
+# above DAYS_SINCE_CAP behaves like the cap and negatives like 0.
+TRANSITION_CODES = (None, "D", "V", "N", "A", "O", "REST")
+SHIFT_INDEX = {code: i for i, code in enumerate(TRANSITION_CODES)}
+
+DAYS_SINCE_CAP = max(
+    max(r.min_rest_days, r.preferred_rest_days) for r in TRANSITION_RULES.values()
+) + 1
+
+
+def _compile_cells(prev_shift, new_shift) -> tuple:
+    """ Cells of one (prev, new) pair, at index days * 2 + crisis """
+
+    return tuple(
+        _is_shift_allowed_rules(prev_shift, days, new_shift, crisis_mode)
+        for days in range(DAYS_SINCE_CAP + 1)
+        for crisis_mode in (False, True)
+    )
+
+
+# TRANSITION_MATRIX[prev_idx][new_idx][days * 2 + crisis]
+TRANSITION_MATRIX = tuple(
+    tuple(_compile_cells(prev_shift, new_shift) for new_shift in TRANSITION_CODES)
+    for prev_shift in TRANSITION_CODES
+)
+
+# Same cells keyed by the shift codes themselves
+TRANSITION_TABLE = {
+    prev_shift: {
+        new_shift: TRANSITION_MATRIX[p][n]
+        for n, new_shift in enumerate(TRANSITION_CODES)
+    }
+    for p, prev_shift in enumerate(TRANSITION_CODES)
+}
+
+
+def is_shift_allowed_indexed(prev_idx: int, days_since_last_work: int, new_idx: int, crisis_mode) -> bool:
+    """ Table lookup with SHIFT_INDEX indices (for validators/solvers) """
+
+    days = days_since_last_work
+    if days > DAYS_SINCE_CAP:
+        days = DAYS_SINCE_CAP
+    elif days < 0:
+        days = 0
+
+    return TRANSITION_MATRIX[prev_idx][new_idx][days * 2 + (1 if crisis_mode else 0)]
+
+
+def is_shift_allowed(prev_shift, days_since_last_work, new_shift, crisis_mode) -> bool:
+    """ Validation of allowed shift """
+
+    try:
+        cells = TRANSITION_TABLE[prev_shift][new_shift]
+    except (KeyError, TypeError):
+        return _is_shift_allowed_rules(prev_shift, days_since_last_work, new_shift, crisis_mode)
+
+    days = days_since_last_work
+    if days is None:
+        return _is_shift_allowed_rules(prev_shift, days_since_last_work, new_shift, crisis_mode)
+    if days > DAYS_SINCE_CAP:
+        days = DAYS_SINCE_CAP
+    elif days < 0:
+        days = 0
 
+    return cells[days * 2 + (1 if crisis_mode else 0)]
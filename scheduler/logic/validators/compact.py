@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from scheduler.logic.compact import MISSING, CompactSchedule, Shift
+from scheduler.logic.rules import is_shift_allowed_indexed
+from scheduler.logic.validators.validators import (
+    ERROR_BLOCKING,
+    ERROR_SOFT,
+    ValidationError,
+    validate_admin_shift,
+)
+
+
+def validate_compact(
+    schedule: CompactSchedule,
+    crisis_mode: bool,
+    weekdays: Dict[int, int],
+    admin_id: str,
+) -> List[ValidationError]:
+    """
+        validate_month on a CompactSchedule; returns the same errors as
+        validate_month(schedule.to_json(), ...). Rotations use the
+        compiled transition table, coverage counts whole day columns.
+    """
+
+    admin_id = str(admin_id)
+    errors: List[ValidationError] = []
+    lat, index, rest = schedule.lat_tables()
+
+    # ──────────────
+    # Rotations
+    # ──────────────
+    for employee, row in zip(schedule.employees, schedule.rows):
+        if employee == admin_id:
+            for day, code in enumerate(row, start=1):
+                if code != MISSING and not validate_admin_shift(weekdays[day], lat[code]):
+                    errors.append(
+                        (employee, day,
+                         "Администраторът не може да работи в този ден",
+                         ERROR_SOFT)
+                    )
+            continue
+
+        prev_idx = 0
+        prev_shift = None
+        last_work_day = None
+
+        for day, code in enumerate(row, start=1):
+            if code == MISSING or rest[code]:
+                continue
+
+            days_since = 999 if last_work_day is None else day - last_work_day
+
+            if not is_shift_allowed_indexed(prev_idx, days_since, index[code], crisis_mode):
+                errors.append(
+                    (employee, day,
+                     f"Невалидна ротация след {prev_shift}",
+                     ERROR_SOFT)
+                )
+
+            prev_idx = index[code]
+            prev_shift = lat[code]
+            last_work_day = day
+
+    if not schedule.rows:
+        return errors
+
+    # ──────────────
+    # Coverage (days of the first employee, as validate_month)
+    # ──────────────
+    first = schedule.rows[0]
+
+    for day, column in enumerate(zip(*schedule.rows), start=1):
+        if first[day - 1] == MISSING:
+            continue
+
+        if column.count(Shift.D) + column.count(Shift.A) == 0:
+            errors.append(
+                ("ПОКРИТИЕ", day,
+                 "Липсва дневна смяна (Д или А)",
+                 ERROR_BLOCKING)
+            )
+
+        evening = column.count(Shift.V)
+        if evening != 1:
+            errors.append(
+                ("ПОКРИТИЕ", day,
+                 f"Вечерна смяна (В) = {evening}",
+                 ERROR_BLOCKING)
+            )
+
+        night = column.count(Shift.N)
+        if night != 1:
+            errors.append(
+                ("ПОКРИТИЕ", day,
+                 f"Нощна смяна (Н) = {night}",
+                 ERROR_BLOCKING)
+            )
+
+    return errors
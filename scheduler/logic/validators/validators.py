@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
 
 from scheduler.logic.rules import (
     is_shift_allowed,
@@ -120,3 +121,204 @@ def validate_month(
             )
 
     return errors
+
+
+def _coverage_key(shift: str) -> Optional[str]:
+    if shift in DAYLINE_SHIFTS:
+        return "DAY"
+    if shift == EVENING_SHIFT:
+        return "В"
+    if shift == NIGHT_SHIFT:
+        return "Н"
+    return None
+
+
+class IncrementalValidator:
+    """
+        Stateful validate_month for live editing.
+        Keeps the working days of every employee and per-day coverage
+        counters, so apply() only rechecks the edited cell, the next
+        working day of the same employee and the coverage of that day.
+        errors() returns the same list validate_month would return.
+        Day keys may be int or str.
+    """
+
+    def __init__(
+        self,
+        schedule: Dict[str, Dict[int, str]],
+        crisis_mode: bool,
+        weekdays: Dict[int, int],
+        admin_id: str,
+    ):
+        self.crisis_mode = crisis_mode
+        self.weekdays = weekdays
+        self.admin_id = str(admin_id)
+
+        self._shifts: Dict[str, Dict[int, str]] = {}
+        self._work_days: Dict[str, List[int]] = {}
+        self._employee_errors: Dict[str, Dict[int, ValidationError]] = {}
+
+        first = next(iter(schedule.values()), {})
+        self._days: List[int] = [int(d) for d in first.keys()]
+        self._coverage: Dict[int, Dict[str, int]] = {
+            day: {"DAY": 0, "В": 0, "Н": 0} for day in self._days
+        }
+        self._coverage_errors: Dict[int, List[ValidationError]] = {}
+
+        for employee, days in schedule.items():
+            employee = str(employee)
+            shifts = {int(d): shift for d, shift in days.items()}
+            self._shifts[employee] = shifts
+            self._employee_errors[employee] = {}
+
+            for day, shift in shifts.items():
+                key = _coverage_key(shift)
+                if key and day in self._coverage:
+                    self._coverage[day][key] += 1
+
+            if employee == self.admin_id:
+                for day in shifts:
+                    self._check_admin(day)
+                continue
+
+            self._work_days[employee] = sorted(
+                day for day, shift in shifts.items()
+                if not is_rest_like(to_lat(shift))
+            )
+            for day in self._work_days[employee]:
+                self._check_rotation(employee, day)
+
+        for day in self._days:
+            self._check_coverage(day)
+
+    def apply(self, employee, day, shift: str) -> None:
+        """
+            Sets one cell and revalidates only what the change can affect.
+        """
+        employee = str(employee)
+        day = int(day)
+        shift = shift or ""
+
+        if employee not in self._shifts:
+            self._shifts[employee] = {}
+            self._employee_errors[employee] = {}
+            if employee != self.admin_id:
+                self._work_days[employee] = []
+
+        shifts = self._shifts[employee]
+        old = shifts.get(day, "")
+        shifts[day] = shift
+
+        if day in self._coverage:
+            counters = self._coverage[day]
+            old_key, new_key = _coverage_key(old), _coverage_key(shift)
+            if old_key:
+                counters[old_key] -= 1
+            if new_key:
+                counters[new_key] += 1
+            self._check_coverage(day)
+
+        if employee == self.admin_id:
+            self._check_admin(day)
+            return
+
+        work = self._work_days[employee]
+        is_working = not is_rest_like(to_lat(shift))
+
+        idx = bisect_left(work, day)
+        was_working = idx < len(work) and work[idx] == day
+        if was_working and not is_working:
+            work.pop(idx)
+        elif is_working and not was_working:
+            insort(work, day)
+
+        self._employee_errors[employee].pop(day, None)
+        if is_working:
+            self._check_rotation(employee, day)
+
+        if was_working or is_working:
+            idx = bisect_left(work, day + 1)
+            if idx < len(work):
+                self._check_rotation(employee, work[idx])
+
+    def errors(self) -> List[ValidationError]:
+        result: List[ValidationError] = []
+
+        for employee in self._shifts:
+            found = self._employee_errors[employee]
+            if found:
+                result.extend(found[day] for day in sorted(found))
+
+        for day in self._days:
+            result.extend(self._coverage_errors.get(day, []))
+
+        return result
+
+    def blocking_errors(self) -> List[ValidationError]:
+        return [e for e in self.errors() if e[3] == ERROR_BLOCKING]
+
+    def _check_admin(self, day: int) -> None:
+        found = self._employee_errors[self.admin_id]
+        shift_lat = to_lat(self._shifts[self.admin_id][day])
+
+        if validate_admin_shift(self.weekdays[day], shift_lat):
+            found.pop(day, None)
+        else:
+            found[day] = (
+                self.admin_id, day,
+                "Администраторът не може да работи в този ден",
+                ERROR_SOFT,
+            )
+
+    def _check_rotation(self, employee: str, day: int) -> None:
+        work = self._work_days[employee]
+        idx = bisect_left(work, day)
+
+        if idx == 0:
+            prev_shift, days_since = None, 999
+        else:
+            prev_day = work[idx - 1]
+            prev_shift = to_lat(self._shifts[employee][prev_day])
+            days_since = day - prev_day
+
+        found = self._employee_errors[employee]
+        shift_lat = to_lat(self._shifts[employee][day])
+
+        if is_shift_allowed(prev_shift, days_since, shift_lat, self.crisis_mode):
+            found.pop(day, None)
+        else:
+            found[day] = (
+                employee, day,
+                f"Невалидна ротация след {prev_shift}",
+                ERROR_SOFT,
+            )
+
+    def _check_coverage(self, day: int) -> None:
+        coverage = self._coverage[day]
+        found: List[ValidationError] = []
+
+        if coverage["DAY"] == 0:
+            found.append(
+                ("ПОКРИТИЕ", day,
+                 "Липсва дневна смяна (Д или А)",
+                 ERROR_BLOCKING)
+            )
+
+        if coverage["В"] != 1:
+            found.append(
+                ("ПОКРИТИЕ", day,
+                 f"Вечерна смяна (В) = {coverage['В']}",
+                 ERROR_BLOCKING)
+            )
+
+        if coverage["Н"] != 1:
+            found.append(
+                ("ПОКРИТИЕ", day,
+                 f"Нощна смяна (Н) = {coverage['Н']}",
+                 ERROR_BLOCKING)
+            )
+
+        if found:
+            self._coverage_errors[day] = found
+        else:
+            self._coverage_errors.pop(day, None)
@@ -0,0 +1,87 @@
+"""
+    Per-employee workload counts for a month.
+
+    The counters are plain dicts keyed like the MonthlyWorkload fields, so
+    a month summary can be stored as one aggregate row and summed over
+    any month range without looking at the cells again.
+"""
+
+from typing import Dict, Iterable, Mapping
+
+from scheduler.logic.calendar_service import month_calendar
+
+
+COUNT_AS_WORKED = frozenset({"Д", "В", "Н", "А", "О", "Б"})
+WORK_SHIFTS = frozenset({"Д", "В", "Н", "А"})
+
+SHIFT_FIELDS = {
+    "Д": "day_shifts",
+    "В": "evening_shifts",
+    "Н": "night_shifts",
+    "А": "admin_shifts",
+    "О": "leave_days",
+    "Б": "sick_days",
+}
+
+COUNTER_FIELDS = (
+    "worked_days",
+    *SHIFT_FIELDS.values(),
+    "weekend_shifts",
+    "holiday_shifts",
+)
+
+
+def count_worked(emp_days: Mapping, days: Iterable) -> int:
+    """
+        Counts the days that count as worked (shifts, leave and sick days).
+    """
+
+    return sum(1 for d in days if emp_days.get(d, "") in COUNT_AS_WORKED)
+
+
+def empty_counters() -> Dict[str, int]:
+    return dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+def summarize_month(year: int, month: int, schedule: Mapping[str, Mapping]) -> Dict[str, Dict[str, int]]:
+    """
+        Returns {employee_id: counters} for a final (overrides applied)
+        schedule. Day keys may be strings or ints. Weekend and holiday
+        counters only count work shifts (Д, В, Н, А).
+    """
+
+    mc = month_calendar(year, month)
+    result = {}
+
+    for emp_id, days in schedule.items():
+        counters = empty_counters()
+
+        for day, shift in days.items():
+            field = SHIFT_FIELDS.get(shift)
+            if field is None:
+                continue
+
+            d = int(day)
+            if not 1 <= d <= mc.days:
+                continue
+
+            counters[field] += 1
+            counters["worked_days"] += 1
+
+            if shift in WORK_SHIFTS:
+                if mc.weekdays[d - 1] >= 5:
+                    counters["weekend_shifts"] += 1
+                if mc.is_holiday(d):
+                    counters["holiday_shifts"] += 1
+
+        result[str(emp_id)] = counters
+
+    return result
+
+
+def merge_counters(items: Iterable[Mapping[str, int]]) -> Dict[str, int]:
+    total = empty_counters()
+    for counters in items:
+        for field in COUNTER_FIELDS:
+            total[field] += counters.get(field, 0)
+    return total
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from scheduler.services.shift_assignment_service import ShiftAssignmentService
+from scheduler.services.workload_service import WorkloadService
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the tables derived from the stored months (e.g. for months saved before they existed)."
+
+    def handle(self, *args, **options):
+        months = ShiftAssignmentService.backfill()
+        self.stdout.write(f"ShiftAssignment: {len(months)} месеца")
+
+        months = WorkloadService.backfill()
+        self.stdout.write(f"MonthlyWorkload: {len(months)} месеца")
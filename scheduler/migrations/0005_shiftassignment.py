@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0004_monthadmin_delete_adminemployee'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShiftAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('shift', models.CharField(max_length=2)),
+                ('source', models.CharField(choices=[('schedule', 'Schedule'), ('override', 'Override')], default='schedule', max_length=16)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shift_assignments', to='scheduler.employee')),
+            ],
+            options={
+                'ordering': ['date', 'employee_id'],
+                'indexes': [models.Index(fields=['employee', 'shift', 'date'], name='shift_emp_shift_date_idx'), models.Index(fields=['date', 'shift'], name='shift_date_shift_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='shift_assignment_employee_date')],
+            },
+        ),
+    ]
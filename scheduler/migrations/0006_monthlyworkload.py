@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0005_shiftassignment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('worked_days', models.PositiveSmallIntegerField(default=0)),
+                ('day_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('evening_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('night_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('admin_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('leave_days', models.PositiveSmallIntegerField(default=0)),
+                ('sick_days', models.PositiveSmallIntegerField(default=0)),
+                ('weekend_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('holiday_shifts', models.PositiveSmallIntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_workloads', to='scheduler.employee')),
+            ],
+            options={
+                'ordering': ['year', 'month', 'employee_id'],
+                'indexes': [models.Index(fields=['year', 'month'], name='workload_year_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'year', 'month'), name='monthly_workload_employee_month')],
+            },
+        ),
+    ]
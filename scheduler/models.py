@@ -57,3 +57,77 @@ class MonthRecord(models.Model):
     @property
     def label(self) -> str:
         return f"{calendar.month_name[self.month]} {self.year}"
+
+
+class ShiftAssignment(models.Model):
+    """
+        One employee's shift on one date, derived from the month files.
+        Rebuilt per month on every save, so it is an index, never the
+        source of truth.
+    """
+
+    SOURCE_SCHEDULE = "schedule"
+    SOURCE_OVERRIDE = "override"
+    SOURCE_CHOICES = [
+        (SOURCE_SCHEDULE, "Schedule"),
+        (SOURCE_OVERRIDE, "Override"),
+    ]
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="shift_assignments"
+    )
+    date = models.DateField()
+    shift = models.CharField(max_length=2)
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, default=SOURCE_SCHEDULE)
+
+    class Meta:
+        ordering = ["date", "employee_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "date"], name="shift_assignment_employee_date"),
+        ]
+        indexes = [
+            models.Index(fields=["employee", "shift", "date"], name="shift_emp_shift_date_idx"),
+            models.Index(fields=["date", "shift"], name="shift_date_shift_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee_id} {self.date} {self.shift}"
+
+
+class MonthlyWorkload(models.Model):
+    """
+        Per-employee totals of one month, recomputed on every save of the
+        month. Range reports sum these rows instead of the daily cells.
+    """
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="monthly_workloads"
+    )
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+
+    worked_days = models.PositiveSmallIntegerField(default=0)
+    day_shifts = models.PositiveSmallIntegerField(default=0)
+    evening_shifts = models.PositiveSmallIntegerField(default=0)
+    night_shifts = models.PositiveSmallIntegerField(default=0)
+    admin_shifts = models.PositiveSmallIntegerField(default=0)
+    leave_days = models.PositiveSmallIntegerField(default=0)
+    sick_days = models.PositiveSmallIntegerField(default=0)
+    weekend_shifts = models.PositiveSmallIntegerField(default=0)
+    holiday_shifts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ["year", "month", "employee_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "year", "month"], name="monthly_workload_employee_month"),
+        ]
+        indexes = [
+            models.Index(fields=["year", "month"], name="workload_year_month_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.employee_id} {self.year}-{self.month:02d}"
@@ -0,0 +1,43 @@
+from scheduler.logic.generator.generator import (
+    generate_month_range,
+    save_generated_months,
+)
+from scheduler.logic.generator.leave_solver import DEFAULT_TIME_BUDGET
+from scheduler.models import Employee
+
+
+class GenerationService:
+    """
+    Batch generation of consecutive months:
+        - chains the cycle state in memory between months
+        - writes all month files and the cycle state once, at the end
+    """
+
+    @staticmethod
+    def generate_range(
+        start,
+        end,
+        employees=None,
+        mode="cycle",
+        leave_aware=False,
+        time_budget=DEFAULT_TIME_BUDGET,
+    ):
+        """
+        Generates and saves every month from start to end inclusive.
+        start/end are (year, month) tuples, mode is "cycle" or "balanced";
+        leave_aware keeps the entered leave as hard constraints.
+        Returns the generated months.
+        """
+
+        if employees is None:
+            employees = {
+                str(e.id): e.full_name
+                for e in Employee.objects.filter(is_active=True)
+            }
+
+        generated = generate_month_range(
+            start, end, employees, mode, leave_aware, time_budget
+        )
+        save_generated_months(generated)
+
+        return generated
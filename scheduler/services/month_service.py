@@ -1,6 +1,7 @@
 import json
 import os
 from django.conf import settings
+from scheduler.logic.month_manifest import MONTH_FILE_PATTERN
 from scheduler.models import MonthRecord
 
 
@@ -26,26 +27,24 @@ class MonthService:
         if record:
             return record.year, record.month, record.data
 
-        # fallback JSON
+        # fallback JSON: nothing keeps a manifest of this legacy
+        # directory current, so it is listed directly
         if not os.path.isdir(MonthService.DATA_DIR):
             return None
 
-        json_files = [
-            f for f in os.listdir(MonthService.DATA_DIR)
-            if f.endswith(".json")
-        ]
-        if not json_files:
+        names = [n for n in os.listdir(MonthService.DATA_DIR) if MONTH_FILE_PATTERN.match(n)]
+        if not names:
             return None
 
-        json_files.sort(reverse=True)
-        latest_file = json_files[0]
-        path = os.path.join(MonthService.DATA_DIR, latest_file)
+        name = max(names)
+        match = MONTH_FILE_PATTERN.match(name)
+        year, month = int(match.group(1)), int(match.group(2))
+        path = os.path.join(MonthService.DATA_DIR, name)
 
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        year, month = latest_file.replace(".json", "").split("-")
-        return int(year), int(month), data
+        return year, month, data
 
     @staticmethod
     def get_month(year: int, month: int):
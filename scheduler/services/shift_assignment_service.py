@@ -0,0 +1,179 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count
+
+from scheduler.logic.calendar_service import days_in_month
+from scheduler.logic.months_logic import replay_stored_months
+from scheduler.models import Employee, ShiftAssignment
+
+
+class ShiftAssignmentService:
+    """
+    Keeps the ShiftAssignment table in sync with the stored months and
+    answers per-employee / per-date questions with indexed queries:
+        - sync_month() rebuilds one month from its data (schedule + overrides)
+        - apply_overrides() upserts only the cells of appended overrides
+        - on_month_saved() is the months_logic save listener
+        - backfill() rebuilds every stored month
+        - shifts_for_employee(), coverage() query the table
+    """
+
+    @staticmethod
+    def build_rows(year: int, month: int, data: Dict[str, Any], employee_ids: set) -> list:
+        """
+            Returns unsaved ShiftAssignment rows for a month.
+            Empty cells, employees unknown to the DB and overrides of
+            employees that are not in the schedule are skipped.
+        """
+
+        days = days_in_month(year, month)
+        schedule = data.get("schedule", {}) or {}
+        overrides = {str(k): v for k, v in (data.get("overrides", {}) or {}).items()}
+
+        rows = []
+        for emp_key in schedule:
+            if not str(emp_key).isdigit() or int(emp_key) not in employee_ids:
+                continue
+
+            cells = {str(d): s for d, s in (schedule.get(emp_key) or {}).items()}
+            overridden = {str(d): s for d, s in (overrides.get(str(emp_key)) or {}).items()}
+            cells.update(overridden)
+
+            for day, shift in cells.items():
+                if not shift or not day.isdigit() or not 1 <= int(day) <= days:
+                    continue
+                rows.append(ShiftAssignment(
+                    employee_id=int(emp_key),
+                    date=date(year, month, int(day)),
+                    shift=shift,
+                    source=(
+                        ShiftAssignment.SOURCE_OVERRIDE if day in overridden
+                        else ShiftAssignment.SOURCE_SCHEDULE
+                    ),
+                ))
+
+        return rows
+
+    @staticmethod
+    def sync_month(year: int, month: int, data: Dict[str, Any]) -> int:
+        """
+            Replaces the month's rows in one transaction.
+            Returns the number of rows written.
+        """
+
+        first = date(year, month, 1)
+        last = date(year, month, days_in_month(year, month))
+
+        ids = [int(k) for k in data.get("schedule", {}) or {} if str(k).isdigit()]
+        employee_ids = set(Employee.objects.filter(id__in=ids).values_list("id", flat=True))
+
+        rows = ShiftAssignmentService.build_rows(year, month, data, employee_ids)
+
+        with transaction.atomic():
+            ShiftAssignment.objects.filter(date__range=(first, last)).delete()
+            ShiftAssignment.objects.bulk_create(rows, batch_size=1000)
+
+        return len(rows)
+
+    @staticmethod
+    def apply_overrides(year: int, month: int, records: Iterable[Tuple[str, str, str]]) -> int:
+        """
+            Applies appended (employee_id, day, shift) overrides cell by cell:
+            a shift is upserted as an override row, an empty one removes
+            the row. Returns the number of touched cells.
+        """
+
+        days = days_in_month(year, month)
+        cells: Dict[Tuple[int, int], str] = {}
+        for emp_id, day, shift in records:
+            emp_id, day = str(emp_id), str(day)
+            if emp_id.isdigit() and day.isdigit() and 1 <= int(day) <= days:
+                cells[(int(emp_id), int(day))] = shift
+
+        known = set(
+            Employee.objects
+            .filter(id__in={emp_id for emp_id, _ in cells})
+            .values_list("id", flat=True)
+        )
+        cells = {key: shift for key, shift in cells.items() if key[0] in known}
+
+        upserts = [
+            ShiftAssignment(
+                employee_id=emp_id,
+                date=date(year, month, day),
+                shift=shift,
+                source=ShiftAssignment.SOURCE_OVERRIDE,
+            )
+            for (emp_id, day), shift in cells.items()
+            if shift
+        ]
+        cleared = [key for key, shift in cells.items() if not shift]
+
+        with transaction.atomic():
+            if upserts:
+                ShiftAssignment.objects.bulk_create(
+                    upserts,
+                    update_conflicts=True,
+                    unique_fields=["employee", "date"],
+                    update_fields=["shift", "source"],
+                )
+            for emp_id, day in cleared:
+                ShiftAssignment.objects.filter(employee_id=emp_id, date=date(year, month, day)).delete()
+
+        return len(cells)
+
+    @staticmethod
+    def on_month_saved(
+        year: int,
+        month: int,
+        data: Optional[Dict[str, Any]],
+        records: Optional[List[Tuple[str, str, str]]] = None,
+    ):
+        """
+            months_logic save listener. A whole-month save rebuilds the
+            month; an override append only touches the appended cells.
+        """
+
+        if data is None:
+            ShiftAssignmentService.apply_overrides(year, month, records or [])
+        else:
+            ShiftAssignmentService.sync_month(year, month, data)
+
+    @staticmethod
+    def backfill(months: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[int, int]]:
+        """
+            Rebuilds the rows of every stored month (or of the given
+            months), e.g. for months saved before the table existed.
+        """
+
+        return replay_stored_months(ShiftAssignmentService.on_month_saved, months)
+
+    @staticmethod
+    def shifts_for_employee(employee_id: int, year: int, shift: Optional[str] = None):
+        qs = ShiftAssignment.objects.filter(
+            employee_id=employee_id,
+            date__range=(date(year, 1, 1), date(year, 12, 31)),
+        )
+        if shift is not None:
+            qs = qs.filter(shift=shift)
+        return qs.order_by("date")
+
+    @staticmethod
+    def coverage(start: date, end: date) -> Dict[date, Dict[str, int]]:
+        """
+            Returns {date: {shift: employees}} for the date range.
+        """
+
+        result: Dict[date, Dict[str, int]] = {}
+        rows = (
+            ShiftAssignment.objects
+            .filter(date__range=(start, end))
+            .values("date", "shift")
+            .annotate(count=Count("id"))
+            .order_by("date", "shift")
+        )
+        for row in rows:
+            result.setdefault(row["date"], {})[row["shift"]] = row["count"]
+        return result
@@ -0,0 +1,180 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from scheduler.logic.calendar_service import days_in_month
+from scheduler.logic.months_logic import replay_stored_months
+from scheduler.logic.workload import COUNTER_FIELDS, SHIFT_FIELDS, summarize_month
+from scheduler.models import Employee, MonthlyWorkload, ShiftAssignment
+
+
+YearMonth = Tuple[int, int]
+
+
+class WorkloadService:
+    """
+    Maintains the MonthlyWorkload aggregates and answers range reports:
+        - sync_month() recomputes one month's rows from its data
+        - update_employees() recomputes the rows of some employees from
+          their ShiftAssignment rows
+        - on_month_saved() is the months_logic save listener
+        - backfill() recomputes every stored month
+        - summary() sums the monthly rows over a month range, so a
+          year-to-date report reads at most 12 rows per employee
+    """
+
+    @staticmethod
+    def final_schedule(data: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+        """
+            Returns the schedule with the overrides folded in (copied).
+            Overrides of employees that are not in the schedule are
+            ignored, like in the shown and exported schedule.
+        """
+
+        schedule = {
+            str(emp_id): {str(d): s for d, s in (days or {}).items()}
+            for emp_id, days in (data.get("schedule", {}) or {}).items()
+        }
+        for emp_id, days in (data.get("overrides", {}) or {}).items():
+            cells = schedule.get(str(emp_id))
+            if cells is None:
+                continue
+            for day, shift in (days or {}).items():
+                cells[str(day)] = shift
+        return schedule
+
+    @staticmethod
+    def sync_month(year: int, month: int, data: Dict[str, Any]) -> int:
+        """
+            Replaces the month's aggregate rows in one transaction.
+            Employees unknown to the DB are skipped.
+            Returns the number of rows written.
+        """
+
+        summary = summarize_month(year, month, WorkloadService.final_schedule(data))
+        ids = [int(k) for k in summary if k.isdigit()]
+        known = set(Employee.objects.filter(id__in=ids).values_list("id", flat=True))
+
+        rows = [
+            MonthlyWorkload(employee_id=int(emp_id), year=year, month=month, **counters)
+            for emp_id, counters in summary.items()
+            if emp_id.isdigit() and int(emp_id) in known
+        ]
+
+        with transaction.atomic():
+            MonthlyWorkload.objects.filter(year=year, month=month).delete()
+            MonthlyWorkload.objects.bulk_create(rows, batch_size=1000)
+
+        return len(rows)
+
+    @staticmethod
+    def update_employees(year: int, month: int, employee_ids: Iterable[str]) -> int:
+        """
+            Recomputes the existing rows of the given employees from their
+            ShiftAssignment rows of the month, so an override append costs
+            a few indexed queries instead of a month read. Employees without
+            a row (not in the month schedule or unknown to the DB) are skipped.
+            Returns the number of rows written.
+        """
+
+        wanted = {int(e) for e in map(str, employee_ids) if e.isdigit()}
+        existing = set(
+            MonthlyWorkload.objects
+            .filter(year=year, month=month, employee_id__in=wanted)
+            .values_list("employee_id", flat=True)
+        )
+        if not existing:
+            return 0
+
+        schedule: Dict[str, Dict[int, str]] = {str(emp_id): {} for emp_id in existing}
+        cells = ShiftAssignment.objects.filter(
+            employee_id__in=existing,
+            date__range=(date(year, month, 1), date(year, month, days_in_month(year, month))),
+        ).values_list("employee_id", "date", "shift")
+        for emp_id, day, shift in cells:
+            schedule[str(emp_id)][day.day] = shift
+
+        rows = [
+            MonthlyWorkload(employee_id=int(emp_id), year=year, month=month, **counters)
+            for emp_id, counters in summarize_month(year, month, schedule).items()
+        ]
+        MonthlyWorkload.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["employee", "year", "month"],
+            update_fields=list(COUNTER_FIELDS),
+        )
+        return len(rows)
+
+    @staticmethod
+    def on_month_saved(
+        year: int,
+        month: int,
+        data: Optional[Dict[str, Any]],
+        records: Optional[List[Tuple[str, str, str]]] = None,
+    ):
+        """
+            months_logic save listener. An override append only updates
+            the rows of the employees it touched; it relies on
+            ShiftAssignmentService.on_month_saved running first (see apps.py).
+        """
+
+        if data is not None:
+            WorkloadService.sync_month(year, month, data)
+            return
+
+        touched = {str(emp_id) for emp_id, _, _ in records or []}
+        if touched:
+            WorkloadService.update_employees(year, month, touched)
+
+    @staticmethod
+    def backfill(months: Optional[List[YearMonth]] = None) -> List[YearMonth]:
+        return replay_stored_months(WorkloadService.on_month_saved, months)
+
+    @staticmethod
+    def range_filter(start: YearMonth, end: YearMonth) -> Q:
+        (sy, sm), (ey, em) = start, end
+        after_start = Q(year__gt=sy) | Q(year=sy, month__gte=sm)
+        before_end = Q(year__lt=ey) | Q(year=ey, month__lte=em)
+        return after_start & before_end
+
+    @staticmethod
+    def summary(
+        start: YearMonth,
+        end: YearMonth,
+        employee_ids: Optional[Iterable[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+            Returns per-employee totals for the months start..end (inclusive),
+            ordered by name: worked days, shifts by code, weekend, holiday
+            and night shifts and the number of months counted.
+        """
+
+        if start > end:
+            raise ValueError("Началният месец е след крайния.")
+
+        qs = MonthlyWorkload.objects.filter(WorkloadService.range_filter(start, end))
+        if employee_ids is not None:
+            qs = qs.filter(employee_id__in=list(employee_ids))
+
+        rows = (
+            qs.values("employee_id", "employee__full_name")
+            .annotate(**{f"total_{f}": Sum(f) for f in COUNTER_FIELDS})
+            .order_by("employee__full_name")
+        )
+
+        result = []
+        for row in rows:
+            totals = {f: row[f"total_{f}"] or 0 for f in COUNTER_FIELDS}
+            result.append({
+                "employee_id": row["employee_id"],
+                "full_name": row["employee__full_name"],
+                "worked_days": totals["worked_days"],
+                "shifts": {code: totals[field] for code, field in SHIFT_FIELDS.items()},
+                "nights": totals["night_shifts"],
+                "weekend_shifts": totals["weekend_shifts"],
+                "holiday_shifts": totals["holiday_shifts"],
+            })
+        return result
@@ -3,7 +3,7 @@ from scheduler.logic.json_help_functions import (
     _load_json,
     _save_json_with_lock,
 )
-from scheduler.logic.months_logic import get_month_path
+from scheduler.logic.months_logic import delete_month
 
 
 
@@ -30,6 +30,4 @@ def save_employees(data: list[dict]) -> None:
 
 
 def clear_month_data(year: int, month: int) -> None:
-    path = get_month_path(year, month)
-    if path.exists():
-        path.unlink()
+    delete_month(year, month)
@@ -0,0 +1,77 @@
+from datetime import date
+
+from scheduler.logic import cycle_state
+from scheduler.logic.generator.balance import initial_balance
+from scheduler.logic.generator.generator import build_month_schedule
+
+
+WORKERS = [str(i) for i in range(2, 10)]
+
+
+def _run_year(mode):
+    state = {}
+    totals = {w: {"shifts": 0, "nights": 0, "weekends": 0} for w in WORKERS}
+
+    for month in range(1, 13):
+        built = build_month_schedule(2026, month, WORKERS, "1", state, set(), mode)
+        state = built["final_cycle_state"]
+
+        for w in WORKERS:
+            for day, shift in built["schedule"][w].items():
+                if not shift:
+                    continue
+                totals[w]["shifts"] += 1
+                totals[w]["nights"] += shift == "Н"
+                totals[w]["weekends"] += date(2026, month, int(day)).weekday() >= 5
+
+    return totals, state
+
+
+def _spread(totals, key):
+    values = [t[key] for t in totals.values()]
+    return max(values) - min(values)
+
+
+def test_balanced_mode_evens_out_the_load():
+    cycle_totals, _ = _run_year("cycle")
+    balanced_totals, state = _run_year("balanced")
+
+    for key in ("shifts", "nights", "weekends"):
+        assert _spread(balanced_totals, key) <= 3
+        assert _spread(balanced_totals, key) < _spread(cycle_totals, key)
+
+    # the carried counters are the year totals
+    for w in WORKERS:
+        assert state[w]["balance"]["shifts"] == balanced_totals[w]["shifts"]
+        assert state[w]["balance"]["nights"] == balanced_totals[w]["nights"]
+
+
+def test_balanced_mode_keeps_the_coverage():
+    built = build_month_schedule(2026, 3, WORKERS, "1", {}, {3}, "balanced")
+
+    assert built["warnings"] == []
+    for day in map(str, range(1, 32)):
+        shifts = sorted(built["schedule"][w][day] for w in WORKERS if built["schedule"][w][day])
+        assert shifts == ["В", "Д", "Д", "Н"]
+
+
+def test_newcomers_start_at_the_lowest_counters():
+    state = {
+        "2": {"cycle_index": 0, "balance": {"shifts": 10, "nights": 4, "weekends": 3, "holidays": 1}},
+        "3": {"cycle_index": 4, "balance": {"shifts": 12, "nights": 2, "weekends": 5, "holidays": 0}},
+    }
+
+    balance = initial_balance(["2", "3", "4"], state)
+
+    assert balance[2] == {"shifts": 10, "nights": 2, "weekends": 3, "holidays": 0}
+
+
+def test_cycle_state_persists_the_balance(tmp_path, monkeypatch):
+    monkeypatch.setattr(cycle_state, "LAST_CYCLE_FILE", tmp_path / "last_cycle_state.json")
+
+    cycle_state.save_last_cycle_state(
+        {"2": {"cycle_index": 3, "balance": {"shifts": 5, "nights": 1, "weekends": 2, "holidays": 0}}},
+        date(2026, 1, 31),
+    )
+
+    assert cycle_state.load_last_cycle_state()["2"]["balance"]["shifts"] == 5
@@ -151,3 +151,44 @@ def test_strict_false_does_not_crash_on_missing(monkeypatch, employees_ok):
     generate_new_month(2025, 1, employees_ok, strict=False)
 
 
+def test_generate_month_range_chains_cycle_state(
+    employees_ok,
+    month_data_with_admin,
+    no_last_cycle,
+    no_holidays,
+    monkeypatch
+):
+    from scheduler.logic.generator.generator import generate_month_range
+
+    saved = []
+    monkeypatch.setattr(
+        "scheduler.logic.generator.generator.save_last_cycle_state",
+        lambda *a: saved.append(a)
+    )
+
+    result = generate_month_range((2025, 11), (2026, 2), employees_ok)
+
+    assert [(m["year"], m["month"]) for m in result] == [
+        (2025, 11), (2025, 12), (2026, 1), (2026, 2)
+    ]
+    assert saved == []
+
+    for prev, nxt in zip(result, result[1:]):
+        for emp_id, info in prev["final_cycle_state"].items():
+            start = nxt["final_cycle_state"][emp_id]["cycle_index"]
+            days_next = calendar.monthrange(nxt["year"], nxt["month"])[1]
+            assert start == (info["cycle_index"] + days_next) % 16
+
+
+def test_generate_month_range_rejects_locked_month(employees_ok, no_last_cycle, monkeypatch):
+    from scheduler.logic.generator.generator import generate_month_range
+
+    monkeypatch.setattr(
+        "scheduler.logic.generator.generator.load_month",
+        lambda y, m: {"month_admin_id": "1", "ui_locked": m == 2}
+    )
+
+    with pytest.raises(RuntimeError, match="заключен"):
+        generate_month_range((2025, 1), (2025, 3), employees_ok)
+
+
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from scheduler.logic.calendar_service import weekday_map
+from scheduler.logic.generator.generator import build_month_schedule, generate_new_month
+from scheduler.logic.generator.leave_solver import (
+    complete_with_leaves,
+    coverage_holes,
+    expand_leave_intervals,
+    normalize_leaves,
+)
+from scheduler.logic.validators.validators import ERROR_BLOCKING, validate_month
+
+
+WORKERS = [str(i) for i in range(2, 10)]
+
+AUGUST_LEAVE = [
+    ("2", date(2026, 7, 20), date(2026, 8, 14), "О"),
+    ("3", date(2026, 8, 10), date(2026, 8, 24), "O"),
+    ("4", date(2026, 8, 20), date(2026, 9, 10), "B"),
+    ("1", date(2026, 8, 3), date(2026, 8, 7), "О"),
+]
+
+
+def _blocking(schedule, year, month):
+    return [
+        e for e in validate_month(schedule, False, weekday_map(year, month), "1")
+        if e[3] == ERROR_BLOCKING
+    ]
+
+
+def test_expand_leave_intervals_clips_to_the_month():
+    leaves = expand_leave_intervals(2026, 8, AUGUST_LEAVE)
+
+    assert sorted(leaves["2"]) == list(range(1, 15))
+    assert sorted(leaves["4"]) == list(range(20, 32))
+    assert set(leaves["3"].values()) == {"О"}
+    assert set(leaves["4"].values()) == {"Б"}
+
+
+def test_normalize_leaves_rejects_unknown_codes():
+    with pytest.raises(ValueError, match="Невалиден код"):
+        normalize_leaves({"2": {1: "Д"}}, 31)
+
+
+def test_leave_heavy_month_comes_out_complete():
+    built = build_month_schedule(2026, 8, WORKERS, "1", {}, set(), "cycle")
+    leaves = expand_leave_intervals(2026, 8, AUGUST_LEAVE)
+
+    result = complete_with_leaves(built, 2026, 8, "1", leaves, time_budget=5.0)
+
+    assert result["solver"]["complete"]
+    assert result["warnings"] == []
+    assert _blocking(result["schedule"], 2026, 8) == []
+
+    for emp_id, cells in leaves.items():
+        for day, code in cells.items():
+            assert result["schedule"][emp_id][str(day)] == code
+            assert result["overrides"][emp_id][str(day)] == code
+
+
+def test_unfillable_holes_are_reported():
+    workers = WORKERS[:4]
+    built = build_month_schedule(2026, 8, workers, "1", {}, set(), "cycle")
+    leaves = {w: {d: "О" for d in range(1, 11)} for w in workers[:3]}
+
+    result = complete_with_leaves(built, 2026, 8, "1", leaves, time_budget=1.0)
+
+    assert not result["solver"]["complete"]
+    missing_days = {w["day"] for w in result["warnings"]}
+    assert missing_days and missing_days <= set(range(1, 11))
+    assert {d for d, _ in coverage_holes(result["schedule"], 31)} == missing_days
+
+
+def test_generate_new_month_keeps_entered_leave(monkeypatch):
+    month = {
+        "month_admin_id": "1",
+        "overrides": {"2": {"5": "О", "6": "О"}, "3": {"5": "Д"}},
+    }
+    monkeypatch.setattr("scheduler.logic.generator.generator.load_month", lambda y, m: month)
+    monkeypatch.setattr("scheduler.logic.generator.generator.load_last_cycle_state", lambda: {})
+    monkeypatch.setattr("scheduler.logic.generator.generator.save_last_cycle_state", lambda *a: None)
+
+    employees = {"1": "Admin", **{w: f"Emp {w}" for w in WORKERS}}
+    result = generate_new_month(2026, 8, employees, leave_aware=True, time_budget=2.0)
+
+    assert result["schedule"]["2"]["5"] == "О"
+    assert result["overrides"] == {"2": {"5": "О", "6": "О"}}
+    assert _blocking(result["schedule"], 2026, 8) == []
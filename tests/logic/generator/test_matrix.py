@@ -0,0 +1,56 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.legacy_generator import legacy_build_month_schedule
+from scheduler.logic.generator.generator import build_month_schedule
+from scheduler.logic.generator.matrix import (
+    CYCLE_LEN,
+    cycle_matrix,
+    cycle_start_offsets,
+)
+
+
+
+
+def test_cycle_start_offsets_defaults_and_state():
+    workers = ["2", "3", "4", "5", "6"]
+    state = {"3": {"cycle_index": 18}}
+
+    assert cycle_start_offsets(workers, state) == [0, 2, 8, 12, 0]
+
+
+def test_cycle_matrix_is_modular():
+    offsets = [0, 5, 15]
+    matrix = cycle_matrix(offsets, 40)
+
+    assert len(matrix) == 40
+    for day, row in enumerate(matrix):
+        assert row == tuple((o + day) % CYCLE_LEN for o in offsets)
+
+
+@pytest.mark.parametrize("workers_count", [4, 5, 7, 16, 60])
+def test_matrix_engine_matches_legacy_loop(workers_count):
+    rng = random.Random(workers_count)
+    workers = [str(i) for i in range(2, workers_count + 2)]
+
+    state = {}
+    for year in (2025, 2026):
+        for month in range(1, 13):
+            if rng.random() < 0.3:
+                state = {
+                    w: {"cycle_index": rng.randrange(CYCLE_LEN)}
+                    for w in workers if rng.random() < 0.7
+                }
+
+            holidays = set(rng.sample(range(1, 29), 3))
+            args = (year, month, workers, "1", state, holidays)
+
+            expected = legacy_build_month_schedule(*args)
+            result = build_month_schedule(*args)
+
+            assert json.dumps(result, ensure_ascii=False, indent=2) == \
+                json.dumps(expected, ensure_ascii=False, indent=2)
+
+            state = result["final_cycle_state"]
@@ -0,0 +1,98 @@
+import calendar
+import itertools
+import random
+
+import pytest
+
+from scheduler.logic.repair.matching import (
+    _min_cost_assignment,
+    plan_optimal_repair,
+)
+from scheduler.logic.repair.repair_engine import apply_repair, find_missing_shifts
+from scheduler.logic.validators.validators import validate_month
+
+
+def _weekdays(year, month):
+    days = calendar.monthrange(year, month)[1]
+    return {d: calendar.weekday(year, month, d) for d in range(1, days + 1)}
+
+
+def _rotation_violations(schedule, year, month):
+    errors = validate_month(schedule, False, _weekdays(year, month), "-")
+    return {(e[0], e[1]) for e in errors if e[0] != "ПОКРИТИЕ"}
+
+
+def _sparse_schedule(rng, employees, year, month):
+    days = calendar.monthrange(year, month)[1]
+    return {
+        f"emp{e}": {
+            str(d): rng.choice(["", "", "", "", "Д", "В", "Н"])
+            for d in range(1, days + 1)
+        }
+        for e in range(employees)
+    }
+
+
+def test_min_cost_assignment_is_optimal():
+    rng = random.Random(5)
+
+    for _ in range(50):
+        n = rng.randint(1, 4)
+        m = rng.randint(n, 6)
+        cost = [[rng.randint(0, 20) for _ in range(m)] for _ in range(n)]
+
+        chosen = _min_cost_assignment(cost)
+        best = min(
+            sum(cost[i][c] for i, c in enumerate(perm))
+            for perm in itertools.permutations(range(m), n)
+        )
+
+        assert len(set(chosen)) == n
+        assert sum(cost[i][c] for i, c in enumerate(chosen)) == best
+
+
+def test_optimal_repair_creates_no_new_rotation_violations():
+    rng = random.Random(2)
+
+    for employees in (6, 15, 40):
+        schedule = _sparse_schedule(rng, employees, 2026, 5)
+        before = _rotation_violations(schedule, 2026, 5)
+
+        repaired = apply_repair(schedule, 2026, 5, set(), {"emp0"}, mode="optimal")
+
+        assert _rotation_violations(repaired, 2026, 5) <= before
+        assert sum(map(len, find_missing_shifts(repaired, 2026, 5, set()).values())) <= \
+            sum(map(len, find_missing_shifts(schedule, 2026, 5, set()).values()))
+
+
+def test_optimal_repair_reports_unfilled_shifts():
+    schedule = {
+        "a": {"1": "Н", "2": ""},
+        "b": {"1": "В", "2": ""},
+    }
+
+    assignments, unfilled = plan_optimal_repair(schedule, 2026, 8, set(), set())
+
+    assert ("b", 2, "Д") in assignments
+    assert "Н" in unfilled[2]
+    assert ("a", 2, "В") in assignments
+
+
+def test_optimal_repair_fills_a_200_employee_month():
+    rng = random.Random(9)
+    schedule = _sparse_schedule(rng, 200, 2026, 1)
+    original = {emp: dict(days) for emp, days in schedule.items()}
+
+    repaired = apply_repair(schedule, 2026, 1, {1}, {"emp0", "emp1"}, mode="optimal")
+
+    # only the two administrators can cover "А"; every work shift is filled
+    assert schedule == original
+    assert all(
+        shifts == ["А"]
+        for shifts in find_missing_shifts(repaired, 2026, 1, {1}).values()
+    )
+
+
+def test_unknown_repair_mode_raises():
+    with pytest.raises(ValueError):
+        apply_repair({"a": {"1": ""}}, 2026, 1, set(), set(), mode="magic")
@@ -0,0 +1,91 @@
+import calendar
+import random
+
+from scheduler.logic.repair.repair_engine import (
+    SHIFT_ADMIN,
+    SHIFT_WORK,
+    RepairContext,
+    apply_repair,
+    find_missing_shifts,
+    find_replacement,
+)
+
+
+def _reference_missing(schedule, year, month, holidays):
+    missing = {}
+    days = sorted(int(d) for d in next(iter(schedule.values())).keys())
+
+    for day in days:
+        used = set()
+        for data in schedule.values():
+            if data.get(str(day)) in SHIFT_WORK:
+                used.add(data[str(day)])
+
+        need = [s for s in SHIFT_WORK if s not in used]
+
+        if calendar.weekday(year, month, day) < 5 and day not in holidays:
+            if SHIFT_ADMIN not in {data.get(str(day)) for data in schedule.values()}:
+                need.append(SHIFT_ADMIN)
+
+        if need:
+            missing[day] = need
+
+    return missing
+
+
+def _reference_repair(schedule, year, month, holidays, admins):
+    new_schedule = {name: days.copy() for name, days in schedule.items()}
+
+    for day, shifts in _reference_missing(new_schedule, year, month, holidays).items():
+        for shift in shifts:
+            name = find_replacement(new_schedule, day, shift, admins)
+            if name:
+                new_schedule[name][str(day)] = shift
+
+    return new_schedule
+
+
+def _random_schedule(rng, employees, days):
+    choices = ["", "", "", "Д", "В", "Н", "А", "O", "B"]
+    return {
+        f"emp{e}": {str(d): rng.choice(choices) for d in range(1, days + 1)}
+        for e in range(employees)
+    }
+
+
+def test_context_matches_reference_scan():
+    rng = random.Random(3)
+
+    for employees in (1, 3, 8, 20):
+        schedule = _random_schedule(rng, employees, 30)
+        holidays = {1, 14}
+
+        assert find_missing_shifts(schedule, 2026, 4, holidays) == \
+            _reference_missing(schedule, 2026, 4, holidays)
+
+
+def test_apply_repair_matches_reference():
+    rng = random.Random(11)
+
+    for employees in (2, 5, 12, 40):
+        schedule = _random_schedule(rng, employees, 31)
+        admins = {f"emp{e}" for e in range(employees) if e % 3 == 0}
+
+        assert apply_repair(schedule, 2026, 3, {3}, admins) == \
+            _reference_repair(schedule, 2026, 3, {3}, admins)
+
+
+def test_assign_updates_indexes():
+    schedule = {
+        "a": {"1": "", "2": "Д"},
+        "b": {"1": "", "2": ""},
+    }
+    context = RepairContext(schedule, 2026, 6, set())
+
+    assert context.find_replacement(1, "Н", set()) == "a"
+    context.assign("a", 1, "Н")
+
+    assert schedule["a"]["1"] == "Н"
+    assert context.find_replacement(1, "В", set()) == "b"
+    assert context.find_replacement(1, SHIFT_ADMIN, {"a"}) is None
+    assert "Н" in context.used[1]
@@ -0,0 +1,77 @@
+import calendar
+from datetime import date, timedelta
+
+from scheduler.logic import calendar_service
+from scheduler.logic.calendar_service import (
+    count_working_days,
+    get_holidays_for_month,
+    iter_days,
+    month_calendar,
+    month_info,
+    orthodox_easter,
+    weekday_map,
+)
+
+
+def _reference_holidays(year, month):
+    days = [d for m, d in calendar_service.FIXED_HOLIDAYS if m == month]
+    days += [d.day for d in calendar_service.easter_holidays(year) if d.month == month]
+    return sorted(days)
+
+
+def test_orthodox_easter_known_dates():
+    assert orthodox_easter(2024) == date(2024, 5, 5)
+    assert orthodox_easter(2025) == date(2025, 4, 20)
+    assert orthodox_easter(2026) == date(2026, 4, 12)
+
+
+def test_month_tables_match_calendar_module():
+    for year in range(1999, 2041):
+        for month in range(1, 13):
+            days = calendar.monthrange(year, month)[1]
+            mc = month_calendar(year, month)
+            holidays = _reference_holidays(year, month)
+
+            assert mc.days == days
+            assert weekday_map(year, month) == {
+                d: calendar.weekday(year, month, d) for d in range(1, days + 1)
+            }
+            assert get_holidays_for_month(year, month) == holidays
+            assert month_info(year, month) == {
+                "year": year,
+                "month": month,
+                "days": days,
+                "weekends": [d for d in range(1, days + 1) if calendar.weekday(year, month, d) >= 5],
+                "holidays": holidays,
+            }
+            for d in range(1, days + 1):
+                working = calendar.weekday(year, month, d) < 5 and d not in holidays
+                assert mc.is_working_day(d) is working
+                assert mc.is_holiday(d) is (d in holidays)
+
+
+def test_holiday_list_is_a_copy():
+    get_holidays_for_month(2026, 1).append(99)
+    assert get_holidays_for_month(2026, 1) == [1]
+
+
+def test_range_queries_cross_years():
+    start, end = date(2025, 12, 20), date(2027, 1, 10)
+
+    days = list(iter_days(start, end))
+    assert days[0].date == start
+    assert days[-1].date == end
+    assert len(days) == (end - start).days + 1
+
+    expected = 0
+    current = start
+    while current <= end:
+        info = days[(current - start).days]
+        holidays = _reference_holidays(current.year, current.month)
+        assert info.weekday == current.weekday()
+        assert info.holiday is (current.day in holidays)
+        expected += current.weekday() < 5 and current.day not in holidays
+        current += timedelta(days=1)
+
+    assert count_working_days(start, end) == expected
+    assert count_working_days(date(2026, 5, 6), date(2026, 5, 6)) == 0
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from scheduler.logic.calendar_service import weekday_map
+from scheduler.logic.compact import MISSING, CompactSchedule, Shift, month_to_compact
+from scheduler.logic.generator.compact import build_compact_month
+from scheduler.logic.generator.generator import build_month_schedule
+from scheduler.logic.repair.compact import apply_compact_repair, find_missing_compact
+from scheduler.logic.repair.repair_engine import apply_repair, find_missing_shifts
+from scheduler.logic.validators.compact import validate_compact
+from scheduler.logic.validators.validators import validate_month
+
+
+SHIFTS = ["", "", "Д", "Д", "В", "Н", "А", "О", "Б"]
+
+
+def _random_schedule(seed, employees=12, days=30):
+    rng = random.Random(seed)
+    return {
+        str(e): {str(d): rng.choice(SHIFTS) for d in range(1, days + 1)}
+        for e in range(1, employees + 1)
+    }
+
+
+def test_json_round_trip_is_lossless():
+    schedule = {
+        "1": {"1": "Д", "2": "", "3": "П"},
+        "2": {"2": "Н", "3": "x"},
+        "3": {},
+    }
+
+    compact = CompactSchedule.from_json(schedule, 3)
+
+    assert compact.to_json() == schedule
+    assert compact.row("2")[0] == MISSING
+    assert compact.row("1")[0] == Shift.D
+    assert compact.get("1", 3) == "П"
+    assert compact.nbytes == 9
+
+
+def test_from_json_rejects_days_outside_the_month():
+    with pytest.raises(ValueError):
+        CompactSchedule.from_json({"1": {"32": "Д"}}, 31)
+
+
+def test_decode_rejects_unknown_codes():
+    compact = CompactSchedule.from_json({"1": {"1": "П"}}, 1)
+
+    assert compact.decode(compact.encode("П")) == "П"
+    assert compact.decode(MISSING) is None
+    for code in (7, 15, compact.encode("П") + 1, -1):
+        with pytest.raises(ValueError):
+            compact.decode(code)
+
+
+def test_month_to_compact_folds_overrides():
+    data = {
+        "year": 2026,
+        "month": 2,
+        "schedule": {"1": {"1": "Д", "2": "В"}},
+        "overrides": {"1": {"2": "О"}, "9": {"1": "Д"}},
+    }
+
+    compact = month_to_compact(data)
+
+    assert compact.days == 28
+    assert compact.get("1", 2) == "О"
+    assert "9" not in compact
+
+
+@pytest.mark.parametrize("mode", ["cycle", "balanced"])
+def test_compact_generator_matches_dict_generator(mode):
+    workers = [str(i) for i in range(2, 11)]
+    state = {}
+
+    for month in range(1, 13):
+        expected = build_month_schedule(2026, month, workers, "1", state, {1}, mode)
+        result = build_compact_month(2026, month, workers, "1", state, {1}, mode)
+
+        assert result["schedule"].to_json() == expected["schedule"]
+        assert result["warnings"] == expected["warnings"]
+        assert result["final_cycle_state"] == expected["final_cycle_state"]
+        state = expected["final_cycle_state"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compact_validator_matches_validate_month(seed):
+    schedule = _random_schedule(seed)
+    weekdays = weekday_map(2026, 4)
+
+    for crisis_mode in (False, True):
+        assert validate_compact(CompactSchedule.from_json(schedule, 30), crisis_mode, weekdays, "1") == \
+            validate_month(schedule, crisis_mode, weekdays, "1")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compact_repair_matches_apply_repair(seed):
+    schedule = _random_schedule(seed)
+    compact = CompactSchedule.from_json(schedule, 30)
+    admins = {"1", "2"}
+
+    assert find_missing_compact(compact, 2026, 4, {6}) == find_missing_shifts(schedule, 2026, 4, {6})
+
+    repaired = apply_compact_repair(compact, 2026, 4, {6}, admins)
+    assert repaired.to_json() == apply_repair(schedule, 2026, 4, {6}, admins)
+    assert compact.to_json() == schedule
@@ -43,3 +43,90 @@ def test_save_json_creates_backup_if_exists(tmp_path):
 
     data = json.loads(p.read_text(encoding="utf-8"))
     assert data == {"new": 2}
+
+
+def _make_backup(path, stamp, content="{}"):
+    backup = path.with_name(f"{path.name}.bak-{stamp}")
+    backup.write_text(content, encoding="utf-8")
+    return backup
+
+
+def test_compact_backups_applies_retention_and_archives(tmp_path):
+    import zipfile
+    from scheduler.logic.json_help_functions import BackupPolicy, compact_backups
+
+    p = tmp_path / "2026-01.json"
+    p.write_text("{}", encoding="utf-8")
+
+    stamps = [
+        "20260110-120000", "20260110-110000", "20260110-100000",
+        "20260109-100000", "20251201-100000", "20251101-100000",
+    ]
+    for stamp in stamps:
+        _make_backup(p, stamp)
+
+    policy = BackupPolicy(keep_last=2, keep_daily=2, keep_monthly=2, max_bytes=None)
+    removed = compact_backups(p, policy)
+
+    left = sorted(x.name.split(".bak-")[1] for x in tmp_path.glob("2026-01.json.bak-*"))
+    assert left == ["20251201-100000", "20260109-100000", "20260110-110000", "20260110-120000"]
+    assert removed == 2
+
+    with zipfile.ZipFile(tmp_path / "backups" / "2026-01.json.bak.zip") as zf:
+        assert sorted(zf.namelist()) == [
+            "2026-01.json.bak-20251101-100000",
+            "2026-01.json.bak-20260110-100000",
+        ]
+
+
+def test_compact_backups_respects_max_bytes(tmp_path):
+    from scheduler.logic.json_help_functions import BackupPolicy, compact_backups
+
+    p = tmp_path / "config.json"
+    for stamp in ("20260103-000000", "20260102-000000", "20260101-000000"):
+        _make_backup(p, stamp, content="x" * 100)
+
+    policy = BackupPolicy(keep_last=3, keep_daily=0, keep_monthly=0, max_bytes=150, archive=False)
+    compact_backups(p, policy)
+
+    left = [x.name for x in tmp_path.glob("config.json.bak-*")]
+    assert left == ["config.json.bak-20260103-000000"]
+    assert not (tmp_path / "backups").exists()
+
+
+def test_compact_backups_recovers_from_a_corrupt_archive(tmp_path, caplog):
+    import zipfile
+    from unittest.mock import patch
+    from scheduler.logic import json_help_functions
+    from scheduler.logic.json_help_functions import BackupPolicy, compact_backups
+
+    p = tmp_path / "2026-01.json"
+    policy = BackupPolicy(keep_last=1, keep_daily=0, keep_monthly=0, max_bytes=None)
+    archive = tmp_path / "backups" / "2026-01.json.bak.zip"
+
+    for stamp in ("20260102-000000", "20260101-000000"):
+        _make_backup(p, stamp)
+    compact_backups(p, policy)
+
+    _make_backup(p, "20260103-000000")
+    compact_backups(p, policy)
+
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == [
+            "2026-01.json.bak-20260101-000000",
+            "2026-01.json.bak-20260102-000000",
+        ]
+
+    # a half-written archive from an interrupted run
+    archive.write_bytes(archive.read_bytes()[:40])
+    _make_backup(p, "20260104-000000")
+    assert compact_backups(p, policy) == 1
+
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["2026-01.json.bak-20260103-000000"]
+    assert len(list(archive.parent.glob("2026-01.json.bak.zip.corrupt-*"))) == 1
+    assert not list(archive.parent.glob("*.tmp"))
+
+    with patch.object(json_help_functions, "compact_backups", side_effect=OSError("disk full")):
+        json_help_functions._run_backup_compaction(p)
+    assert "Backup compaction failed" in caplog.text
@@ -0,0 +1,109 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from scheduler.logic import month_cache
+from scheduler.logic.month_cache import MonthCache, adjacent_months
+
+
+def _write_month(data_dir, year, month, admin="1"):
+    path = data_dir / f"{year:04d}-{month:02d}.json"
+    path.write_text(json.dumps({
+        "year": year,
+        "month": month,
+        "schedule": {"1": {"1": "Д"}},
+        "overrides": {},
+        "month_admin_id": admin,
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    with patch.object(month_cache.months_logic, "DATA_DIR", tmp_path):
+        yield tmp_path
+
+
+def _counting_cache(**kwargs):
+    calls = []
+
+    def loader(year, month):
+        calls.append((year, month))
+        return month_cache.months_logic.load_month(year, month)
+
+    return MonthCache(loader, **kwargs), calls
+
+
+def test_hit_returns_independent_copies(data_dir):
+    _write_month(data_dir, 2026, 1)
+    cache, calls = _counting_cache()
+
+    first = cache.get(2026, 1)
+    first["schedule"]["1"]["1"] = "Н"
+    second = cache.get(2026, 1)
+
+    assert calls == [(2026, 1)]
+    assert second["schedule"]["1"]["1"] == "Д"
+
+
+def test_file_change_invalidates(data_dir):
+    path = _write_month(data_dir, 2026, 1)
+    cache, calls = _counting_cache()
+    cache.get(2026, 1)
+
+    _write_month(data_dir, 2026, 1, admin="22")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert cache.get(2026, 1)["month_admin_id"] == "22"
+    assert len(calls) == 2
+
+
+def test_journal_append_invalidates(data_dir):
+    _write_month(data_dir, 2026, 1)
+    cache, _ = _counting_cache()
+    cache.get(2026, 1)
+
+    month_cache.months_logic.append_month_overrides(2026, 1, [("1", "1", "О")])
+
+    assert cache.get(2026, 1)["overrides"] == {"1": {"1": "О"}}
+
+
+def test_missing_month_raises(data_dir):
+    cache, _ = _counting_cache()
+    with pytest.raises(FileNotFoundError):
+        cache.get(2026, 5)
+
+
+def test_lru_eviction(data_dir):
+    for m in (1, 2, 3):
+        _write_month(data_dir, 2026, m)
+    cache, _ = _counting_cache(maxsize=2)
+
+    cache.get(2026, 1)
+    cache.get(2026, 2)
+    cache.get(2026, 1)
+    cache.get(2026, 3)
+
+    assert (2026, 1) in cache
+    assert (2026, 2) not in cache
+
+
+def test_prefetch_adjacent(data_dir):
+    _write_month(data_dir, 2025, 12)
+    _write_month(data_dir, 2026, 2)
+    cache, calls = _counting_cache()
+
+    for thread in cache.prefetch_adjacent(2026, 1):
+        thread.join(5)
+
+    assert (2025, 12) in cache and (2026, 2) in cache
+    cache.get(2026, 2)
+    assert sorted(calls) == [(2025, 12), (2026, 2)]
+
+
+def test_adjacent_months_wrap_years():
+    assert adjacent_months(2026, 1) == ((2025, 12), (2026, 2))
+    assert adjacent_months(2026, 12) == ((2026, 11), (2027, 1))
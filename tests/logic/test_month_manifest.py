@@ -0,0 +1,75 @@
+import json
+from unittest.mock import patch
+
+from rest_framework.test import APIClient
+
+from scheduler.logic import months_logic
+from scheduler.logic.month_manifest import (
+    MANIFEST_NAME,
+    latest_month,
+    load_manifest,
+    month_key,
+)
+
+
+def test_save_month_records_the_entry(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        data = {"schedule": {"1": {"1": "Д"}}, "ui_locked": True, "month_admin_id": 7}
+        months_logic.save_month(2026, 3, data)
+
+        entry = load_manifest(tmp_path)[month_key(2026, 3)]
+
+    assert entry["ui_locked"] is True
+    assert entry["month_admin_id"] == "7"
+    assert entry["hash"] == months_logic.month_hash(data)
+    assert entry["mtime_ns"] == (tmp_path / "2026-03.json").stat().st_mtime_ns
+
+
+def test_listing_reads_the_manifest_not_the_directory(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2025, 12, {"schedule": {}})
+        months_logic.save_month(2026, 1, {"schedule": {}})
+        months_logic.save_month(2026, 1, {"schedule": {"1": {}}})  # leaves a .bak-*
+
+        with patch("scheduler.logic.month_manifest.os.listdir") as listdir:
+            files = months_logic.list_month_files()
+            year, month, data = months_logic.get_latest_month()
+
+        listdir.assert_not_called()
+
+    assert [(y, m) for y, m, _ in files] == [(2025, 12), (2026, 1)]
+    assert (year, month, data) == (2026, 1, {"schedule": {"1": {}}})
+
+
+def test_missing_or_broken_manifest_is_rebuilt(tmp_path):
+    (tmp_path / "2024-05.json").write_text(json.dumps({"ui_locked": True}))
+    (tmp_path / "2024-06.json").write_text("{broken")
+    (tmp_path / "2024-07.json.bak-20240701-120000").write_text("{}")
+
+    entries = load_manifest(tmp_path)
+    assert sorted(entries) == ["2024-05", "2024-06"]
+    assert entries["2024-05"]["ui_locked"] is True
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+    (tmp_path / MANIFEST_NAME).write_text("not json")
+    assert latest_month(tmp_path)["month"] == 6
+
+
+def test_delete_month_drops_the_entry(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 4, {"schedule": {}})
+        months_logic.delete_month(2026, 4)
+
+        assert months_logic.list_month_files() == []
+        assert months_logic.get_latest_month() is None
+
+
+def test_meta_views_read_the_manifest(tmp_path):
+    client = APIClient()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2025, 11, {"schedule": {}})
+        months_logic.save_month(2026, 2, {"schedule": {}})
+
+        assert client.get("/api/meta/years/").json() == ["2025", "2026"]
+        assert client.get("/api/meta/months/2026/").json() == {"2026": ["02"]}
@@ -0,0 +1,298 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from scheduler.logic import months_logic
+from scheduler.logic.month_cache import MonthCache
+from scheduler.logic.month_storage.json_backend import JsonMonthStorage
+from scheduler.logic.month_storage.migration import migrate_storage
+from scheduler.logic.month_storage.sqlite_backend import SqliteMonthStorage
+
+
+def _month(admin="1"):
+    return {
+        "year": 2026,
+        "month": 3,
+        "schedule": {
+            "2": {"1": "Д", "2": "Н"},
+            "1": {"1": "", "2": "В"},
+        },
+        "overrides": {"2": {"2": "О"}},
+        "month_admin_id": admin,
+        "ui_locked": False,
+    }
+
+
+@pytest.fixture
+def sqlite_months(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.set_storage_backend("sqlite")
+        try:
+            yield months_logic.get_storage()
+        finally:
+            months_logic.get_storage().close()
+            months_logic.set_storage_backend(None)
+
+
+def test_round_trip_keeps_content_and_order(sqlite_months):
+    months_logic.save_month(2026, 3, _month())
+
+    data = months_logic.read_month(2026, 3)
+
+    assert data == _month()
+    assert list(data) == list(_month())
+    assert list(data["schedule"]) == ["2", "1"]
+    assert not (sqlite_months.db_path.parent / "2026-03.json").exists()
+
+    journal_mode = sqlite_months._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+
+def test_save_upserts_only_changed_rows(sqlite_months):
+    months_logic.save_month(2026, 3, _month())
+    conn = sqlite_months._connection()
+
+    data = _month()
+    data["schedule"]["1"]["2"] = "Н"
+    del data["overrides"]["2"]
+
+    before = conn.total_changes
+    months_logic.save_month(2026, 3, data)
+
+    # the clock, the header, one schedule row and one deleted override
+    assert conn.total_changes - before == 4
+    assert months_logic.read_month(2026, 3) == data
+
+
+def test_overrides_are_rows(sqlite_months):
+    months_logic.save_month(2026, 3, _month())
+    seen = []
+    listener = lambda y, m, d, records: seen.append((d, records))
+    months_logic.add_save_listener(listener)
+    try:
+        months_logic.append_month_overrides(2026, 3, [("1", "1", "Б"), ("2", "2", "Д")])
+    finally:
+        months_logic.remove_save_listener(listener)
+
+    assert seen == [(None, [("1", "1", "Б"), ("2", "2", "Д")])]
+    assert months_logic.read_month(2026, 3)["overrides"] == {"1": {"1": "Б"}, "2": {"2": "Д"}}
+
+    with pytest.raises(FileNotFoundError):
+        months_logic.append_month_overrides(2026, 4, [("1", "1", "Д")])
+
+
+def test_listing_latest_and_delete(sqlite_months):
+    months_logic.save_month(2026, 3, _month())
+    months_logic.save_month(2025, 12, _month())
+
+    assert months_logic.list_stored_months() == [(2025, 12), (2026, 3)]
+    assert months_logic.get_latest_month()[:2] == (2026, 3)
+
+    months_logic.delete_month(2026, 3)
+
+    assert not months_logic.month_exists(2026, 3)
+    with pytest.raises(FileNotFoundError):
+        months_logic.read_month(2026, 3)
+
+
+def test_cache_follows_row_versions(sqlite_months):
+    months_logic.save_month(2026, 3, _month())
+    cache = MonthCache()
+
+    assert cache.get(2026, 3)["overrides"] == {"2": {"2": "О"}}
+
+    months_logic.append_month_overrides(2026, 3, [("1", "2", "Д")])
+
+    assert cache.get(2026, 3)["overrides"]["1"] == {"2": "Д"}
+
+
+def test_concurrent_override_writers(sqlite_months):
+    months_logic.save_month(2026, 3, {"schedule": {}, "overrides": {}})
+
+    def write(emp_id):
+        for day in range(1, 21):
+            months_logic.append_month_overrides(2026, 3, [(str(emp_id), str(day), "Д")])
+        sqlite_months.close()
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    overrides = months_logic.read_month(2026, 3)["overrides"]
+    assert sum(len(days) for days in overrides.values()) == 8 * 20
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    source = JsonMonthStorage(tmp_path)
+    source.write(2026, 3, _month())
+    source.write(2026, 4, {"schedule": {}})
+    source.append_overrides(2026, 4, [("1", "5", "Н")])
+
+    target = SqliteMonthStorage(tmp_path / "months.sqlite3")
+    try:
+        assert migrate_storage(source, target) == [(2026, 3), (2026, 4)]
+        assert target.read(2026, 3) == _month()
+        assert target.read(2026, 4) == {"schedule": {}, "overrides": {"1": {"5": "Н"}}}
+
+        source.write(2026, 3, _month(admin="2"))
+        assert migrate_storage(source, target) == []
+        assert target.read(2026, 3)["month_admin_id"] == "1"
+        assert migrate_storage(source, target, overwrite=True) == [(2026, 3), (2026, 4)]
+        assert target.read(2026, 3)["month_admin_id"] == "2"
+    finally:
+        target.close()
+
+
+def test_migrate_month_storage_switches_backend(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.set_storage_backend("json")
+        try:
+            months_logic.save_month(2026, 3, _month())
+
+            assert months_logic.migrate_month_storage("sqlite") == [(2026, 3)]
+            assert months_logic.get_storage().name == "sqlite"
+            assert months_logic.read_month(2026, 3) == _month()
+        finally:
+            months_logic.get_storage().close()
+            months_logic.set_storage_backend(None)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        months_logic.set_storage_backend("redis")
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    from scheduler.logic.month_storage.base import MonthStorage
+
+    class ReadOnly(MonthStorage):
+        def read(self, year, month):
+            return {}
+
+    with pytest.raises(TypeError):
+        ReadOnly()
+
+
+def test_versions_never_repeat_after_delete(sqlite_months):
+    other = SqliteMonthStorage(sqlite_months.db_path)
+    try:
+        months_logic.save_month(2026, 3, {"schedule": {"1": {"1": "Д"}}})
+        cache = MonthCache()
+        assert cache.get(2026, 3)["schedule"]["1"]["1"] == "Д"
+
+        other.delete(2026, 3)
+        other.write(2026, 3, {"schedule": {"1": {"1": "Н"}}})
+
+        assert cache.get(2026, 3)["schedule"]["1"]["1"] == "Н"
+    finally:
+        other.close()
+
+
+def test_reads_see_one_snapshot(sqlite_months):
+    months_logic.save_month(2026, 3, {"month_admin_id": "0", "schedule": {"0": {"1": "Д"}}})
+    other = SqliteMonthStorage(sqlite_months.db_path)
+    conn = sqlite_months._connection()
+
+    class WriteAfterHeader:
+        """
+            Lets another writer commit between the header and row SELECTs.
+        """
+
+        def execute(self, sql, *args):
+            cursor = conn.execute(sql, *args)
+            if sql.startswith("SELECT header"):
+                other.write(2026, 3, {"month_admin_id": "1", "schedule": {"1": {"1": "Н"}}})
+            return cursor
+
+    sqlite_months._local.conn = WriteAfterHeader()
+    try:
+        data = months_logic.read_month(2026, 3)
+    finally:
+        sqlite_months._local.conn = conn
+        other.close()
+
+    assert data == {"month_admin_id": "0", "schedule": {"0": {"1": "Д"}}}
+    assert months_logic.read_month(2026, 3)["month_admin_id"] == "1"
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def any_months(request, tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.set_storage_backend(request.param)
+        try:
+            yield months_logic.get_storage()
+        finally:
+            if request.param == "sqlite":
+                months_logic.get_storage().close()
+            months_logic.set_storage_backend(None)
+
+
+def test_stale_save_does_not_drop_appended_overrides(any_months):
+    months_logic.save_month(2026, 3, _month())
+    data, version = months_logic.read_month_versioned(2026, 3)
+
+    months_logic.append_month_overrides(2026, 3, [("1", "1", "Б")])
+    data["ui_locked"] = True
+
+    with pytest.raises(months_logic.MonthConflictError):
+        months_logic.save_month(2026, 3, data, expected_version=version)
+
+    stored = months_logic.read_month(2026, 3)
+    assert stored["overrides"]["1"] == {"1": "Б"}
+    assert stored["ui_locked"] is False
+
+
+def test_update_month_retries_on_a_fresh_read(any_months):
+    months_logic.save_month(2026, 3, _month())
+    calls = []
+
+    def lock(data):
+        calls.append(dict(data["overrides"]))
+        if len(calls) == 1:
+            # another writer appends between this read and the write
+            months_logic.append_month_overrides(2026, 3, [("1", "1", "Б")])
+        data["ui_locked"] = True
+
+    months_logic.update_month(2026, 3, lock)
+
+    stored = months_logic.read_month(2026, 3)
+    assert len(calls) == 2
+    assert stored["ui_locked"] is True
+    assert stored["overrides"]["1"] == {"1": "Б"}
+
+
+def test_save_months_writes_all_or_nothing(any_months):
+    months_logic.save_month(2026, 3, _month(admin="1"))
+
+    months_logic.save_months([(2026, 3, _month(admin="2")), (2026, 4, _month(admin="3"))])
+    assert months_logic.list_stored_months() == [(2026, 3), (2026, 4)]
+    assert months_logic.read_month(2026, 4)["month_admin_id"] == "3"
+
+    broken = dict(_month(admin="5"), unserializable=object())
+    with pytest.raises(TypeError):
+        months_logic.save_months([(2026, 3, _month(admin="4")), (2026, 5, broken)])
+
+    assert months_logic.list_stored_months() == [(2026, 3), (2026, 4)]
+    assert months_logic.read_month(2026, 3)["month_admin_id"] == "2"
+    if any_months.name == "json":
+        assert not list(any_months.data_dir.glob("*.tmp"))
+
+
+def test_append_can_reject_a_locked_month(any_months):
+    months_logic.save_month(2026, 3, dict(_month(), ui_locked=True))
+
+    with patch.object(type(any_months), "read", side_effect=AssertionError("month read")):
+        with pytest.raises(months_logic.MonthLockedError):
+            months_logic.append_month_overrides(2026, 3, [("1", "1", "Б")], reject_locked=True)
+
+    assert "1" not in months_logic.read_month(2026, 3)["overrides"]
+
+    months_logic.append_month_overrides(2026, 3, [("1", "1", "Б")])
+    assert months_logic.read_month(2026, 3)["overrides"]["1"] == {"1": "Б"}
+
+    months_logic.save_month(2026, 4, _month())
+    months_logic.append_month_overrides(2026, 4, [("1", "1", "Б")], reject_locked=True)
+    assert months_logic.read_month(2026, 4)["overrides"]["1"] == {"1": "Б"}
@@ -54,3 +54,60 @@ def test_get_latest_month(tmp_path, monkeypatch):
     assert data == {"b": 2}
 
 
+def test_iter_months_crosses_year(tmp_path, monkeypatch):
+    setup_fake_django_settings(tmp_path)
+    monkeypatch.setenv("DJANGO_SETTINGS_MODULE", "fake_settings")
+
+    ml = reload_months_logic_with_data_dir(Path(tmp_path))
+
+    assert ml.iter_months((2025, 11), (2026, 2)) == [
+        (2025, 11), (2025, 12), (2026, 1), (2026, 2)
+    ]
+    assert ml.iter_months((2026, 2), (2025, 11)) == []
+
+
+def test_normalize_month_does_not_mutate_input(tmp_path, monkeypatch):
+    setup_fake_django_settings(tmp_path)
+    monkeypatch.setenv("DJANGO_SETTINGS_MODULE", "fake_settings")
+
+    ml = reload_months_logic_with_data_dir(Path(tmp_path))
+
+    stored = {
+        "schedule": {"1": {"1": "Д"}, "9": {"1": "Н"}},
+        "overrides": {"1": {"2": "В", "40": "Н"}, "9": {"1": "В"}},
+        "_runtime_schedule": {},
+    }
+    snapshot = ml.month_hash(stored)
+
+    data = ml.normalize_month(stored, ["1", "2"], 3)
+
+    assert ml.month_hash(stored) == snapshot
+    assert data["schedule"] == {
+        "1": {"1": "Д", "2": "", "3": ""},
+        "2": {"1": "", "2": "", "3": ""},
+    }
+    assert data["overrides"] == {"1": {"2": "В"}}
+    assert data["ui_locked"] is False
+    assert "_runtime_schedule" not in data
+
+
+def test_save_month_if_changed_skips_identical_content(tmp_path, monkeypatch):
+    setup_fake_django_settings(tmp_path)
+    monkeypatch.setenv("DJANGO_SETTINGS_MODULE", "fake_settings")
+
+    data_dir = Path(tmp_path) / "data"
+    data_dir.mkdir()
+    ml = reload_months_logic_with_data_dir(data_dir)
+
+    data = {"schedule": {"1": {"1": "Д"}}, "overrides": {}}
+    ml.save_month(2026, 1, data)
+    stored = ml.read_month(2026, 1)
+
+    assert ml.save_month_if_changed(2026, 1, dict(reversed(list(stored.items()))), ml.month_hash(stored)) is False
+    assert list(data_dir.glob("2026-01.json.bak-*")) == []
+
+    changed = dict(stored, ui_locked=False)
+    assert ml.save_month_if_changed(2026, 1, changed, ml.month_hash(stored)) is True
+    assert ml.read_month(2026, 1)["ui_locked"] is False
+
+
@@ -0,0 +1,105 @@
+import copy
+
+import pytest
+
+from scheduler.logic.calendar_service import weekday_map
+from scheduler.logic.generator.apply_overrides import apply_overrides
+from scheduler.logic.overlay import ScheduleOverlay
+from scheduler.logic.overrides.leave_override import apply_leave_overrides
+from scheduler.logic.repair.repair_engine import apply_repair
+from scheduler.logic.validators.validators import validate_month
+
+
+def _schedule():
+    return {
+        "1": {"1": "А", "2": "А", "3": ""},
+        "2": {"1": "Д", "2": "", "3": "Н"},
+        "3": {"1": "В", "2": "Н", "3": ""},
+        "4": {"1": "Н", "2": "В", "3": "Д"},
+        "5": {"1": "", "2": "", "3": ""},
+    }
+
+
+def test_overlay_reads_edits_over_the_base():
+    base = _schedule()
+    snapshot = copy.deepcopy(base)
+    overlay = ScheduleOverlay(base)
+
+    overlay.set_shift("2", 2, "Д")
+    overlay["5"]["1"] = "О"
+
+    assert overlay["2"]["2"] == "Д"
+    assert overlay.get_shift("5", "1") == "О"
+    assert dict(overlay["2"].items()) == {"1": "Д", "2": "Д", "3": "Н"}
+    assert sorted(overlay.changes()) == [("2", "2", "Д"), ("5", "1", "О")]
+    assert base == snapshot
+
+
+def test_get_shift_finds_edits_under_either_key_type():
+    overlay = ScheduleOverlay(_schedule())
+
+    overlay.set_shift("2", 1, "Н")
+    overlay.set_shift(4, "3", "О")
+
+    assert overlay.get_shift("2", 1) == "Н"
+    assert overlay.get_shift("2", "1") == "Н"
+    assert overlay.get_shift(4, 3) == "О"
+    assert overlay.get_shift("9", 1, default="-") == "-"
+
+
+def test_reads_do_not_record_edits():
+    overlay = ScheduleOverlay(_schedule())
+
+    days = overlay["3"]
+    assert days["2"] == "Н"
+    assert overlay.get_shift("4", "1") == "Н"
+    assert overlay._edits == {}
+
+    days["2"] = "Д"
+    assert overlay["3"]["2"] == "Д"
+    assert overlay.changes() == [("3", "2", "Д")]
+
+
+def test_fork_is_independent():
+    overlay = ScheduleOverlay(_schedule(), {"5": {"1": "Д"}})
+    trial = overlay.fork()
+    trial.set_shift("5", "2", "В")
+
+    assert overlay.get_shift("5", "2") == ""
+    assert trial.get_shift("5", "1") == "Д"
+    assert trial.materialize()["5"] == {"1": "Д", "2": "В", "3": ""}
+
+    with pytest.raises(KeyError):
+        trial.set_shift("99", "1", "Д")
+
+
+def test_validator_sees_the_same_month():
+    overlay = ScheduleOverlay(_schedule(), {"5": {"2": "Д", "3": "В"}})
+    weekdays = weekday_map(2026, 6)
+
+    assert validate_month(overlay, False, weekdays, "1") == \
+        validate_month(overlay.materialize(), False, weekdays, "1")
+
+
+def test_with_overrides_matches_apply_overrides():
+    overrides = {"2": {"2": "В"}, "99": {"1": "Д"}}
+
+    overlay = ScheduleOverlay.with_overrides(_schedule(), overrides)
+
+    assert overlay.materialize() == apply_overrides(_schedule(), overrides)
+
+
+def test_leave_and_repair_overlays_match_the_copies():
+    base = _schedule()
+    leaves = {"2": {"3": "O"}}
+
+    leave_overlay = apply_leave_overrides(base, leaves, overlay=True)
+    assert isinstance(leave_overlay, ScheduleOverlay)
+    assert leave_overlay.materialize() == apply_leave_overrides(base, leaves)
+
+    for mode in ("greedy", "optimal"):
+        repaired = apply_repair(base, 2026, 6, set(), {"1"}, mode=mode, overlay=True)
+        assert isinstance(repaired, ScheduleOverlay)
+        assert repaired.materialize() == apply_repair(base, 2026, 6, set(), {"1"}, mode=mode)
+
+    assert base == _schedule()
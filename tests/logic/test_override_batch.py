@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+import pytest
+
+from scheduler.logic import months_logic
+from scheduler.logic.override_journal import read_journal
+from scheduler.logic.overrides.batch import apply_override_batch, normalize_override_batch
+
+
+def _month(locked=False, admin=None):
+    return {
+        "schedule": {"1": {"1": "", "2": ""}, "2": {"1": "", "2": ""}},
+        "overrides": {},
+        "ui_locked": locked,
+        "month_admin_id": admin,
+    }
+
+
+def test_normalize_collapses_repeated_cells():
+    records = normalize_override_batch(
+        [
+            {"employee_id": "1", "day": 2, "new_shift": "Д"},
+            {"employee_id": 2, "day": "1", "new_shift": None},
+            {"employee_id": "1", "day": 2, "new_shift": "Н"},
+        ],
+        days=28,
+    )
+
+    assert records == [("1", "2", "Н"), ("2", "1", "")]
+
+
+@pytest.mark.parametrize("change", [
+    {"employee_id": "", "day": 1, "new_shift": "Д"},
+    {"employee_id": "9", "day": 1, "new_shift": "Д"},
+    {"employee_id": "1", "day": 29, "new_shift": "Д"},
+    {"employee_id": "1", "day": "x", "new_shift": "Д"},
+    {"employee_id": "1", "day": 1, "new_shift": "X"},
+])
+def test_normalize_rejects_invalid_change(change):
+    with pytest.raises(ValueError):
+        normalize_override_batch([change], days=28, employee_ids=["1", "2"])
+
+
+def test_batch_is_one_journal_append(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, _month())
+
+        result = apply_override_batch(2026, 2, [
+            {"employee_id": "1", "day": 1, "new_shift": "Д"},
+            {"employee_id": "2", "day": 2, "new_shift": "О"},
+        ])
+
+        assert result == {"applied": 2, "errors": []}
+        assert len(read_journal(months_logic.get_month_path(2026, 2))) == 2
+        assert months_logic.load_month(2026, 2)["overrides"] == {"1": {"1": "Д"}, "2": {"2": "О"}}
+
+
+def test_invalid_batch_writes_nothing(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, _month())
+
+        with pytest.raises(ValueError):
+            apply_override_batch(2026, 2, [
+                {"employee_id": "1", "day": 1, "new_shift": "Д"},
+                {"employee_id": "1", "day": 31, "new_shift": "Д"},
+            ])
+
+        assert read_journal(months_logic.get_month_path(2026, 2)) == []
+
+
+def test_locked_month_is_rejected(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, _month(locked=True))
+
+        with pytest.raises(RuntimeError):
+            apply_override_batch(2026, 2, [{"employee_id": "1", "day": 1, "new_shift": "Д"}])
+
+
+def test_batch_validates_once_with_admin(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, _month(admin="2"))
+
+        result = apply_override_batch(2026, 2, [{"employee_id": "1", "day": 1, "new_shift": "Д"}])
+
+        assert result["applied"] == 1
+        assert result["errors"]
+
+
+def test_empty_schedule_with_admin_is_applied_without_validation(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, {"schedule": {}, "overrides": {}, "month_admin_id": "2"})
+
+        result = apply_override_batch(2026, 2, [{"employee_id": "1", "day": 1, "new_shift": "Д"}])
+
+        assert result == {"applied": 1, "errors": []}
+        assert months_logic.read_month(2026, 2)["overrides"] == {"1": {"1": "Д"}}
+
+
+def test_validation_failure_writes_nothing(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path), \
+            patch("scheduler.logic.overrides.batch.validate_month", side_effect=KeyError("x")):
+        months_logic.save_month(2026, 2, _month(admin="2"))
+
+        with pytest.raises(KeyError):
+            apply_override_batch(2026, 2, [{"employee_id": "1", "day": 1, "new_shift": "Д"}])
+
+        assert read_journal(months_logic.get_month_path(2026, 2)) == []
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from scheduler.logic import months_logic
+from scheduler.logic.month_storage import json_backend
+from scheduler.logic.override_journal import (
+    append_overrides,
+    read_journal,
+    fold_journal,
+    get_journal_path,
+)
+
+
+def test_append_and_read_journal(tmp_path):
+    month_path = tmp_path / "2026-02.json"
+
+    append_overrides(month_path, [("1", "3", "Д")])
+    append_overrides(month_path, [("1", "3", "Н"), ("2", "4", "")])
+
+    assert get_journal_path(month_path).name == "2026-02.overrides.jsonl"
+
+    records = read_journal(month_path)
+    assert [(r["employee_id"], r["day"], r["shift"]) for r in records] == [
+        ("1", "3", "Д"), ("1", "3", "Н"), ("2", "4", ""),
+    ]
+
+
+def test_read_journal_ignores_torn_line(tmp_path):
+    month_path = tmp_path / "2026-02.json"
+    append_overrides(month_path, [("1", "3", "Д")])
+
+    with get_journal_path(month_path).open("a", encoding="utf-8") as f:
+        f.write('{"employee_id": "1", "da')
+
+    assert len(read_journal(month_path)) == 1
+
+
+def test_fold_journal_last_write_wins():
+    data = {"overrides": {"1": {"1": "В"}}}
+    records = [
+        {"employee_id": "1", "day": "2", "shift": "Д"},
+        {"employee_id": "1", "day": "2", "shift": "Н"},
+    ]
+
+    fold_journal(data, records)
+
+    assert data["overrides"] == {"1": {"1": "В", "2": "Н"}}
+
+
+def test_month_overrides_are_journaled_and_folded_on_save(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 2, {"schedule": {"1": {"1": "", "2": ""}}, "overrides": {}})
+        snapshot = (tmp_path / "2026-02.json").read_text(encoding="utf-8")
+
+        months_logic.append_month_overrides(2026, 2, [("1", "2", "Д")])
+
+        assert (tmp_path / "2026-02.json").read_text(encoding="utf-8") == snapshot
+
+        data = months_logic.load_month(2026, 2)
+        assert data["overrides"] == {"1": {"2": "Д"}}
+        assert data["schedule"]["1"]["2"] == "Д"
+
+        months_logic.save_month(2026, 2, data)
+
+        assert not get_journal_path(tmp_path / "2026-02.json").exists()
+        stored = json.loads((tmp_path / "2026-02.json").read_text(encoding="utf-8"))
+        assert stored["overrides"] == {"1": {"2": "Д"}}
+
+
+def test_journal_is_compacted_past_threshold(tmp_path):
+    with patch.object(months_logic, "DATA_DIR", tmp_path), \
+            patch.object(json_backend, "journal_needs_compaction", lambda size: True):
+        months_logic.save_month(2026, 2, {"schedule": {}, "overrides": {}})
+        months_logic.append_month_overrides(2026, 2, [("1", "2", "Н")])
+
+        assert not get_journal_path(tmp_path / "2026-02.json").exists()
+        assert months_logic.read_month(2026, 2)["overrides"] == {"1": {"2": "Н"}}
@@ -57,3 +57,25 @@ def test_shift_allowed_real_shifts_default():
 
 
 
+def test_compiled_table_matches_rules_exhaustively():
+    codes = list(rules.TRANSITION_CODES) + ["X", "B", ""]
+
+    for prev_shift in codes:
+        for new_shift in codes:
+            for days in range(-3, 40):
+                for crisis_mode in (False, True):
+                    expected = rules._is_shift_allowed_rules(
+                        prev_shift, days, new_shift, crisis_mode
+                    )
+                    assert rules.is_shift_allowed(
+                        prev_shift, days, new_shift, crisis_mode
+                    ) == expected, (prev_shift, days, new_shift, crisis_mode)
+
+
+def test_indexed_lookup_uses_shift_index():
+    idx = rules.SHIFT_INDEX
+    assert not rules.is_shift_allowed_indexed(idx["V"], 1, idx["N"], False)
+    assert rules.is_shift_allowed_indexed(idx["N"], 999, idx["D"], False)
+    assert rules.is_shift_allowed_indexed(idx[None], 0, idx["N"], True)
+
+
@@ -0,0 +1,60 @@
+import calendar
+import random
+
+from scheduler.logic.validators.validators import (
+    IncrementalValidator,
+    validate_month,
+)
+
+
+SHIFTS = ["", "", "Д", "В", "Н", "А", "О", "Б", "П"]
+
+
+def _random_schedule(rng, employees, days):
+    return {
+        str(e): {str(d): rng.choice(SHIFTS) for d in range(1, days + 1)}
+        for e in range(1, employees + 1)
+    }
+
+
+def _weekdays(year, month):
+    days = calendar.monthrange(year, month)[1]
+    return {d: calendar.weekday(year, month, d) for d in range(1, days + 1)}
+
+
+def test_incremental_validator_initial_state_matches_validate_month():
+    rng = random.Random(1)
+    weekdays = _weekdays(2026, 3)
+    schedule = _random_schedule(rng, 8, len(weekdays))
+
+    validator = IncrementalValidator(schedule, False, weekdays, "1")
+
+    assert validator.errors() == validate_month(schedule, False, weekdays, "1")
+
+
+def test_incremental_validator_tracks_edits():
+    rng = random.Random(7)
+    weekdays = _weekdays(2026, 2)
+    schedule = _random_schedule(rng, 6, len(weekdays))
+
+    validator = IncrementalValidator(schedule, False, weekdays, "2")
+
+    for _ in range(400):
+        emp = str(rng.randint(1, 6))
+        day = rng.randint(1, len(weekdays))
+        shift = rng.choice(SHIFTS)
+
+        schedule[emp][str(day)] = shift
+        validator.apply(emp, day, shift)
+
+        assert validator.errors() == validate_month(schedule, False, weekdays, "2")
+
+
+def test_blocking_errors_only_coverage():
+    weekdays = _weekdays(2026, 2)
+    schedule = {"1": {str(d): "" for d in weekdays}}
+
+    validator = IncrementalValidator(schedule, False, weekdays, "1")
+
+    assert len(validator.blocking_errors()) == 3 * len(weekdays)
+    assert all(e[0] == "ПОКРИТИЕ" for e in validator.blocking_errors())
@@ -0,0 +1,9 @@
+import importlib
+
+import pytest
+
+
+def test_desktop_app_imports():
+    pytest.importorskip("PyQt6.QtWidgets")
+
+    importlib.import_module("desktop_app.main_window")
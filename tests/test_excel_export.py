@@ -0,0 +1,99 @@
+from openpyxl import load_workbook
+
+from desktop_app.export.excel_export import export_schedule_to_excel
+
+
+def _export(path, streaming):
+    employees = [
+        {"id": 1, "full_name": "Иван Иванов", "card_number": "001"},
+        {"id": 2, "full_name": "Петър Петров", "card_number": "002"},
+    ]
+    schedule = {
+        "1": {1: "Д", 2: "Н", 3: ""},
+        "2": {1: "В", 2: "О", 3: "Б"},
+    }
+    export_schedule_to_excel(
+        filename=str(path),
+        company="К",
+        department="Д",
+        city="Г",
+        month_name="Януари",
+        month=1,
+        year=2026,
+        employees=employees,
+        days=list(range(1, 32)),
+        schedule=schedule,
+        streaming=streaming,
+    )
+    return load_workbook(path)["График"]
+
+
+def _dump(ws):
+    return [
+        (c.coordinate, c.value, c.style, c.fill.fgColor.rgb, c.font.b)
+        for row in ws.iter_rows()
+        for c in row
+        if c.value is not None
+    ]
+
+
+def test_export_worked_days_and_cells(tmp_path):
+    ws = _export(tmp_path / "normal.xlsx", streaming=False)
+
+    assert ws.cell(6, 3).value == "Иван Иванов"
+    assert ws.cell(6, 2).value == 2
+    assert ws.cell(7, 2).value == 3
+    assert ws.cell(7, 5).value == "О"
+    assert ws.cell(5, 35).value == "Служебен №"
+    assert "A4:AI4" in {str(r) for r in ws.merged_cells.ranges}
+
+
+def test_streaming_export_matches_normal(tmp_path):
+    normal = _export(tmp_path / "normal.xlsx", streaming=False)
+    streamed = _export(tmp_path / "streamed.xlsx", streaming=True)
+
+    assert _dump(streamed) == _dump(normal)
+    assert sorted(map(str, streamed.merged_cells.ranges)) == sorted(map(str, normal.merged_cells.ranges))
+    assert streamed.column_dimensions["C"].width == normal.column_dimensions["C"].width
+
+
+def _months(count):
+    return [
+        {
+            "year": 2026,
+            "month": m,
+            "month_name": f"М{m}",
+            "days": list(range(1, 29)),
+            "schedule": {"1": {1: "Д", 2: "Н"}, "2": {d: "В" for d in range(1, m + 1)}},
+        }
+        for m in range(1, count + 1)
+    ]
+
+
+def test_export_months_workbook(tmp_path):
+    from desktop_app.export.workbook_export import export_months_to_excel
+
+    path = tmp_path / "year.xlsx"
+    export_months_to_excel(
+        filename=str(path),
+        company="К",
+        department="Д",
+        city="Г",
+        employees=[
+            {"id": 1, "full_name": "Иван Иванов", "card_number": "001"},
+            {"id": 2, "full_name": "Петър Петров", "card_number": "002"},
+        ],
+        months=_months(3),
+        max_workers=2,
+    )
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["Обобщение", "М1 2026", "М2 2026", "М3 2026"]
+
+    summary = wb["Обобщение"]
+    assert [c.value for c in summary[1]] == ["№", "Име, Презиме, Фамилия", "М1 2026", "М2 2026", "М3 2026", "Общо"]
+    assert [c.value for c in summary[2]][2:] == [2, 2, 2, 6]
+    assert [c.value for c in summary[3]][2:] == [1, 2, 3, 6]
+    assert (summary["A1"].style, summary["B2"].style, summary["C2"].style) == ("sch_header", "sch_cell", "sch_shift")
+
+    assert wb["М2 2026"].cell(7, 2).value == 2
@@ -106,3 +106,18 @@ def test_get_latest_month_from_json(tmp_path, monkeypatch):
     assert (y, m) == (2025, 7)
     assert loaded == json_data
 
+
+
+@pytest.mark.django_db
+def test_get_latest_month_from_json_sees_new_files(tmp_path, monkeypatch):
+    MonthRecord.objects.all().delete()
+    monkeypatch.setattr(MonthService, "DATA_DIR", tmp_path)
+
+    (tmp_path / "2025-07.json").write_text(json.dumps({"schedule": {}}), encoding="utf-8")
+    assert MonthService.get_latest_month()[:2] == (2025, 7)
+
+    (tmp_path / "2025-08.json").write_text(json.dumps({"schedule": {}}), encoding="utf-8")
+    (tmp_path / "2025-09.json.bak-20250901-120000").write_text("{}", encoding="utf-8")
+
+    assert MonthService.get_latest_month()[:2] == (2025, 8)
+    assert not any("manifest" in p.name for p in tmp_path.iterdir())
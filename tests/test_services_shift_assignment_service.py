@@ -0,0 +1,130 @@
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from scheduler.logic import months_logic
+from scheduler.models import Employee, ShiftAssignment
+from scheduler.services.month_service import MonthService
+from scheduler.services.shift_assignment_service import ShiftAssignmentService
+
+
+def _employee():
+    return Employee.objects.create(full_name=f"Служител {uuid.uuid4().hex[:8]}")
+
+
+@pytest.mark.django_db
+def test_sync_month_builds_rows_with_sources():
+    a, b, c = _employee(), _employee(), _employee()
+    data = {
+        "schedule": {
+            str(a.id): {"1": "Н", "2": "Н", "3": ""},
+            str(b.id): {"1": "Д", "2": "В"},
+            "999999": {"1": "Д"},
+        },
+        "overrides": {str(b.id): {"2": "О"}, str(c.id): {"1": "Д"}},
+    }
+
+    assert ShiftAssignmentService.sync_month(2026, 2, data) == 4
+
+    rows = {
+        (r.employee_id, r.date.day): (r.shift, r.source)
+        for r in ShiftAssignment.objects.filter(date__year=2026, date__month=2)
+    }
+    assert rows == {
+        (a.id, 1): ("Н", "schedule"),
+        (a.id, 2): ("Н", "schedule"),
+        (b.id, 1): ("Д", "schedule"),
+        (b.id, 2): ("О", "override"),
+    }
+
+
+@pytest.mark.django_db
+def test_resync_replaces_the_month_only():
+    a = _employee()
+    ShiftAssignmentService.sync_month(2026, 1, {"schedule": {str(a.id): {"31": "Н"}}})
+    ShiftAssignmentService.sync_month(2026, 2, {"schedule": {str(a.id): {"1": "Н"}}})
+    ShiftAssignmentService.sync_month(2026, 2, {"schedule": {str(a.id): {"2": "Д"}}})
+
+    assert [(r.date, r.shift) for r in ShiftAssignment.objects.filter(employee=a)] == [
+        (date(2026, 1, 31), "Н"),
+        (date(2026, 2, 2), "Д"),
+    ]
+
+
+@pytest.mark.django_db
+def test_queries():
+    a, b = _employee(), _employee()
+    ShiftAssignmentService.sync_month(2026, 3, {
+        "schedule": {
+            str(a.id): {"1": "Н", "2": "Н", "3": "Д"},
+            str(b.id): {"1": "Д", "2": "Д"},
+        },
+    })
+
+    nights = ShiftAssignmentService.shifts_for_employee(a.id, 2026, shift="Н")
+    assert [r.date.day for r in nights] == [1, 2]
+
+    coverage = ShiftAssignmentService.coverage(date(2026, 3, 1), date(2026, 3, 2))
+    assert coverage == {
+        date(2026, 3, 1): {"Д": 1, "Н": 1},
+        date(2026, 3, 2): {"Д": 1, "Н": 1},
+    }
+
+
+@pytest.mark.django_db
+def test_month_file_saves_and_appends_are_synced(tmp_path):
+    a = _employee()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 4, {"schedule": {str(a.id): {"1": "Д", "2": ""}}, "overrides": {}})
+        assert ShiftAssignment.objects.filter(employee=a).count() == 1
+
+        months_logic.append_month_overrides(2026, 4, [(str(a.id), "2", "В")])
+        row = ShiftAssignment.objects.get(employee=a, date=date(2026, 4, 2))
+        assert (row.shift, row.source) == ("В", "override")
+
+
+@pytest.mark.django_db
+def test_month_service_save_leaves_the_table_to_month_storage():
+    a = _employee()
+    MonthService.save_month(2026, 5, {"schedule": {str(a.id): {"5": "А"}}})
+
+    assert not ShiftAssignment.objects.filter(employee=a).exists()
+
+
+@pytest.mark.django_db
+def test_append_touches_only_the_appended_cells(tmp_path):
+    a, b = _employee(), _employee()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 4, {
+            "schedule": {str(a.id): {"1": "Д", "2": "Н"}, str(b.id): {"1": "В"}},
+            "overrides": {},
+        })
+        untouched = ShiftAssignment.objects.get(employee=b)
+
+        with patch.object(ShiftAssignmentService, "sync_month") as sync:
+            months_logic.append_month_overrides(2026, 4, [(str(a.id), "2", ""), (str(a.id), "40", "Д")])
+
+        sync.assert_not_called()
+        assert [r.date.day for r in ShiftAssignment.objects.filter(employee=a)] == [1]
+        assert ShiftAssignment.objects.get(employee=b).pk == untouched.pk
+
+
+@pytest.mark.django_db
+def test_failing_listener_is_logged_and_backfill_rebuilds(tmp_path, caplog):
+    a = _employee()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path), \
+            patch.object(ShiftAssignmentService, "sync_month", side_effect=RuntimeError("db down")):
+        months_logic.save_month(2026, 6, {"schedule": {str(a.id): {"3": "Н"}}})
+
+    assert "Save listener" in caplog.text
+    assert not ShiftAssignment.objects.filter(employee=a).exists()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        assert ShiftAssignmentService.backfill() == [(2026, 6)]
+
+    assert ShiftAssignment.objects.get(employee=a).date == date(2026, 6, 3)
@@ -0,0 +1,132 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from scheduler.logic import months_logic
+from scheduler.logic.month_storage.json_backend import JsonMonthStorage
+from scheduler.logic.workload import summarize_month
+from scheduler.models import Employee, MonthlyWorkload
+from scheduler.services.month_service import MonthService
+from scheduler.services.workload_service import WorkloadService
+
+
+def _employee():
+    return Employee.objects.create(full_name=f"Служител {uuid.uuid4().hex[:8]}")
+
+
+def test_summarize_month_counts_weekends_and_holidays():
+    # 2026-01: the 1st is a holiday (Thursday), the 3rd and 4th a weekend
+    summary = summarize_month(2026, 1, {
+        "7": {"1": "Н", "2": "Д", "3": "В", "4": "О", "5": "", "6": "Б"},
+    })
+
+    assert summary["7"] == {
+        "worked_days": 5,
+        "day_shifts": 1,
+        "evening_shifts": 1,
+        "night_shifts": 1,
+        "admin_shifts": 0,
+        "leave_days": 1,
+        "sick_days": 1,
+        "weekend_shifts": 1,
+        "holiday_shifts": 1,
+    }
+
+
+@pytest.mark.django_db
+def test_sync_month_applies_overrides_and_skips_unknown():
+    a, b = _employee(), _employee()
+    data = {
+        "schedule": {str(a.id): {"1": "Д", "2": "Д"}, "999999": {"1": "Д"}},
+        "overrides": {str(a.id): {"2": "Н"}, str(b.id): {"1": "Д"}},
+    }
+
+    assert WorkloadService.sync_month(2026, 2, data) == 1
+    assert not MonthlyWorkload.objects.filter(employee=b).exists()
+
+    row = MonthlyWorkload.objects.get(employee=a, year=2026, month=2)
+    assert (row.worked_days, row.day_shifts, row.night_shifts) == (2, 1, 1)
+
+
+@pytest.mark.django_db
+def test_summary_sums_months_across_years():
+    a, b = _employee(), _employee()
+    WorkloadService.sync_month(2025, 12, {"schedule": {str(a.id): {"1": "Н"}}})
+    WorkloadService.sync_month(2026, 1, {"schedule": {str(a.id): {"2": "Н"}, str(b.id): {"2": "Д"}}})
+    WorkloadService.sync_month(2026, 2, {"schedule": {str(a.id): {"2": "Н"}}})
+
+    totals = {r["employee_id"]: r for r in WorkloadService.summary((2025, 12), (2026, 1))}
+
+    assert totals[a.id]["nights"] == 2
+    assert totals[a.id]["shifts"]["Н"] == 2
+    assert totals[b.id]["worked_days"] == 1
+
+    only_b = WorkloadService.summary((2025, 1), (2026, 12), employee_ids=[b.id])
+    assert [r["employee_id"] for r in only_b] == [b.id]
+
+    with pytest.raises(ValueError):
+        WorkloadService.summary((2026, 2), (2026, 1))
+
+
+@pytest.mark.django_db
+def test_month_saves_and_appends_update_the_aggregates(tmp_path):
+    a = _employee()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 4, {"schedule": {str(a.id): {"1": "Д", "2": ""}}, "overrides": {}})
+        assert MonthlyWorkload.objects.get(employee=a).worked_days == 1
+
+        months_logic.append_month_overrides(2026, 4, [(str(a.id), "2", "В")])
+        row = MonthlyWorkload.objects.get(employee=a)
+        assert (row.worked_days, row.evening_shifts) == (2, 1)
+
+    # the legacy MonthRecord store does not feed the aggregates
+    MonthService.save_month(2026, 4, {"schedule": {str(a.id): {}}})
+    assert MonthlyWorkload.objects.get(employee=a).worked_days == 2
+
+
+@pytest.mark.django_db
+def test_append_updates_only_the_touched_employees(tmp_path):
+    a, b, c = _employee(), _employee(), _employee()
+
+    with patch.object(months_logic, "DATA_DIR", tmp_path):
+        months_logic.save_month(2026, 4, {
+            "schedule": {str(a.id): {"1": "Д"}, str(b.id): {"1": "Н"}},
+            "overrides": {},
+        })
+        untouched = MonthlyWorkload.objects.get(employee=b)
+
+        with patch.object(WorkloadService, "sync_month") as sync, \
+                patch.object(JsonMonthStorage, "read", side_effect=AssertionError("month read")):
+            months_logic.append_month_overrides(2026, 4, [(str(a.id), "2", "Н"), (str(c.id), "1", "Д")])
+
+        sync.assert_not_called()
+        row = MonthlyWorkload.objects.get(employee=a)
+        assert (row.worked_days, row.night_shifts) == (2, 1)
+        assert not MonthlyWorkload.objects.filter(employee=c).exists()
+        assert MonthlyWorkload.objects.get(employee=b).pk == untouched.pk
+
+        MonthlyWorkload.objects.all().delete()
+        assert WorkloadService.backfill() == [(2026, 4)]
+        assert MonthlyWorkload.objects.get(employee=b).night_shifts == 1
+
+
+@pytest.mark.django_db
+def test_workload_api():
+    a = _employee()
+    WorkloadService.sync_month(2026, 3, {"schedule": {str(a.id): {"1": "Д", "2": "Н"}}})
+    client = APIClient()
+    url = reverse("api_workload_analytics")
+
+    response = client.get(url, {"start": "2026-01", "end": "2026-12"})
+    assert response.status_code == 200
+    row = next(r for r in response.json()["employees"] if r["employee_id"] == a.id)
+    assert row["worked_days"] == 2
+    assert row["nights"] == 1
+    assert row["weekend_shifts"] == 1  # 2026-03-01 is a Sunday
+
+    assert client.get(url, {"start": "2026-13", "end": "2026-12"}).status_code == 400
+    assert client.get(url, {"start": "2026-05", "end": "2026-01"}).status_code == 400